@@ -0,0 +1 @@
+# Performance scripts; run from the repo root, e.g. `python -m benchmarks.bench_returns`.
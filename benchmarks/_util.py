@@ -0,0 +1,26 @@
+from __future__ import annotations
+import time
+import numpy as np
+import pandas as pd
+
+def best_of(fn, repeat: int = 3) -> float:
+    """Best wall-clock seconds over `repeat` calls of `fn()`."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def tile_stock_frame(path: str, rows: int, columns=("Adj Close",)) -> pd.DataFrame:
+    """Repeat a stock CSV's columns to `rows` rows on a daily DatetimeIndex."""
+    src = pd.read_csv(path, usecols=list(columns))
+    data = {c: np.resize(src[c].to_numpy(dtype=np.float64), rows) for c in columns}
+    index = pd.date_range("1970-01-01", periods=rows, freq="D", name="Date")
+    return pd.DataFrame(data, index=index)
+
+def report(rows: list[tuple[str, float]], unit: str = "ms") -> None:
+    scale = {"ms": 1e3, "s": 1.0}[unit]
+    width = max(len(name) for name, _ in rows)
+    for name, secs in rows:
+        print(f"{name:<{width}}  {secs * scale:10.1f} {unit}")
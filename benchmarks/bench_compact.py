@@ -0,0 +1,44 @@
+"""
+In-memory size of loaded frames with and without `compact=True`, plus the
+load time and the time of the metrics run on each (generated inputs, see
+datagen.py).
+
+    python -m benchmarks.bench_compact --rows 1m
+"""
+from __future__ import annotations
+import argparse
+from hw01 import stocks as S, weather as W
+from benchmarks._util import best_of
+from benchmarks import datagen
+
+def _mib(df) -> float:
+    return df.memory_usage(deep=True).sum() / 2**20
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", default="1m", help="10k, 1m, 10m or a row count")
+    ap.add_argument("--data-dir", default=datagen.DEFAULT_OUT_DIR)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    rows = datagen.parse_size(args.rows)
+    stock_path = datagen.ensure("stocks", rows, args.data_dir)
+    weather_path = datagen.ensure("weather", rows, args.data_dir)
+    print(f"{rows:,} rows")
+    print(f"{'frame':<26} {'MiB':>8} {'load ms':>9} {'metrics ms':>11}")
+    for compact in (False, True):
+        df = S.read_stock_csv(stock_path, compact=compact)
+        load = best_of(lambda: S.read_stock_csv(stock_path, compact=compact), args.repeat)
+        def metrics():
+            r = S.daily_simple_returns(df)
+            S.sharpe_ratio(r), S.annualized_volatility(r), S.cumulative_return(df), S.rolling_moving_averages(df)
+        print(f"{'stocks' + (' compact' if compact else ''):<26} {_mib(df):8.1f} {load * 1e3:9.1f} {best_of(metrics, args.repeat) * 1e3:11.1f}")
+    for compact in (False, True):
+        df = W.read_weather_csv(weather_path, compact=compact)
+        load = best_of(lambda: W.read_weather_csv(weather_path, compact=compact), args.repeat)
+        def metrics():
+            W.min_max_summary(df), W.seasonal_summaries(df), W.add_celsius_column(df)
+        print(f"{'weather' + (' compact' if compact else ''):<26} {_mib(df):8.1f} {load * 1e3:9.1f} {best_of(metrics, args.repeat) * 1e3:11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+N-ticker comparison: compare.align + compare.compare (one 2-D array, matrix
+products) against pandas (concat of per-ticker frames, pct_change, .cov/.corr).
+
+    python -m benchmarks.bench_compare --tickers 500 --days 2500
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+import pandas as pd
+from hw01 import compare as CMP
+from benchmarks._util import best_of, report
+
+def synthetic_frames(tickers: int, days: int, seed: int = 0) -> dict[str, pd.DataFrame]:
+    """Random-walk closes; each ticker lists late or delists early and misses ~1% of days."""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range("2010-01-04", periods=days, name="Date")
+    frames = {}
+    for i in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+        keep = rng.random(days) > 0.01
+        keep[: rng.integers(0, days // 10)] = False
+        frames[f"T{i:04d}"] = pd.DataFrame({"Close": close[keep], "Volume": rng.integers(1e5, 1e7, keep.sum()).astype(float)}, index=index[keep])
+    return frames
+
+def with_pandas(frames):
+    close = pd.concat({t: f["Close"] for t, f in frames.items()}, axis=1, sort=True)
+    rets = close.pct_change(fill_method=None)
+    return rets, (1 + rets).cumprod(), rets.cov(), rets.corr()
+
+def with_engine(frames):
+    return CMP.compare(CMP.align(frames))
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tickers", type=int, default=500)
+    ap.add_argument("--days", type=int, default=2500)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    frames = synthetic_frames(args.tickers, args.days)
+    res = with_engine(frames)
+    ref = with_pandas(frames)
+    assert np.allclose(res.corr, ref[3].to_numpy(), atol=1e-9, equal_nan=True)
+    print(f"{args.tickers} tickers x {args.days} days")
+    report([
+        ("pandas concat + pct_change + cov/corr", best_of(lambda: with_pandas(frames), args.repeat)),
+        ("compare.align + compare.compare", best_of(lambda: with_engine(frames), args.repeat)),
+    ], unit="ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Date parsing on a synthetic RDU-style weather file ("1/12/17" dates).
+
+    python -m benchmarks.bench_dates --rows 5000000
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import warnings
+import pandas as pd
+from hw01 import dates as D, weather as W
+from benchmarks._util import best_of, report
+from benchmarks.datagen import write_weather_csv
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=5_000_000)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--with-inference", action="store_true", help="also time pd.to_datetime without a format (very slow)")
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "rdu_like.csv")
+        write_weather_csv(path, args.rows)
+        col = pd.read_csv(path, usecols=["date"])["date"]
+        print(f"{args.rows:,} rows, detected format {D.detect_date_format(col)!r}")
+        rows = []
+        if args.with_inference:
+            def _infer():
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    pd.to_datetime(col)
+            rows.append(("pd.to_datetime (inferred, per element)", best_of(_infer, args.repeat)))
+        rows += [
+            ("pd.to_datetime(format='%m/%d/%y')", best_of(lambda: pd.to_datetime(col, format="%m/%d/%y"), args.repeat)),
+            ("dates.parse_dates (detect + integer path)", best_of(lambda: D.parse_dates(col), args.repeat)),
+            ("read_weather_csv end to end", best_of(lambda: W.read_weather_csv(path), args.repeat)),
+        ]
+        report(rows, unit="s")
+
+if __name__ == "__main__":
+    main()
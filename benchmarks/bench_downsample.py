@@ -0,0 +1,38 @@
+"""
+Render time and PNG size of a long price_ma chart at full resolution against
+`max_points` min/max downsampling.
+
+    python -m benchmarks.bench_downsample --rows 1000000 --max-points 2000
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from hw01 import render as R
+from hw01.downsample import minmax_indices
+from benchmarks._util import best_of
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--max-points", type=int, default=2000)
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    index = pd.date_range("1990-01-01", periods=args.rows, freq="min", name="Date")
+    df = pd.DataFrame({"Adj Close": 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, args.rows)))}, index=index)
+    price = df["Adj Close"].to_numpy()
+
+    print(f"{args.rows:,} rows")
+    print(f"{'minmax_indices alone':<28} {best_of(lambda: minmax_indices(price, args.max_points), 3) * 1e3:10.1f} ms")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, mp in (("full resolution", None), (f"max_points={args.max_points}", args.max_points)):
+            out = os.path.join(tmp, "chart.png")
+            secs = best_of(lambda: R.render_chart("price_ma", out, R.stock_price_ma_data(df, max_points=mp)), args.repeat)
+            print(f"{label:<28} {secs * 1e3:10.1f} ms  {os.path.getsize(out) / 1024:8.1f} KiB")
+
+if __name__ == "__main__":
+    main()
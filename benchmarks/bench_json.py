@@ -0,0 +1,57 @@
+"""
+Serializing large payloads: formatter.to_json_payload against the previous
+top-level-only implementation (Series.to_dict + json.dumps).
+
+    python -m benchmarks.bench_json --elements 1000000
+"""
+from __future__ import annotations
+import argparse
+import json
+import numpy as np
+import pandas as pd
+from hw01.formatter import to_json_payload
+from benchmarks._util import best_of, report
+
+def previous_to_json_payload(payload) -> str:
+    def _sanitize(obj):
+        if isinstance(obj, pd.Series):
+            return obj.to_dict()
+        if isinstance(obj, pd.DataFrame):
+            return obj.to_dict(orient="list")
+        if hasattr(obj, "item"):
+            try:
+                return obj.item()
+            except Exception:
+                pass
+        return obj
+    clean = {k: _sanitize(v) for k, v in payload.items()}
+    return json.dumps(clean, sort_keys=True, ensure_ascii=False)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--elements", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    n = args.elements
+    series = pd.Series(rng.normal(size=n))
+    frame = pd.DataFrame({"a": rng.normal(size=n // 2), "b": rng.normal(size=n // 2)})
+    dated = pd.Series(rng.normal(size=n), index=pd.date_range("1990-01-01", periods=n, freq="min"))
+
+    print(f"{n:,} elements per payload")
+    report([
+        ("Series, previous", best_of(lambda: previous_to_json_payload({"r": series}), args.repeat)),
+        ("Series, to_json_payload", best_of(lambda: to_json_payload({"r": series}), args.repeat)),
+        ("DataFrame, previous", best_of(lambda: previous_to_json_payload({"f": frame}), args.repeat)),
+        ("DataFrame, to_json_payload", best_of(lambda: to_json_payload({"f": frame}), args.repeat)),
+        ("dated Series, to_json_payload", best_of(lambda: to_json_payload({"r": dated}), args.repeat)),
+        ("dated Series, nan_as_null", best_of(lambda: to_json_payload({"r": dated}, nan_as_null=True), args.repeat)),
+    ], unit="ms")
+    try:
+        previous_to_json_payload({"r": dated})
+    except TypeError as e:
+        print(f"(previous implementation on a DatetimeIndex Series: TypeError: {e})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+CSV load time and peak memory: inferred dtypes and every column (the previous
+readers) against schema.read_csv (declared dtypes, only the columns a command
+needs) on the C engine, and on pyarrow when it is installed. Inputs are
+data/NVDA.csv and data/rdu-weather-history.csv tiled to --rows.
+
+    python -m benchmarks.bench_load --rows 1000000
+"""
+from __future__ import annotations
+import argparse
+import importlib.util
+import os
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+from hw01 import schema as SC
+from benchmarks._util import best_of
+
+def tile_csv(src: str, dst: str, rows: int, date_col: str | None = None) -> None:
+    """Repeat `src`'s rows to `rows`; `date_col` (if given) becomes consecutive days so dates stay unique."""
+    df = pd.read_csv(src)
+    df = df.iloc[np.resize(np.arange(len(df)), rows)].reset_index(drop=True)
+    if date_col is not None:
+        df[date_col] = np.datetime_as_string(np.datetime64("1800-01-01") + np.arange(rows), unit="D")
+    df.to_csv(dst, index=False)
+
+def _peak_mib(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    engines = ["c"] + (["pyarrow"] if importlib.util.find_spec("pyarrow") else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        stocks, weather = os.path.join(tmp, "nvda.csv"), os.path.join(tmp, "rdu.csv")
+        tile_csv("data/NVDA.csv", stocks, args.rows, date_col="Date")
+        tile_csv("data/rdu-weather-history.csv", weather, args.rows)
+        cases = [
+            ("stocks: inferred, all columns", lambda: pd.read_csv(stocks, parse_dates=["Date"])),
+            ("stocks: inferred, usecols", lambda: pd.read_csv(stocks, parse_dates=["Date"], usecols=["Date", "Adj Close"])),
+            ("weather: inferred, all columns", lambda: pd.read_csv(weather)),
+        ]
+        for eng in engines:
+            cases += [
+                (f"stocks: schema, {eng}", lambda eng=eng: SC.read_csv(stocks, "stocks", usecols=["Date", *SC.stock_columns()], parse_dates=["Date"], engine=eng)),
+                (f"weather: schema, {eng}", lambda eng=eng: SC.read_csv(weather, "weather", usecols=["date", *SC.weather_columns()], engine=eng)),
+            ]
+        print(f"{args.rows:,} rows; engines: {', '.join(engines)}")
+        width = max(len(name) for name, _ in cases)
+        for name, fn in sorted(cases):
+            print(f"{name:<{width}}  {best_of(fn, args.repeat) * 1e3:9.1f} ms  {_peak_mib(fn):8.1f} MiB peak")
+
+if __name__ == "__main__":
+    main()
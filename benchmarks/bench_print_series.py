@@ -0,0 +1,49 @@
+"""
+Console dump of a long date-indexed series: formatter.print_series against
+the previous reset_index + iterrows + print-per-row loop. Output goes to
+/dev/null so only formatting and write cost is measured.
+
+    python -m benchmarks.bench_print_series --rows 1000000
+"""
+from __future__ import annotations
+import argparse
+import contextlib
+import os
+import numpy as np
+import pandas as pd
+from hw01.formatter import print_series
+from benchmarks._util import best_of, report
+
+def previous_print_series(name: str, s: pd.Series, places: int = 4) -> None:
+    print(f"[{name}]")
+    fmt_num = f"{{:.{places}f}}".format
+    df = s.reset_index()
+    idx_name, val_name = df.columns[0], df.columns[1]
+    print(f"{idx_name:<12} {val_name}")
+    for _, row in df.iterrows():
+        idx = str(row[idx_name])
+        val = row[val_name]
+        try:
+            sval = fmt_num(float(val))
+        except Exception:
+            sval = str(val)
+        print(f"{idx:<12} {sval}")
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    s = pd.Series(rng.normal(0, 0.02, args.rows), index=pd.date_range("1990-01-01", periods=args.rows, freq="min", name="Date"), name="ret")
+    with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+        rows = [
+            ("reset_index + iterrows + print", best_of(lambda: previous_print_series("ret", s), args.repeat)),
+            ("print_series (bulk)", best_of(lambda: print_series("ret", s), args.repeat)),
+        ]
+    print(f"{args.rows:,} rows")
+    report(rows, unit="ms")
+
+if __name__ == "__main__":
+    main()
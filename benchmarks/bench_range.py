@@ -0,0 +1,38 @@
+"""
+Many date-range mean queries against one weather history: `slice_and_means`
+per query versus one `RangeMeans` index answering the whole batch.
+
+    python -m benchmarks.bench_range --queries 5000
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+from hw01 import weather as W
+from benchmarks._util import best_of, report
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--input", default="data/rdu-weather-history.csv")
+    ap.add_argument("--queries", type=int, default=5000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    df = W.read_weather_csv(args.input)
+    cols = ("temperaturemax", "precipitation")
+    rng = np.random.default_rng(0)
+    lo = df.index.min().value
+    span = df.index.max().value - lo
+    a = lo + rng.integers(0, span, args.queries)
+    b = a + rng.integers(0, span // 4, args.queries)
+    starts = np.asarray(a, dtype="datetime64[ns]")
+    ends = np.asarray(b, dtype="datetime64[ns]")
+
+    print(f"{len(df):,} rows, {args.queries:,} queries")
+    report([
+        ("slice_and_means per query", best_of(lambda: [W.slice_and_means(df, s, e, cols) for s, e in zip(starts, ends)], 1)),
+        ("RangeMeans build", best_of(lambda: W.RangeMeans(df, cols), args.repeat)),
+        ("RangeMeans.mean_batch", best_of(lambda q=W.RangeMeans(df, cols): q.mean_batch(starts, ends), args.repeat)),
+    ], unit="ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Chart throughput for many tickers: a fresh pyplot figure per chart
+(plotting.plot_stock_price_ma) against render.RenderQueue, which reuses one
+figure per kind in each worker, in-process and over a process pool.
+
+    python -m benchmarks.bench_render --tickers 1000 --workers 4
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from hw01 import plotting as P, render as R
+from hw01.batch import default_workers
+
+def synthetic_tickers(n: int, rows: int = 250, seed: int = 0) -> list[pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2023-01-03", periods=rows, freq="B", name="Date")
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (n, rows)), axis=1))
+    return [pd.DataFrame({"Adj Close": p}, index=index) for p in prices]
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tickers", type=int, default=1000)
+    ap.add_argument("--workers", type=int, default=default_workers())
+    args = ap.parse_args(argv)
+
+    frames = synthetic_tickers(args.tickers)
+    with tempfile.TemporaryDirectory() as tmp:
+        def run(name, fn):
+            t0 = time.perf_counter()
+            fn()
+            secs = time.perf_counter() - t0
+            print(f"{name:<36} {args.tickers / secs:8.1f} charts/s  ({secs:6.1f} s)")
+
+        def pyplot_each():
+            for i, df in enumerate(frames):
+                P.plot_stock_price_ma(df, outfile=os.path.join(tmp, f"p{i}.png"))
+
+        def queued(workers):
+            with R.RenderQueue(workers=workers) as q:
+                for i, df in enumerate(frames):
+                    q.submit("price_ma", os.path.join(tmp, f"q{i}.png"), R.stock_price_ma_data(df))
+                errors = [e for _, e in q.wait() if e is not None]
+            assert not errors, errors[0]
+
+        print(f"{args.tickers:,} price_ma charts, {len(frames[0])} rows each")
+        run("pyplot, new figure per chart", pyplot_each)
+        run("RenderQueue, 1 worker (reused fig)", lambda: queued(1))
+        if args.workers > 1:
+            run(f"RenderQueue, {args.workers} processes", lambda: queued(args.workers))
+
+if __name__ == "__main__":
+    main()
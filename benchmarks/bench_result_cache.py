@@ -0,0 +1,39 @@
+"""
+End-to-end `stocks --json` / `weather --json` latency, one fresh interpreter
+per call as a scheduler would run it: recomputed (--no-result-cache) against
+answered from the result cache. Inputs come from benchmarks.datagen.
+
+    python -m benchmarks.bench_result_cache --rows 1000000
+"""
+from __future__ import annotations
+import argparse
+import subprocess
+import sys
+import tempfile
+from benchmarks import datagen
+from benchmarks._util import best_of, report
+
+def _cli(argv: list[str]) -> None:
+    subprocess.run([sys.executable, "-m", "hw01.cli", *argv], check=True, stdout=subprocess.DEVNULL)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--rows", type=datagen.parse_size, default=1_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    stocks = datagen.ensure("stocks", args.rows)
+    weather = datagen.ensure("weather", args.rows)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        rows = []
+        for name, cmd in (("stocks", ["stocks", "--input", stocks, "--json"]),
+                          ("weather", ["weather", "--input", weather, "--json"])):
+            cmd += ["--cache-dir", cache_dir]
+            rows.append((f"{name}: recomputed", best_of(lambda: _cli(cmd + ["--no-result-cache"]), args.repeat)))
+            _cli(cmd)  # store the result
+            rows.append((f"{name}: result cache hit", best_of(lambda: _cli(cmd), args.repeat)))
+        print(f"{datagen.size_label(args.rows)} rows")
+        report(rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Per-call cost of `daily_simple_returns` before/after the single-pass kernel.
+
+    python -m benchmarks.bench_returns --rows 10000000
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+from hw01 import stocks as S
+from benchmarks._util import best_of, report, tile_stock_frame
+
+def _legacy(df):
+    # previous implementation: both variants plus an unused allclose
+    pct = S.daily_simple_returns_pct(df)
+    formula = S.daily_simple_returns_formula(df)
+    np.allclose(pct, formula, rtol=1e-10)
+    return formula
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--input", default="data/NVDA.csv")
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    df = tile_stock_frame(args.input, args.rows)
+    print(f"{args.input} tiled to {len(df):,} rows")
+    report([
+        ("legacy (pct + formula + allclose)", best_of(lambda: _legacy(df), args.repeat)),
+        ("daily_simple_returns validate=off", best_of(lambda: S.daily_simple_returns(df), args.repeat)),
+        ("daily_simple_returns validate=sample", best_of(lambda: S.daily_simple_returns(df, validate="sample"), args.repeat)),
+        ("daily_simple_returns validate=full", best_of(lambda: S.daily_simple_returns(df, validate="full"), args.repeat)),
+    ])
+
+if __name__ == "__main__":
+    main()
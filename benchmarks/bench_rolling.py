@@ -0,0 +1,36 @@
+"""
+Ten rolling windows over a long price series: per-window pandas `rolling()`
+vs one `rolling_block` call.
+
+    python -m benchmarks.bench_rolling --rows 10000000
+"""
+from __future__ import annotations
+import argparse
+from hw01.rolling import rolling_block
+from benchmarks._util import best_of, report, tile_stock_frame
+
+WINDOWS = (5, 10, 20, 50, 100, 150, 200, 250, 500, 1000)
+
+def _pandas(s, stat):
+    for w in WINDOWS:
+        getattr(s.rolling(window=w, min_periods=w), stat)()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--input", default="data/NVDA.csv")
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    s = tile_stock_frame(args.input, args.rows)["Adj Close"]
+    x = s.to_numpy()
+    print(f"{len(s):,} rows x {len(WINDOWS)} windows")
+    rows = []
+    for pd_stat, stat in (("mean", "sma"), ("std", "std"), ("min", "min"), ("max", "max")):
+        rows.append((f"pandas rolling().{pd_stat}() per window", best_of(lambda: _pandas(s, pd_stat), args.repeat)))
+        rows.append((f"rolling_block {stat}", best_of(lambda: rolling_block(x, WINDOWS, (stat,)), args.repeat)))
+    rows.append(("rolling_block sma+std+min+max", best_of(lambda: rolling_block(x, WINDOWS, ("sma", "std", "min", "max")), args.repeat)))
+    report(rows)
+
+if __name__ == "__main__":
+    main()
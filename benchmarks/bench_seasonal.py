@@ -0,0 +1,56 @@
+"""
+`seasonal_summaries` on many years x many stations of daily rows, against a
+per-(year, season) boolean-mask loop (the previous approach, extended to
+every year).
+
+    python -m benchmarks.bench_seasonal --years 50 --stations 1000
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+import pandas as pd
+from hw01 import weather as W
+from benchmarks._util import best_of, report
+
+def synthetic_frame(years: int, stations: int, seed: int = 0) -> pd.DataFrame:
+    """Daily rows for `stations` stations stacked in one date-sorted frame."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("1970-01-01", periods=int(years * 365.25), freq="D")
+    index = pd.DatetimeIndex(np.repeat(days.values, stations), name="date")
+    tmin = rng.normal(50, 15, len(index)).round()
+    return pd.DataFrame({"temperaturemin": tmin, "temperaturemax": tmin + rng.integers(5, 30, len(index))}, index=index)
+
+def mask_loop(df: pd.DataFrame) -> dict:
+    season_year, season = W.season_labels(df.index)
+    out = {}
+    for yr in np.unique(season_year):
+        for sn in W.SEASONS:
+            sub = df[(season_year == yr) & (season == sn)]
+            if len(sub) == 0:
+                continue
+            out.setdefault(int(yr), {})[sn] = {
+                "date_min": sub.index.min().strftime("%Y-%m-%d"),
+                "date_max": sub.index.max().strftime("%Y-%m-%d"),
+                "mean_temperaturemin": float(sub["temperaturemin"].mean()),
+                "median_temperaturemin": float(sub["temperaturemin"].median()),
+                "mean_temperaturemax": float(sub["temperaturemax"].mean()),
+                "median_temperaturemax": float(sub["temperaturemax"].median()),
+            }
+    return out
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=50)
+    ap.add_argument("--stations", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    df = synthetic_frame(args.years, args.stations)
+    print(f"{len(df):,} rows ({args.years} years x {args.stations} stations)")
+    report([
+        ("mask loop per (year, season)", best_of(lambda: mask_loop(df), args.repeat)),
+        ("seasonal_summaries (one groupby)", best_of(lambda: W.seasonal_summaries(df), args.repeat)),
+    ], unit="s")
+
+if __name__ == "__main__":
+    main()
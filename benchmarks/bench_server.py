@@ -0,0 +1,53 @@
+"""
+Request latency through `hw01 serve` (warm process, cached frames) against a
+cold `python -m hw01.cli` per request. Reports p50/p99 per mode.
+
+    python -m benchmarks.bench_server --requests 500 --cold 10
+"""
+from __future__ import annotations
+import argparse
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+from hw01 import server as SV
+
+def _latencies(fn, n: int) -> np.ndarray:
+    out = np.empty(n)
+    for i in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out[i] = time.perf_counter() - t0
+    return out
+
+def _row(name: str, lat: np.ndarray) -> None:
+    p50, p99 = np.percentile(lat, [50, 99]) * 1e3
+    print(f"{name:<34} n={len(lat):<5} p50 {p50:8.1f} ms   p99 {p99:8.1f} ms")
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--requests", type=int, default=500, help="Requests per mode against the server")
+    ap.add_argument("--cold", type=int, default=10, help="Cold CLI subprocess runs per mode")
+    args = ap.parse_args(argv)
+
+    modes = {
+        "stocks": ["stocks", "--input", "data/NVDA.csv", "--ticker", "NVDA", "--json", "--no-cache"],
+        "weather": ["weather", "--input", "data/rdu-weather-history.csv", "--json"],
+    }
+    with SV.QueryServer(port=0) as srv:
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        try:
+            for name, cli_argv in modes.items():
+                def warm(a=cli_argv):
+                    res = SV.request(srv.url, a)
+                    assert res["exit_code"] == 0, res["stderr"]
+                warm()
+                _row(f"{name}: server", _latencies(warm, args.requests))
+                cold = lambda a=cli_argv: subprocess.run([sys.executable, "-m", "hw01.cli", *a], check=True, capture_output=True)
+                _row(f"{name}: cold CLI process", _latencies(cold, args.cold))
+        finally:
+            srv.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Stock returns vs weather: stock_weather.stock_weather (one as-of join for all
+stations, batched moments for all pairs) against a per-(ticker, station)
+pandas loop (merge_asof, Series.corr, rolling corr, lagged polyfit).
+
+    python -m benchmarks.bench_stock_weather --tickers 50 --stations 20 --days 2500
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+import pandas as pd
+from hw01 import compare as CMP, stock_weather as SW
+from benchmarks._util import best_of, report
+from benchmarks.bench_compare import synthetic_frames
+
+FEATURE = "temperaturemax"
+
+def synthetic_weather(stations: int, days: int, seed: int = 1) -> pd.DataFrame:
+    """Calendar-day temperatures per station, ~3% missing; (station, date) MultiIndex."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2010-01-01", periods=int(days * 1.45), name="date")
+    season = 60 + 25 * np.sin(np.arange(len(dates)) * 2 * np.pi / 365.25)
+    parts = []
+    for i in range(stations):
+        t = season + rng.normal(0, 8, len(dates))
+        t[rng.random(len(dates)) < 0.03] = np.nan
+        parts.append(pd.DataFrame({FEATURE: t, "station": f"S{i:03d}"}, index=dates))
+    return pd.concat(parts).set_index("station", append=True).swaplevel().sort_index()
+
+def with_pandas(frames, weather, window, lags):
+    dates = np.unique(np.concatenate([f.index.values.astype("datetime64[ns]") for f in frames.values()]))
+    left = pd.DataFrame({"date": dates})
+    out = {}
+    for st, g in weather.groupby(level="station"):
+        right = g.droplevel("station")[FEATURE].dropna().rename_axis("date").reset_index().astype({"date": "datetime64[ns]"})
+        x = pd.merge_asof(left, right, on="date", direction="backward", tolerance=pd.Timedelta(days=3)).set_index("date")[FEATURE]
+        for t, f in frames.items():
+            r = f["Close"].reindex(x.index).pct_change(fill_method=None)
+            res = {"corr": r.corr(x), "rolling": r.rolling(window).corr(x)}
+            for lag in lags:
+                xl = x.shift(lag)
+                ok = r.notna() & xl.notna()
+                res[lag] = np.polyfit(xl[ok], r[ok], 1)
+            out[t, st] = res
+    return out
+
+def with_engine(frames, weather, window, lags):
+    panel = CMP.align(frames, ["Close"])
+    return SW.stock_weather(panel, SW.weather_panel(weather, [FEATURE]), price_col="Close", features=[FEATURE],
+                            window=window, lags=lags)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--tickers", type=int, default=50)
+    ap.add_argument("--stations", type=int, default=20)
+    ap.add_argument("--days", type=int, default=2500)
+    ap.add_argument("--window", type=int, default=60)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    frames = synthetic_frames(args.tickers, args.days)
+    weather = synthetic_weather(args.stations, args.days)
+    lags = [0, 1, 2]
+    res = with_engine(frames, weather, args.window, lags)
+    ref = with_pandas(frames, weather, args.window, lags)
+    t0, s0 = next(iter(ref))
+    i, j = res.tickers.index(t0), res.stations.index(s0)
+    assert np.isclose(res.corr[FEATURE][i, j], ref[t0, s0]["corr"])
+    assert np.allclose(res.rolling[FEATURE][:, i, j], ref[t0, s0]["rolling"].to_numpy(), atol=1e-9, equal_nan=True)
+    print(f"{args.tickers} tickers x {args.stations} stations x {args.days} days, window {args.window}, lags {lags}")
+    report([
+        ("pandas loop over pairs", best_of(lambda: with_pandas(frames, weather, args.window, lags), args.repeat)),
+        ("stock_weather.stock_weather", best_of(lambda: with_engine(frames, weather, args.window, lags), args.repeat)),
+    ], unit="ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Synthetic inputs for the benchmark suite: stock OHLCV and RDU-style weather
+CSVs at 10K/1M/10M rows (or any row count), with shuffled dates and NaNs.
+
+    python -m benchmarks.datagen --sizes 10k 1m 10m --out-dir /tmp/hw01-bench
+
+Files are named <kind>_<rows>.csv and only written if missing, so repeated
+benchmark runs reuse them.
+"""
+from __future__ import annotations
+import argparse
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+DEFAULT_OUT_DIR = os.environ.get("HW01_BENCH_DATA", os.path.join(tempfile.gettempdir(), "hw01-bench"))
+KINDS = ("stocks", "weather")
+
+def parse_size(label: str) -> int:
+    """'10k', '1m', '10m' or a plain row count."""
+    key = label.strip().lower()
+    if key in SIZES:
+        return SIZES[key]
+    for suffix, scale in (("k", 1_000), ("m", 1_000_000)):
+        if key.endswith(suffix):
+            return int(float(key[:-1]) * scale)
+    return int(key)
+
+def size_label(rows: int) -> str:
+    for label, n in SIZES.items():
+        if n == rows:
+            return label
+    return str(rows)
+
+def write_stock_csv(path: str, rows: int, seed: int = 0, nan_frac: float = 0.001) -> None:
+    """
+    `data/NVDA.csv` columns for a random walk. Daily dates up to 50K rows, minute
+    bars beyond (10M calendar days would run past year 9999); rows are written
+    in shuffled order and about `nan_frac` of the price cells are blank.
+    """
+    rng = np.random.default_rng(seed)
+    unit = "D" if rows <= 50_000 else "m"
+    stamps = np.datetime64("1990-01-01", unit) + np.arange(rows)
+    # minute bars move less, which keeps 10M-row prices in a sane range
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01 if unit == "D" else 0.0005, rows)))
+    open_ = close * (1 + rng.normal(0, 0.003, rows))
+    spread = np.abs(rng.normal(0, 0.005, rows)) * close
+    prices = {
+        "Open": open_,
+        "High": np.maximum(open_, close) + spread,
+        "Low": np.minimum(open_, close) - spread,
+        "Close": close,
+        "Adj Close": close * 0.98,
+    }
+    for values in prices.values():
+        values[rng.random(rows) < nan_frac] = np.nan
+    order = rng.permutation(rows)
+    df = pd.DataFrame({"Date": np.datetime_as_string(stamps, unit="D" if unit == "D" else "s")})
+    for col, values in prices.items():
+        df[col] = values
+    df["Volume"] = rng.integers(100_000, 50_000_000, rows)
+    df.iloc[order].to_csv(path, index=False, float_format="%.6f")
+
+def write_weather_csv(path: str, rows: int, seed: int = 0, nan_frac: float = 0.01) -> None:
+    """
+    `data/rdu-weather-history.csv` columns with M/D/YY dates drawn at random from
+    50 years (so unsorted, and repeated like several stations in one file);
+    about `nan_frac` of the temperature, precipitation and wind cells are blank.
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.Timestamp("1970-01-01") + pd.to_timedelta(rng.integers(0, 365 * 50, rows), unit="D")
+    # strftime has no unpadded month/day on every platform; build the strings by hand
+    date = (pd.Series(days.month.astype(str)) + "/" + pd.Series(days.day.astype(str)) + "/"
+            + pd.Series((days.year % 100).astype(str)).str.zfill(2))
+    tmin = rng.integers(10, 75, rows).astype(np.float64)
+    cols = {
+        "temperaturemin": tmin,
+        "temperaturemax": tmin + rng.integers(5, 30, rows),
+        "precipitation": np.round(rng.exponential(0.1, rows), 2),
+    }
+    awnd = np.round(rng.uniform(0, 20, rows), 2)
+    for values in (*cols.values(), awnd):
+        values[rng.random(rows) < nan_frac] = np.nan
+    pd.DataFrame({"date": date, **cols, "snow": 0.0, "snwd": 0.0, "awnd": awnd}).to_csv(path, index=False)
+
+_WRITERS = {"stocks": write_stock_csv, "weather": write_weather_csv}
+
+def ensure(kind: str, rows: int, out_dir: str = DEFAULT_OUT_DIR, seed: int = 0) -> str:
+    """Path of the `kind` file with `rows` rows in `out_dir`, generating it first if needed."""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{kind}_{size_label(rows)}.csv")
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp{os.getpid()}"
+        _WRITERS[kind](tmp, rows, seed=seed)
+        os.replace(tmp, path)  # a killed run never leaves a truncated file behind
+    return path
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", nargs="+", default=["10k", "1m"], help="Row counts: 10k, 1m, 10m or integers")
+    ap.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    ap.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Where to write (default: $HW01_BENCH_DATA or <tmp>/hw01-bench)")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    for size in args.sizes:
+        for kind in args.kinds:
+            path = ensure(kind, parse_size(size), args.out_dir, args.seed)
+            print(f"{path}  {os.path.getsize(path) / 1e6:,.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark suite: times the public hw01 functions and end-to-end CLI runs on
+generated inputs (see datagen.py), records peak memory, writes JSON, and
+optionally compares against a stored baseline to flag regressions.
+
+    python -m benchmarks.run --sizes 10k 1m --out bench.json
+    python -m benchmarks.run --sizes 10k 1m --baseline bench.json --out new.json
+
+Peak memory is tracemalloc's peak for in-process cases (one extra, untimed
+run) and the child's max RSS for CLI cases. With --baseline the exit code is
+1 if any case is slower or bigger than the tolerance allows.
+"""
+from __future__ import annotations
+import argparse
+import datetime as _dt
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from hw01 import plotting as P, stocks as S, weather as W
+from benchmarks._util import best_of
+from benchmarks import datagen
+
+# Runs the CLI and reports the child's own peak RSS (KiB) on stderr. VmHWM
+# resets on exec; ru_maxrss would carry over this (parent) process's peak.
+_CLI_CHILD = """\
+import resource, runpy, sys
+sys.argv = ["hw01"] + sys.argv[1:]
+try:
+    runpy.run_module("hw01.cli", run_name="__main__")
+except SystemExit as e:
+    code = e.code or 0
+else:
+    code = 0
+try:
+    with open("/proc/self/status") as f:
+        kib = next(int(line.split()[1]) for line in f if line.startswith("VmHWM:"))
+except (OSError, StopIteration):
+    kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+sys.stderr.write("\\n__maxrss_kib__=%d\\n" % kib)
+sys.exit(code)
+"""
+
+def library_cases(stock_path: str, weather_path: str, plot_dir: str, max_points: int | None):
+    """(name, fn) for every public stocks/weather/plotting function; inputs are parsed once up front."""
+    sdf = S.read_stock_csv(stock_path)
+    rets = S.daily_simple_returns(sdf)
+    wdf = W.read_weather_csv(weather_path)
+    start, end = wdf.index[len(wdf) // 4], wdf.index[len(wdf) // 2]
+    png = lambda name: os.path.join(plot_dir, f"{name}.png")
+    return [
+        ("stocks.read_stock_csv", lambda: S.read_stock_csv(stock_path)),
+        ("stocks.daily_simple_returns", lambda: S.daily_simple_returns(sdf)),
+        ("stocks.log_returns", lambda: S.log_returns(sdf)),
+        ("stocks.average_daily_return", lambda: S.average_daily_return(rets)),
+        ("stocks.cumulative_return", lambda: S.cumulative_return(sdf)),
+        ("stocks.annualized_volatility", lambda: S.annualized_volatility(rets)),
+        ("stocks.sharpe_ratio", lambda: S.sharpe_ratio(rets)),
+        ("stocks.rolling_moving_averages", lambda: S.rolling_moving_averages(sdf)),
+        ("weather.read_weather_csv", lambda: W.read_weather_csv(weather_path)),
+        ("weather.min_max_summary", lambda: W.min_max_summary(wdf)),
+        ("weather.add_celsius_column", lambda: W.add_celsius_column(wdf.copy())),
+        ("weather.slice_and_means", lambda: W.slice_and_means(wdf, start, end)),
+        ("weather.seasonal_summaries", lambda: W.seasonal_summaries(wdf)),
+        ("plotting.plot_stock_price_ma", lambda: P.plot_stock_price_ma(sdf, outfile=png("price_ma"), max_points=max_points)),
+        ("plotting.plot_returns_hist", lambda: P.plot_returns_hist(rets, outfile=png("returns_hist"))),
+        ("plotting.plot_weather_tmax_and_celsius", lambda: P.plot_weather_tmax_and_celsius(wdf, outfile=png("weather"), max_points=max_points)),
+    ]
+
+def cli_cases(stock_path: str, weather_path: str, cache_dir: str):
+    """
+    (name, argv) for end-to-end CLI runs in a fresh interpreter (imports included).
+    Every run recomputes: no result cache, and no frame cache for stocks;
+    anything cached goes to `cache_dir`, not ~/.cache/hw01.
+    """
+    uncached = ["--no-result-cache", "--cache-dir", cache_dir]
+    return [
+        ("cli.stocks --json", ["stocks", "--input", stock_path, "--json", "--no-cache", *uncached]),
+        ("cli.weather --json", ["weather", "--input", weather_path, "--json", *uncached]),
+    ]
+
+def _peak_bytes(fn) -> int:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def _run_cli(argv: list[str]) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", _CLI_CHILD, *argv], capture_output=True, text=True)
+    secs = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(f"hw01 {' '.join(argv)} exited {proc.returncode}: {proc.stderr.strip()[-500:]}")
+    kib = int(proc.stderr.rsplit("__maxrss_kib__=", 1)[1])
+    return secs, kib * 1024
+
+def run_suite(sizes: list[str], out_dir: str, repeat: int = 3, memory: bool = True, select: list[str] | None = None,
+              max_points: int | None = 4000, log=print) -> dict:
+    """Results as {"meta": {...}, "results": {"<case>@<size>": {"seconds", "peak_bytes", "rows"}}}."""
+    keep = lambda name: not select or any(fnmatch.fnmatch(name, pat) for pat in select)
+    results = {}
+    with tempfile.TemporaryDirectory() as plot_dir, tempfile.TemporaryDirectory() as cache_dir:
+        for label in sizes:
+            rows = datagen.parse_size(label)
+            stock_path = datagen.ensure("stocks", rows, out_dir)
+            weather_path = datagen.ensure("weather", rows, out_dir)
+            tag = datagen.size_label(rows)
+            cases = [(n, fn) for n, fn in library_cases(stock_path, weather_path, plot_dir, max_points) if keep(n)]
+            for name, fn in cases:
+                secs = best_of(fn, repeat)
+                peak = _peak_bytes(fn) if memory else None
+                results[f"{name}@{tag}"] = {"seconds": secs, "peak_bytes": peak, "rows": rows}
+                log(_row(f"{name}@{tag}", secs, peak))
+            for name, argv in cli_cases(stock_path, weather_path, cache_dir):
+                if not keep(name):
+                    continue
+                runs = [_run_cli(argv) for _ in range(repeat)]
+                secs, peak = min(r[0] for r in runs), max(r[1] for r in runs)
+                results[f"{name}@{tag}"] = {"seconds": secs, "peak_bytes": peak, "rows": rows}
+                log(_row(f"{name}@{tag}", secs, peak))
+    meta = {
+        "created": _dt.datetime.now(_dt.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "max_points": max_points,
+    }
+    return {"meta": meta, "results": results}
+
+def compare_results(current: dict, baseline: dict, time_tol: float = 0.25, mem_tol: float = 0.25,
+                    min_seconds: float = 0.005) -> list[dict]:
+    """
+    Cases present in both runs that got slower than (1 + time_tol) x baseline or
+    used more than (1 + mem_tol) x its peak memory. Timings where both runs are
+    under `min_seconds` are treated as noise.
+    """
+    out = []
+    base = baseline.get("results", {})
+    for key, new in current.get("results", {}).items():
+        old = base.get(key)
+        if old is None:
+            continue
+        if max(new["seconds"], old["seconds"]) >= min_seconds and new["seconds"] > old["seconds"] * (1 + time_tol):
+            out.append({"case": key, "metric": "seconds", "baseline": old["seconds"], "current": new["seconds"],
+                        "ratio": new["seconds"] / old["seconds"]})
+        if new.get("peak_bytes") and old.get("peak_bytes") and new["peak_bytes"] > old["peak_bytes"] * (1 + mem_tol):
+            out.append({"case": key, "metric": "peak_bytes", "baseline": old["peak_bytes"], "current": new["peak_bytes"],
+                        "ratio": new["peak_bytes"] / old["peak_bytes"]})
+    return out
+
+def _row(name: str, secs: float, peak: int | None) -> str:
+    mem = "" if peak is None else f"{peak / 2**20:10.1f} MiB"
+    return f"{name:<52} {secs * 1e3:10.1f} ms {mem}"
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", nargs="+", default=["10k", "1m"], help="Input sizes: 10k, 1m, 10m or row counts")
+    ap.add_argument("--data-dir", default=datagen.DEFAULT_OUT_DIR, help="Generated inputs (reused between runs)")
+    ap.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best is kept")
+    ap.add_argument("--select", nargs="+", help="Only cases matching these glob patterns, e.g. 'stocks.*' 'cli.*'")
+    ap.add_argument("--max-points", type=int, default=4000, help="max_points for the line plots (0 = plot every row)")
+    ap.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass")
+    ap.add_argument("--out", help="Write results JSON here")
+    ap.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    ap.add_argument("--time-tol", type=float, default=0.25, help="Allowed slowdown before flagging (0.25 = 25%%)")
+    ap.add_argument("--mem-tol", type=float, default=0.25, help="Allowed peak-memory growth before flagging")
+    args = ap.parse_args(argv)
+
+    res = run_suite(args.sizes, args.data_dir, repeat=args.repeat, memory=not args.no_memory, select=args.select,
+                    max_points=args.max_points or None)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(res, f, indent=2, sort_keys=True)
+        print(f"wrote {args.out}")
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_results(res, baseline, args.time_tol, args.mem_tol)
+    for r in regressions:
+        print(f"[regression] {r['case']} {r['metric']}: {r['baseline']:.4g} -> {r['current']:.4g} ({r['ratio']:.2f}x)")
+    if not regressions:
+        print(f"no regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,53 @@
+from __future__ import annotations
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+def resolve_inputs(spec: str, pattern: str = "*.csv") -> list[str]:
+    """
+    Expand a directory or glob pattern into a sorted list of file paths.
+    A directory is searched (non-recursively) for `pattern`.
+    Raises ValueError if nothing matches.
+    """
+    if os.path.isdir(spec):
+        spec = os.path.join(spec, pattern)
+    paths = sorted(p for p in glob.glob(spec) if os.path.isfile(p))
+    if not paths:
+        raise ValueError(f"No input files match {spec!r}.")
+    return paths
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+def map_unordered(
+    fn: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int | None = None,
+) -> Iterator[Tuple[Any, Any, BaseException | None]]:
+    """
+    Apply `fn` to every item and yield `(item, result, error)` as each one finishes.
+
+    - `workers <= 1` runs in-process, in input order (no pool start-up cost).
+    - Otherwise items fan out over a ProcessPoolExecutor; `fn` must be picklable
+      (a module-level function or a functools.partial of one).
+    - An exception raised for one item is yielded as `error` and does not stop the rest.
+    """
+    items = list(items)
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            try:
+                yield item, fn(item), None
+            except Exception as e:
+                yield item, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        futures = {pool.submit(fn, item): item for item in items}
+        for fut in as_completed(futures):
+            item = futures[fut]
+            try:
+                yield item, fut.result(), None
+            except Exception as e:
+                yield item, None, e
@@ -0,0 +1,110 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, asdict
+import numpy as np
+import pandas as pd
+
+# Bump when the on-disk layout changes; older entries are then treated as misses.
+CACHE_VERSION = 1
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+    def add(self, other: "CacheStats | dict") -> None:
+        other = other if isinstance(other, dict) else other.as_dict()
+        for k, v in other.items():
+            setattr(self, k, getattr(self, k) + int(v))
+
+    def diff(self, before: dict) -> dict[str, int]:
+        return {k: v - before.get(k, 0) for k, v in self.as_dict().items()}
+
+# Process-wide counters for the frame cache.
+STATS = CacheStats()
+
+def default_cache_dir() -> str:
+    """`$HW01_CACHE_DIR` if set, else `~/.cache/hw01`."""
+    return os.environ.get("HW01_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "hw01")
+
+def _entry_path(path: str, cache_dir: str, kind: str) -> str:
+    digest = hashlib.sha1(f"{kind}:{os.path.abspath(path)}".encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, "frames", f"{digest}.npz")
+
+def _source_stamp(path: str) -> dict:
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+def load_frame(path: str, cache_dir: str, kind: str, columns=None) -> pd.DataFrame | None:
+    """
+    Return the cached frame for `path`, or None on a miss.
+
+    An entry is valid only if it was written for the same absolute path, mtime and size.
+    Columns are stored as separate arrays, so `columns=` reads only those from disk.
+    """
+    entry = _entry_path(path, cache_dir, kind)
+    try:
+        stamp = _source_stamp(path)
+        with np.load(entry, allow_pickle=False) as z:
+            meta = json.loads(str(z["__meta__"]))
+            if meta.get("version") != CACHE_VERSION or meta.get("source") != stamp:
+                STATS.misses += 1
+                return None
+            stored = meta["columns"]
+            names = stored if columns is None else [c for c in columns if c in stored]
+            data = {c: z[f"c{stored.index(c)}"] for c in names}
+            index = pd.DatetimeIndex(z["__index__"], name=meta["index_name"])
+    except FileNotFoundError:
+        STATS.misses += 1
+        return None
+    except Exception:
+        # unreadable/corrupt entry: fall back to the CSV, it gets rewritten
+        STATS.errors += 1
+        STATS.misses += 1
+        return None
+    if columns is not None and len(names) != len(columns):
+        raise KeyError(f"Columns not in cached frame: {[c for c in columns if c not in names]}")
+    STATS.hits += 1
+    return pd.DataFrame(data, index=index, columns=names)
+
+def store_frame(path: str, df: pd.DataFrame, cache_dir: str, kind: str) -> bool:
+    """
+    Write `df` (DatetimeIndex, numeric columns) as an .npz entry next to the others.
+    Frames with non-numeric columns are not cached. Returns True if written.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        return False
+    if not all(np.issubdtype(dt, np.number) or dt == bool for dt in df.dtypes):
+        return False
+    entry = _entry_path(path, cache_dir, kind)
+    meta = {
+        "version": CACHE_VERSION,
+        "source": _source_stamp(path),
+        "columns": [str(c) for c in df.columns],
+        "index_name": df.index.name,
+    }
+    arrays = {f"c{i}": df[c].to_numpy() for i, c in enumerate(df.columns)}
+    try:
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        # write to a temp file and rename so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(entry), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, __meta__=np.array(json.dumps(meta)), __index__=df.index.values, **arrays)
+            os.replace(tmp, entry)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    except OSError:
+        STATS.errors += 1
+        return False
+    STATS.writes += 1
+    return True
@@ -1,55 +1,360 @@
 from __future__ import annotations
-import argparse, sys
+import argparse, contextlib, functools, importlib, os, sys
 
 try:
-    from . import stocks as S, weather as W, plotting as P
-    from .formatter import print_header, print_kv, print_series, to_json_payload
+    from . import profiling as PR
+    from . import result_cache as RC
+    from .formatter import print_header, print_kv, print_series, to_json_payload, write_ndjson
 except ImportError:
-    import stocks as S, weather as W, plotting as P
-    from formatter import print_header, print_kv, print_series, to_json_payload
+    import profiling as PR
+    import result_cache as RC
+    from formatter import print_header, print_kv, print_series, to_json_payload, write_ndjson
 
-def _stocks_cmd(args: argparse.Namespace) -> int:
-    df = S.read_stock_csv(args.input)
-    rets = S.daily_simple_returns(df, price_col=args.price_col)
+class _LazyModule:
+    """
+    Stand-in for a sibling module that is imported on first attribute access,
+    so each subcommand only pays for what it uses (no matplotlib unless a plot
+    is requested, no pandas for `client`).
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            if __package__:
+                self._module = importlib.import_module(f".{self._name}", __package__)
+            else:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+S, W, P, B, C, M, I, SV, R, SW, SC = (_LazyModule(n) for n in (
+    "stocks", "weather", "plotting", "batch", "cache", "metrics", "incremental", "server", "render", "stock_weather", "schema"))
+
+# Set by `hw01 serve` to a server.FrameCache so parsed frames outlive a request.
+FRAMES = None
+
+def _read_stock(path: str, cache_dir: str | None, columns: list[str], compact: bool = False):
+    load = lambda: S.read_stock_csv(path, cache_dir=cache_dir, columns=columns, compact=compact)
+    if FRAMES is None:
+        return load()
+    kind = ("stocks", tuple(columns), "compact") if compact else ("stocks", tuple(columns))
+    return FRAMES.get(kind, path, load)
+
+def _read_weather(path: str, columns: list[str], compact: bool = False):
+    load = lambda: W.read_weather_csv(path, compact=compact, columns=columns)
+    if FRAMES is None:
+        return load()
+    kind = ("weather", tuple(columns), "compact") if compact else ("weather", tuple(columns))
+    return FRAMES.get(kind, path, load)
+
+def _report_compact(df) -> None:
+    try:
+        from .compact import report_line
+    except ImportError:
+        from compact import report_line
+    print(report_line(df), file=sys.stderr)
+
+def _metrics_payload(ticker: str | None, n_rows: int, m, first_returns: list) -> dict:
     metrics = {
-        "avg_daily_return": S.average_daily_return(rets),
-        "cumulative_return": S.cumulative_return(df, price_col=args.price_col),
-        "additional_metric": None,  # placeholder; students will implement
+        **m.as_dict(),
+        "additional_metric": m.sharpe_ratio,
     }
-    payload = {
-        "ticker": args.ticker or "UNKNOWN",
-        "n_rows": int(df.shape[0]),
+    return {
+        "ticker": ticker or "UNKNOWN",
+        "n_rows": int(n_rows),
         "metrics": metrics,
-        "first_5_returns": rets.head(5).tolist(),
+        "first_5_returns": first_returns,
     }
-    # optional plot
+
+def _stocks_payload(df, rets, ticker: str | None, price_col: str, risk_free: float) -> dict:
+    m = M.compute_metrics(df[price_col].to_numpy(), risk_free_rate=risk_free).stock_metrics()
+    return _metrics_payload(ticker, df.shape[0], m, rets.head(5).tolist())
+
+def _incremental_payload(df, args: argparse.Namespace) -> dict:
+    # fold only rows newer than the saved state into it; start over if the
+    # state was built for a different price column or MA windows
+    state = None
+    if os.path.exists(args.incremental_state):
+        state = I.TickerState.load(args.incremental_state)
+        if state.price_col != args.price_col or state.windows != list(args.windows):
+            state = None
+    if state is None:
+        state = I.TickerState(price_col=args.price_col, windows=list(args.windows))
+    state.update(df)
+    state.save(args.incremental_state)
+    payload = _metrics_payload(args.ticker, state.n_rows, state.stock_metrics(args.risk_free), state.first_returns)
+    payload["moving_averages"] = state.moving_averages()
+    return payload
+
+def _ticker_from_path(path: str) -> str:
+    return os.path.splitext(os.path.basename(path))[0].upper()
+
+def _cache_dir(args: argparse.Namespace) -> str | None:
+    if args.no_cache:
+        return None
+    return args.cache_dir or C.default_cache_dir()
+
+def _report_cache_stats(stats: dict, kind: str = "frames") -> None:
+    print(f"[cache] {kind}: " + " ".join(f"{k}={v}" for k, v in stats.items()), file=sys.stderr)
+
+def _result_cacheable(args: argparse.Namespace) -> bool:
+    # only --json runs of one CSV whose sole effect is the printed output
+    if args.cmd == "stocks":
+        side_effects = args.inputs or args.incremental_state or args.plot_out
+    elif args.cmd == "weather":
+        side_effects = args.stream or args.plot_out or args.show
+    else:
+        return False
+    if not args.json or args.no_cache or args.no_result_cache:
+        return False
+    return not side_effects and os.path.isfile(args.input)
+
+class _Tee:
+    """stdout/stderr stand-in that passes writes through and keeps a copy."""
+
+    def __init__(self, stream):
+        self.stream, self.parts = stream, []
+
+    def write(self, text: str) -> int:
+        self.parts.append(text)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+def _run_result_cached(args: argparse.Namespace) -> int:
+    """
+    Answer from the result cache when the inputs, options and code are
+    unchanged (no pandas import on a hit); otherwise run as usual and store
+    what was printed. Both streams are replayed, so a hit prints the same
+    `--compact` / frame `--cache-stats` lines as the run that stored it.
+    """
+    cache = RC.ResultCache(os.path.join(args.cache_dir or RC.default_cache_dir(), "results"),
+                           max_bytes=int(args.result_cache_mb * 2**20))
+    try:
+        key = RC.make_key(args.cmd, vars(args), [args.input])
+    except OSError:
+        return args.func(args)
+    hit = cache.get(key)
+    if hit is not None:
+        out_text, err_text = hit
+        sys.stderr.write(err_text)
+        sys.stderr.flush()
+        sys.stdout.write(out_text)
+        sys.stdout.flush()
+        code = 0
+    else:
+        out, err = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = tee_out, tee_err = _Tee(out), _Tee(err)
+        try:
+            code = args.func(args)
+        finally:
+            sys.stdout, sys.stderr = out, err
+        if code == 0:
+            cache.put(key, "".join(tee_out.parts), "".join(tee_err.parts))
+    if args.cache_stats:
+        _report_cache_stats({**RC.STATS.as_dict(), **cache.usage()}, kind="results")
+    return code
+
+def _stock_plot_data(kind: str, df, rets, price_col: str, windows, bins: int, max_points: int | None = None) -> dict:
+    if kind == "price_ma":
+        return R.stock_price_ma_data(df, windows=tuple(windows), price_col=price_col, max_points=max_points)
+    return R.returns_hist_data(rets, bins=bins)
+
+def _stocks_batch_one(path: str, price_col: str = "Adj Close", risk_free: float = 0.015, cache_dir: str | None = None,
+                      plot_kind: str | None = None, windows=(20, 50), bins: int = 30,
+                      max_points: int | None = None, profile: bool = False) -> tuple[dict, dict, dict | None, list | None]:
+    # module-level so it can be pickled into pool workers; also returns this
+    # call's cache counter deltas, since workers don't share C.STATS, the
+    # arrays to chart if a plot was requested, and (with `profile`) this
+    # call's stage records for the parent's StageTimer
+    before = C.STATS.as_dict()
+    with PR.collect() if profile else contextlib.nullcontext() as timer:
+        with PR.stage("read"):
+            df = S.read_stock_csv(path, cache_dir=cache_dir, columns=[price_col])
+        with PR.stage("returns"):
+            rets = S.daily_simple_returns(df, price_col=price_col)
+        with PR.stage("metrics"):
+            payload = _stocks_payload(df, rets, _ticker_from_path(path), price_col, risk_free)
+        plot = None
+        if plot_kind:
+            with PR.stage("plot_data"):
+                plot = _stock_plot_data(plot_kind, df, rets, price_col, windows, bins, max_points)
+    stages = timer.as_dict()["stages"] if profile else None
+    return payload, C.STATS.diff(before), plot, stages
+
+def _report_plot_errors(done: list) -> int:
+    n_failed = 0
+    for outfile, err in done:
+        if err is not None:
+            n_failed += 1
+            print(f"[error] plot {outfile}: {type(err).__name__}: {err}", file=sys.stderr)
+    return n_failed
+
+def _stocks_batch_cmd(args: argparse.Namespace) -> int:
+    # one JSON line per input file, written as soon as each result is ready
+    # (charts, with --plot-dir, are rendered by a RenderQueue and awaited at the end)
     if args.plot_out:
-        if args.plot_kind == "price_ma":
-            P.plot_stock_price_ma(df, windows=tuple(args.windows), price_col=args.price_col, outfile=args.plot_out)
-        elif args.plot_kind == "returns_hist":
-            P.plot_returns_hist(rets, bins=args.bins, outfile=args.plot_out)
+        print("[error] --plot-out is not supported with --inputs; use --plot-dir", file=sys.stderr)
+        return 2
+    try:
+        with PR.stage("resolve_inputs"):
+            paths = B.resolve_inputs(args.inputs)
+    except ValueError as e:
+        print(f"[error] {e}", file=sys.stderr)
+        return 2
+    plot_kind = args.plot_kind if args.plot_dir else None
+    if plot_kind:
+        os.makedirs(args.plot_dir, exist_ok=True)
+    profile = PR.enabled()
+    fn = functools.partial(_stocks_batch_one, price_col=args.price_col, risk_free=args.risk_free, cache_dir=_cache_dir(args),
+                           plot_kind=plot_kind, windows=tuple(args.windows), bins=args.bins, max_points=args.max_points,
+                           profile=profile)
+    failed = []
+    stats = C.CacheStats()
+    worker_stages = []
+    queue = R.RenderQueue(workers=args.workers) if plot_kind else None
+
+    def payloads():
+        for path, result, err in B.map_unordered(fn, paths, workers=args.workers):
+            if err is None:
+                payload, delta, plot, stages = result
+                stats.add(delta)
+                worker_stages.extend(stages or ())
+                if plot is not None:
+                    outfile = os.path.join(args.plot_dir, f"{payload['ticker']}_{plot_kind}.png")
+                    queue.submit(plot_kind, outfile, plot)
+                    payload["plot"] = outfile
+            else:
+                failed.append(path)
+                payload = {
+                    "ticker": _ticker_from_path(path),
+                    "input": path,
+                    "error": f"{type(err).__name__}: {err}",
+                }
+            yield payload
+
+    # per-file stages run in the workers; they are summed under "process"
+    with PR.stage("process"):
+        write_ndjson(payloads())
+        if profile:
+            PR.PROFILER.add_stages(worker_stages)
+    n_failed = len(failed)
+    if queue is not None:
+        with queue, PR.stage("plot_wait"):
+            n_failed += _report_plot_errors(queue.wait())
+    if args.cache_stats:
+        _report_cache_stats(stats.as_dict())
+    return 1 if n_failed else 0
+
+def _stocks_cmd(args: argparse.Namespace) -> int:
+    if args.inputs:
+        return _stocks_batch_cmd(args)
+    with PR.stage("read"):
+        df = _read_stock(args.input, _cache_dir(args), SC.stock_columns(args.price_col), compact=args.compact)
+    if args.compact:
+        _report_compact(df)
+    if args.cache_stats:
+        _report_cache_stats(C.STATS.as_dict())
+    if args.incremental_state:
+        rets = None
+        with PR.stage("incremental"):
+            payload = _incremental_payload(df, args)
+    else:
+        with PR.stage("returns"):
+            rets = S.daily_simple_returns(df, price_col=args.price_col)
+        with PR.stage("metrics"):
+            payload = _stocks_payload(df, rets, args.ticker, args.price_col, args.risk_free)
+    metrics = payload["metrics"]
+    # optional plot: rendered in the background while the results print
+    queue = None
+    if args.plot_out:
+        with PR.stage("plot_submit"):
+            if args.plot_kind == "returns_hist" and rets is None:
+                rets = S.daily_simple_returns(df, price_col=args.price_col)
+            queue = R.RenderQueue(workers=1)
+            queue.submit(args.plot_kind, args.plot_out, _stock_plot_data(args.plot_kind, df, rets, args.price_col, args.windows, args.bins, args.max_points))
 
     if args.json:
-        print(to_json_payload(payload))
+        with PR.stage("json_encode"):
+            text = to_json_payload(payload)
+        with PR.stage("write"):
+            print(text, flush=True)
+    else:
+        with PR.stage("write"):
+            print_header(f"Stock Analysis — {payload['ticker']}")
+            for k, v in metrics.items():
+                print_kv(k, v)
+            for k, v in payload.get("moving_averages", {}).items():
+                print_kv(k, v)
+            print_series("first_5_returns", rets if rets is not None else payload["first_5_returns"], head=5)
+    if queue is not None:
+        with queue, PR.stage("plot_wait"):
+            if _report_plot_errors(queue.wait()):
+                return 1
+    return 0
+
+def _weather_stream_cmd(args: argparse.Namespace) -> int:
+    # chunked single pass; nothing is plotted because no frame is kept
+    if args.plot_out or args.show:
+        print("[error] --plot-out/--show are not supported with --stream", file=sys.stderr)
+        return 2
+    try:
+        from . import weather_stream as WS
+    except ImportError:
+        import weather_stream as WS
+    with PR.stage("stream"):
+        res = WS.stream_weather(args.input, start=args.start, end=args.end, chunksize=args.chunksize)
+    payload = {
+        "n_rows": res["n_rows"],
+        "summary": res["summary"],
+        "sliced_means": res["sliced_means"],
+        "has_celsius": True,
+        "seasonal_summaries": res["seasonal_summaries"],
+        "memory": res["memory"],
+    }
+    if args.json:
+        with PR.stage("json_encode"):
+            text = to_json_payload(payload)
+        with PR.stage("write"):
+            print(text)
         return 0
-    print_header(f"Stock Analysis — {payload['ticker']}")
-    for k, v in metrics.items():
-        print_kv(k, v)
-    print_series("first_5_returns", rets, head=5)
+    print_header("Weather Analysis (streaming)")
+    for k, v in payload["summary"].items():
+        print_kv(k, v, places=4 if "min" in k else 2)
+    print_series("sliced_means", payload["sliced_means"])
+    if payload["seasonal_summaries"]:
+        print_series("seasonal_summaries", payload["seasonal_summaries"])
+    for k, v in payload["memory"].items():
+        print(f"{k}: {v}")
     return 0
 
 def _weather_cmd(args: argparse.Namespace) -> int:
-    df = W.read_weather_csv(args.input)
-    summary = W.min_max_summary(df)
+    if args.stream:
+        return _weather_stream_cmd(args)
+    with PR.stage("read"):
+        df = _read_weather(args.input, SC.weather_columns(), compact=args.compact)
+    if args.compact:
+        _report_compact(df)
+    with PR.stage("summary"):
+        summary = W.min_max_summary(df)
     if not summary:
         summary = {}
-    sliced_means = W.slice_and_means(df, start=args.start, end=args.end)
+    with PR.stage("slice_means"):
+        sliced_means = W.slice_and_means(df, start=args.start, end=args.end)
     if sliced_means is None or (hasattr(sliced_means, 'empty') and sliced_means.empty):
         sliced_means = None
-    df2 = W.add_celsius_column(df)
+    with PR.stage("celsius"):
+        df2 = W.add_celsius_column(df)
     if df2 is None:
         df2 = df
-    seasons = W.seasonal_summaries(df)
+    with PR.stage("seasonal"):
+        seasons = W.seasonal_summaries(df)
     if not seasons:
         seasons = {}
 
@@ -60,15 +365,18 @@ def _weather_cmd(args: argparse.Namespace) -> int:
         "has_celsius": "temperaturemax_celsius" in df2.columns,
         "seasonal_summaries": seasons,
     }
-    # plotting: save if requested; show if requested
-    did_plot = False
+    # plotting: the saved file renders in the background while results print;
+    # --show draws its own pyplot window
+    queue = None
     if args.plot_out:
-        P.plot_weather_tmax_and_celsius(df2, outfile=args.plot_out)
-        did_plot = True
+        with PR.stage("plot_submit"):
+            queue = R.RenderQueue(workers=1)
+            queue.submit("weather", args.plot_out, R.weather_tmax_and_celsius_data(df2, max_points=args.max_points))
     if args.show:
-        # If we didn't save (no figure created yet), create the plot first.
-        if not did_plot:
-            P.plot_weather_tmax_and_celsius(df2, outfile=None)
+        # finish the background render first; matplotlib isn't thread-safe
+        plot_errors = _report_plot_errors(queue.wait()) if queue is not None else 0
+        with PR.stage("plot_show"):
+            P.plot_weather_tmax_and_celsius(df2, outfile=None, max_points=args.max_points)
         # Show the current figure(s)
         try:
             import matplotlib.pyplot as plt
@@ -76,34 +384,187 @@ def _weather_cmd(args: argparse.Namespace) -> int:
         except Exception as e:
             print(f"[warn] Unable to show plot window: {e}")
 
+    if args.json:
+        with PR.stage("json_encode"):
+            text = to_json_payload(payload)
+        with PR.stage("write"):
+            print(text, flush=True)
+    else:
+        with PR.stage("write"):
+            print_header("Weather Analysis")
+            if summary:
+                for k, v in summary.items():
+                    print_kv(k, v, places=4 if "min" in k else 2)
+            if sliced_means is not None:
+                print_series("sliced_means", sliced_means)
+            if seasons:
+                print_series("seasonal_summaries", seasons)
+    if queue is not None:
+        with queue, PR.stage("plot_wait"):
+            if _report_plot_errors(queue.wait()) or (args.show and plot_errors):
+                return 1
+    return 0
+
+def _expand_inputs(specs: list[str]) -> list[str]:
+    # plain paths pass through; directories and glob patterns expand
+    out = []
+    for spec in specs:
+        out.extend(B.resolve_inputs(spec) if os.path.isdir(spec) or any(ch in spec for ch in "*?[") else [spec])
+    return out
+
+def _compare_cmd(args: argparse.Namespace) -> int:
+    try:
+        stock_paths, weather_paths = _expand_inputs(args.stocks), _expand_inputs(args.weather)
+        res = SW.load_and_compare(
+            stock_paths, weather_paths, price_col=args.price_col, features=args.features, cache_dir=_cache_dir(args),
+            window=args.window, lags=args.lags, min_periods=args.min_periods, tolerance_days=args.tolerance_days,
+        )
+    except (ValueError, KeyError) as e:
+        print(f"[error] {e}", file=sys.stderr)
+        return 2
+    payload = {
+        "tickers": res.tickers,
+        "stations": res.stations,
+        "features": res.features,
+        "n_days": len(res.dates),
+        "window": res.window,
+        "lags": res.lags,
+        "results": res.summary(),
+    }
     if args.json:
         print(to_json_payload(payload))
         return 0
-    print_header("Weather Analysis")
-    if summary:
-        for k, v in summary.items():
-            print_kv(k, v, places=4 if "min" in k else 2)
-    if sliced_means is not None:
-        print_series("sliced_means", sliced_means)
-    if seasons:
-        print_series("seasonal_summaries", seasons)
+    print_header(f"Stocks vs Weather — {len(res.tickers)} tickers x {len(res.stations)} stations, {len(res.dates)} trading days")
+    for f, by_ticker in payload["results"].items():
+        for t, by_station in by_ticker.items():
+            for st, r in by_station.items():
+                print_kv(f"{f} | {t} ~ {st} corr", r["corr"])
+                for lag in r["lags"]:
+                    print_kv(f"{f} | {t} ~ {st} beta lag {lag['lag']}", lag["beta"], places=6)
+                print_kv(f"{f} | {t} ~ {st} rolling corr (last, w={res.window})", r["rolling_corr"]["last"])
+    return 0
+
+def _serve_cmd(args: argparse.Namespace) -> int:
+    token = args.token or os.environ.get(SV.TOKEN_ENV)
+    try:
+        srv = SV.QueryServer(args.host, args.port, max_bytes=int(args.max_mb * 1024 * 1024), verbose=args.verbose, token=token)
+    except ValueError as e:
+        print(f"[error] {e}; pass --token or set ${SV.TOKEN_ENV}", file=sys.stderr)
+        return 2
+    with srv:
+        print(f"[serve] listening on {srv.url} (frame cache {args.max_mb:g} MB); Ctrl-C to stop", file=sys.stderr, flush=True)
+        try:
+            srv.serve_forever()
+        except KeyboardInterrupt:
+            pass
     return 0
 
+def _client_cmd(args: argparse.Namespace) -> int:
+    argv = args.argv[1:] if args.argv[:1] == ["--"] else args.argv
+    if not argv:
+        print("[error] nothing to forward; e.g. hw01 client -- stocks --input data/NVDA.csv --json", file=sys.stderr)
+        return 2
+    try:
+        res = SV.request(args.url, argv, token=args.token or os.environ.get(SV.TOKEN_ENV))
+    except OSError as e:
+        print(f"[error] server at {args.url} unavailable: {e}", file=sys.stderr)
+        return 2
+    sys.stdout.write(res["stdout"])
+    sys.stderr.write(res["stderr"])
+    return res["exit_code"]
+
+def _add_profile_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--profile", action="store_true", help="Print per-stage wall/CPU time and memory to stderr")
+    p.add_argument("--profile-json", action="store_true", help="Like --profile, as one JSON line on stderr")
+    p.add_argument("--profile-out", help="Also write a cProfile dump here (open with pstats / snakeviz)")
+
+# downsample.minmax_indices needs at least first/last plus one min/max pair;
+# not imported from there so building the parser stays numpy-free
+_MIN_MAX_POINTS = 4
+
+def _max_points(value: str) -> int:
+    """argparse type for --max-points: an int >= 4."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if n < _MIN_MAX_POINTS:
+        raise argparse.ArgumentTypeError(f"must be at least {_MIN_MAX_POINTS}, got {n}")
+    return n
+
+def _add_result_cache_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--no-result-cache", action="store_true", help="Recompute --json output even if an identical earlier run was cached")
+    p.add_argument("--result-cache-mb", type=float, default=RC.DEFAULT_MAX_BYTES / 2**20,
+                   help="Size cap for stored --json results; least recently used entries are evicted (default: 64)")
+
+# Modules a profiled subcommand needs, imported in their own "import" stage so
+# pandas' (and pyarrow's) import time is not billed to the first stage that
+# happens to touch them.
+_PROFILE_IMPORTS = {"stocks": (S, SC, C, B), "weather": (W, SC)}
+
+def _import_stage(cmd: str) -> None:
+    with PR.stage("import"):
+        for mod in _PROFILE_IMPORTS.get(cmd, ()):
+            mod._load()
+        if cmd in _PROFILE_IMPORTS and SC.csv_engine() == "pyarrow":
+            importlib.import_module("pyarrow")  # pandas imports it on the first read otherwise
+
+def _run_profiled(args: argparse.Namespace) -> int:
+    timer = PR.enable()
+    _import_stage(args.cmd)
+    prof = None
+    if args.profile_out:
+        import cProfile
+        prof = cProfile.Profile()
+        prof.enable()
+    try:
+        return args.func(args)
+    finally:
+        if prof is not None:
+            prof.disable()
+            prof.dump_stats(args.profile_out)
+        PR.disable()
+        if args.profile or args.profile_json:
+            PR.report(timer, as_json=args.profile_json)
+
+# stocks options that only apply to a single --input
+_SINGLE_INPUT_ONLY = (("incremental_state", "--incremental-state"), ("compact", "--compact"))
+
+def _check_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    """Reject option combinations argparse can't express (exits 2 with usage)."""
+    if args.cmd == "stocks" and args.inputs:
+        bad = [flag for dest, flag in _SINGLE_INPUT_ONLY if getattr(args, dest)]
+        if bad:
+            parser.error(f"{', '.join(bad)} cannot be used with --inputs")
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="hw01", description="CSCI 4170/6170 F25 Lab+HW 01 CLI")
     sub = p.add_subparsers(dest="cmd", required=True)
 
     sp = sub.add_parser("stocks", help="Analyze a stock CSV")
-    sp.add_argument("--input", required=True, help="Path to stock CSV")
+    src = sp.add_mutually_exclusive_group(required=True)
+    src.add_argument("--input", help="Path to stock CSV")
+    src.add_argument("--inputs", help="Batch mode: directory or glob of stock CSVs; emits one JSON line per file (--json is implied)")
+    sp.add_argument("--workers", type=int, default=None, help="Worker processes for --inputs (default: CPU count; 1 = in-process)")
     sp.add_argument("--ticker", required=False, help="Ticker symbol (for labeling only)")
     sp.add_argument("--price-col", default="Adj Close", help="Price column to use (default: Adj Close)")
     sp.add_argument("--risk-free", type=float, default=0.015, help="Annual risk-free rate (e.g., 0.015 for 1.5%)")
     sp.add_argument("--json", action="store_true", help="Emit JSON for autograder")
+    # parsed-frame cache
+    sp.add_argument("--cache-dir", help="Directory for the parsed-CSV cache (default: $HW01_CACHE_DIR or ~/.cache/hw01)")
+    sp.add_argument("--no-cache", action="store_true", help="Always parse the CSV; do not read or write the cache")
+    sp.add_argument("--cache-stats", action="store_true", help="Print cache hit/miss counters to stderr")
+    _add_result_cache_args(sp)
+    sp.add_argument("--compact", action="store_true", help="Hold the frame in float32/nullable-int dtypes; bytes saved go to stderr")
+    sp.add_argument("--incremental-state", help="JSON state file: only rows newer than the saved state are processed, then the state is updated")
     # plotting
     sp.add_argument("--plot-out", help="Path to save plot (PNG). If omitted, no plot is saved.")
+    sp.add_argument("--plot-dir", help="Batch mode: save one <TICKER>_<plot-kind>.png per input here, rendered in the background")
     sp.add_argument("--plot-kind", choices=["price_ma", "returns_hist"], default="price_ma")
     sp.add_argument("--windows", nargs="+", type=int, default=[20, 50], help="MA windows (price_ma only)")
     sp.add_argument("--bins", type=int, default=30, help="Bins for returns_hist")
+    sp.add_argument("--max-points", type=_max_points, default=None, help="Thin price_ma lines to about this many points (min/max per bucket)")
+    _add_profile_args(sp)
     sp.set_defaults(func=_stocks_cmd)
 
     wp = sub.add_parser("weather", help="Analyze a weather CSV")
@@ -111,12 +572,50 @@ def build_parser() -> argparse.ArgumentParser:
     wp.add_argument("--start", default="2022-01-10", help="Slice start date")
     wp.add_argument("--end", default="2022-01-20", help="Slice end date")
     wp.add_argument("--json", action="store_true", help="Emit JSON for autograder")
+    wp.add_argument("--compact", action="store_true", help="Hold the frame in float32/int32 dtypes; bytes saved go to stderr")
+    wp.add_argument("--stream", action="store_true", help="Read the CSV in chunks with bounded memory (no plots); reports peak memory")
+    wp.add_argument("--chunksize", type=int, default=100_000, help="Rows per chunk for --stream")
+    # result cache
+    wp.add_argument("--cache-dir", help="Directory for the result cache (default: $HW01_CACHE_DIR or ~/.cache/hw01)")
+    wp.add_argument("--no-cache", action="store_true", help="Always recompute; do not read or write the result cache")
+    wp.add_argument("--cache-stats", action="store_true", help="Print result-cache hit/miss counters to stderr")
+    _add_result_cache_args(wp)
     # plotting
     wp.add_argument("--plot-out", help="Path to save plot (PNG). If omitted, no plot is saved.")
     # normal behaviour: --show turns the window on (default = off)
     wp.add_argument("--show", action="store_true", help="Display the weather plot in a window")
+    wp.add_argument("--max-points", type=_max_points, default=None, help="Thin the plotted lines to about this many points (min/max per bucket)")
+    _add_profile_args(wp)
     wp.set_defaults(func=_weather_cmd)
 
+    xp = sub.add_parser("compare", help="Correlate stock returns with weather features (as-of joined to trading days)")
+    xp.add_argument("--stocks", nargs="+", required=True, help="Stock CSVs, directories or glob patterns (ticker = file name)")
+    xp.add_argument("--weather", nargs="+", required=True, help="Weather CSVs, directories or glob patterns (station = 'station' column or file name)")
+    xp.add_argument("--features", nargs="+", default=["temperaturemax", "precipitation"], help="Weather columns to use")
+    xp.add_argument("--price-col", default="Adj Close", help="Price column for returns (default: Adj Close)")
+    xp.add_argument("--window", type=int, default=60, help="Rolling correlation window, in trading days")
+    xp.add_argument("--min-periods", type=int, default=None, help="Paired rows needed in a window (default: the window)")
+    xp.add_argument("--lags", nargs="+", type=int, default=[0, 1, 2], help="Feature lags (trading days) for the regressions")
+    xp.add_argument("--tolerance-days", type=int, default=3, help="Oldest weather observation (calendar days) an as-of match may use")
+    xp.add_argument("--json", action="store_true", help="Emit JSON")
+    xp.add_argument("--cache-dir", help="Directory for the parsed-CSV cache (default: $HW01_CACHE_DIR or ~/.cache/hw01)")
+    xp.add_argument("--no-cache", action="store_true", help="Always parse the stock CSVs; do not read or write the cache")
+    xp.set_defaults(func=_compare_cmd)
+
+    vp = sub.add_parser("serve", help="Answer stocks/weather requests from one warm process over HTTP on localhost")
+    vp.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1); non-loopback addresses need --token")
+    vp.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    vp.add_argument("--max-mb", type=float, default=512, help="Memory cap for cached parsed frames, in MB")
+    vp.add_argument("--verbose", action="store_true", help="Log each request to stderr")
+    vp.add_argument("--token", help="Require this shared secret on every request (default: $HW01_SERVER_TOKEN)")
+    vp.set_defaults(func=_serve_cmd)
+
+    cp = sub.add_parser("client", help="Forward a stocks/weather command to a running 'serve' process")
+    cp.add_argument("--url", default="http://127.0.0.1:8765", help="Server URL (default: http://127.0.0.1:8765)")
+    cp.add_argument("--token", help="Shared secret the server was started with (default: $HW01_SERVER_TOKEN)")
+    cp.add_argument("argv", nargs=argparse.REMAINDER, help="CLI arguments to forward, e.g. -- stocks --input data/NVDA.csv --json")
+    cp.set_defaults(func=_client_cmd)
+
     return p
 
 def main(argv=None) -> int:
@@ -146,7 +645,19 @@ def main(argv=None) -> int:
 
         print("[dev] No args supplied; using defaults:", " ".join(argv))
     parser = build_parser()
-    args = parser.parse_args(argv)
+    return dispatch(parser, parser.parse_args(argv))
+
+def dispatch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    """
+    Run parsed `args` the way the command line does: argument checks, then
+    --profile*, the result cache or the plain subcommand. `serve` uses this
+    too, so forwarded queries behave the same.
+    """
+    _check_args(parser, args)
+    if getattr(args, "profile", False) or getattr(args, "profile_json", False) or getattr(args, "profile_out", None):
+        return _run_profiled(args)
+    if _result_cacheable(args):
+        return _run_result_cached(args)
     return args.func(args)
 
 if __name__ == "__main__":
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+# Declared tolerance for storing a float64 column as float32: every finite
+# value must round-trip within this relative error. float32 rounds values in
+# its normal range to within 6e-8, so at this setting only columns with values
+# beyond that range (overflow, or subnormals that lose digits) stay float64;
+# pass a smaller `rtol` to be stricter.
+FLOAT32_RTOL = 1e-6
+# Metrics computed from compact frames agree with the float64 load to this
+# relative tolerance. Stock metrics upcast to float64 before computing, so
+# only the storage rounding shows; the weather aggregates go through
+# `as_float64`, which also undoes the storage rounding of short decimals.
+RESULT_RTOL = 1e-5
+# object columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+# Nothing narrower than 32 bits: small-int arithmetic wraps silently
+# (an int8 temperature overflows in (t - 32) * 5).
+_NULLABLE = (("UInt32", "Int32"), ("UInt64", "Int64"))
+
+def _smallest_nullable(lo: int, hi: int) -> str:
+    for unsigned, signed in _NULLABLE:
+        name = unsigned if lo >= 0 else signed
+        info = np.iinfo(name.lower())
+        if info.min <= lo and hi <= info.max:
+            return name
+    return "Int64"
+
+def _count_dtype(s: pd.Series) -> str | None:
+    # nullable int for whole-number counts (NaN -> <NA>); None if any value has a fraction
+    x = s.to_numpy(dtype=np.float64, na_value=np.nan)
+    ok = ~np.isnan(x)
+    if not ok.any():
+        return None
+    vals = x[ok]
+    if not np.array_equal(vals, np.floor(vals)):
+        return None
+    return _smallest_nullable(int(vals.min()), int(vals.max()))
+
+def _as_float32(x: np.ndarray, rtol: float) -> np.ndarray | None:
+    # float32 copy of x if every value round-trips within rtol, else None;
+    # NaN/inf compare False below, while a finite value overflowing to inf is caught
+    with np.errstate(over="ignore", invalid="ignore"):
+        x32 = x.astype(np.float32)
+        err = np.abs(x32 - x)
+        err -= rtol * np.abs(x)
+    return None if (err > 0).any() else x32
+
+# significant digits float32 holds reliably (24-bit mantissa ~ 7.2 digits)
+FLOAT32_DIGITS = 7
+
+def as_float64(values) -> np.ndarray:
+    """
+    float64 array of `values` (NaN for missing). float32 input (a compacted
+    column) is rounded to FLOAT32_DIGITS significant digits, which gives back
+    the CSV's decimal value whenever it had that many digits or fewer, so
+    aggregates match the float64 load (0.14, not 0.14000000059604645).
+    """
+    if isinstance(values, pd.Series):
+        values = values.to_numpy(dtype=np.float64 if values.dtype != np.float32 else np.float32, na_value=np.nan)
+    x = np.asarray(values)
+    if x.dtype != np.float32:
+        return x.astype(np.float64, copy=False)
+    v = x.astype(np.float64)
+    a = np.abs(v)
+    # below 1e7 (larger float32 values are integers); zeros/NaN/inf pass through
+    ok = (a > 0) & (a < 1e7)
+    scale = 10.0 ** (FLOAT32_DIGITS - np.ceil(np.log10(a, where=ok, out=np.ones_like(a))))
+    return np.where(ok, np.rint(v * scale) / scale, v)
+
+def compact_frame(df: pd.DataFrame, counts=(), rtol: float = FLOAT32_RTOL) -> pd.DataFrame:
+    """
+    Copy of `df` in smaller dtypes; the index is kept as-is.
+
+    - columns named in `counts` -> the smallest nullable (U)Int that holds them
+      (missing values become <NA>);
+    - other int64 columns -> int32 when the range fits (lossless);
+    - float64 columns -> float32 when every value is within `rtol` (see FLOAT32_RTOL);
+    - object columns with few distinct values -> category.
+
+    `df.attrs["compact"]` records bytes before/after and each converted column.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    changes: dict[str, str] = {}
+    new = {}
+    for col in df.columns:
+        s = df[col]
+        kind = s.dtype.kind
+        target = None
+        if col in counts and kind in "iuf":
+            target = _count_dtype(s)
+        elif s.dtype == np.int64 and len(s):
+            info = np.iinfo(np.int32)
+            if info.min <= s.min() and s.max() <= info.max:
+                target = np.dtype(np.int32)
+        elif s.dtype == np.float64:
+            x32 = _as_float32(s.to_numpy(), rtol)
+            if x32 is not None:
+                new[col] = pd.Series(x32, index=df.index, name=col)
+        elif kind == "O" and len(s) and s.nunique(dropna=False) <= CATEGORY_MAX_RATIO * len(s):
+            target = "category"
+        if target is not None:
+            new[col] = s.astype(target)
+        if col in new:
+            changes[str(col)] = f"{s.dtype}->{new[col].dtype}"
+    out = df.assign(**new) if new else df.copy()
+    after = int(out.memory_usage(deep=True).sum())
+    out.attrs["compact"] = {"bytes_before": before, "bytes_after": after, "bytes_saved": before - after, "columns": changes}
+    return out
+
+def report_line(df: pd.DataFrame) -> str:
+    """One-line summary of `df.attrs["compact"]` for stderr."""
+    rep = df.attrs.get("compact")
+    if not rep:
+        return "[compact] frame was not compacted"
+    pct = 100.0 * rep["bytes_saved"] / rep["bytes_before"] if rep["bytes_before"] else 0.0
+    cols = ", ".join(f"{c} {t}" for c, t in rep["columns"].items()) or "no columns converted"
+    return (f"[compact] {rep['bytes_before'] / 2**20:.2f} MiB -> {rep['bytes_after'] / 2**20:.2f} MiB "
+            f"(saved {rep['bytes_saved'] / 2**20:.2f} MiB, {pct:.0f}%): {cols}")
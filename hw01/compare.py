@@ -0,0 +1,216 @@
+from __future__ import annotations
+import os
+from dataclasses import dataclass
+from typing import Mapping, Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    from . import stocks as S
+except ImportError:
+    import stocks as S
+
+COMPARE_FIELDS = ("Close", "Volume")
+# brand colors for the original pair; everything else uses matplotlib's cycle
+TICKER_COLORS = {"NVDA": "#76B900", "AMD": "#ED1C24"}
+
+@dataclass
+class Panel:
+    """
+    N tickers on one shared, sorted date index.
+
+    `data[field]` is a float64 array of shape (len(dates), len(tickers)), NaN
+    wherever a ticker has no row for that date (outer join).
+    """
+    tickers: list[str]
+    dates: pd.DatetimeIndex
+    data: dict[str, np.ndarray]
+
+    def mask(self, field: str) -> np.ndarray:
+        """True where `field` has a value."""
+        return ~np.isnan(self.data[field])
+
+    def frame(self, field: str) -> pd.DataFrame:
+        return pd.DataFrame(self.data[field], index=self.dates, columns=self.tickers)
+
+    def subset(self, tickers: Sequence[str]) -> "Panel":
+        missing = [t for t in tickers if t not in self.tickers]
+        if missing:
+            raise KeyError(f"Tickers not in panel: {missing}")
+        cols = [self.tickers.index(t) for t in tickers]
+        data = {f: v[:, cols] for f, v in self.data.items()}
+        # drop dates none of the chosen tickers trade on
+        keep = np.zeros(len(self.dates), dtype=bool)
+        for v in data.values():
+            keep |= ~np.isnan(v).all(axis=1)
+        return Panel(list(tickers), self.dates[keep], {f: v[keep] for f, v in data.items()})
+
+def align(frames: Mapping[str, pd.DataFrame], fields: Sequence[str] = COMPARE_FIELDS) -> Panel:
+    """
+    Outer-join date-indexed frames (ticker -> frame) into one Panel.
+
+    All rows are stacked once and scattered into the 2-D arrays with a single
+    fancy-index assignment per field. Dates are assumed unique within each
+    ticker (as `read_stock_csv` assumes).
+    """
+    tickers = list(frames)
+    fields = list(fields)
+    lengths = np.array([len(frames[t]) for t in tickers], dtype=np.int64)
+    all_dates = np.concatenate([frames[t].index.values.astype("datetime64[ns]") for t in tickers]) if tickers else np.array([], dtype="datetime64[ns]")
+    dates, row = np.unique(all_dates, return_inverse=True)
+    col = np.repeat(np.arange(len(tickers)), lengths)
+    data = {}
+    for f in fields:
+        stacked = np.concatenate([frames[t][f].to_numpy(dtype=np.float64) for t in tickers]) if tickers else np.array([])
+        out = np.full((len(dates), len(tickers)), np.nan)
+        out[row, col] = stacked
+        data[f] = out
+    return Panel(tickers, pd.DatetimeIndex(dates, name="Date"), data)
+
+def load_panel(paths: Sequence[str], fields: Sequence[str] = COMPARE_FIELDS, cache_dir: str | None = None,
+               tickers: Sequence[str] | None = None) -> Panel:
+    """Read stock CSVs (ticker = upper-cased file stem unless `tickers` is given) and `align` them."""
+    if tickers is None:
+        tickers = [os.path.splitext(os.path.basename(p))[0].upper() for p in paths]
+    if len(set(tickers)) != len(tickers):
+        raise ValueError(f"Duplicate tickers: {list(tickers)}")
+    frames = {t: S.read_stock_csv(p, cache_dir=cache_dir, columns=list(fields)) for t, p in zip(tickers, paths)}
+    return align(frames, fields)
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    """Day-over-day returns down each column; NaN for the first row and wherever either price is missing."""
+    p = np.asarray(prices, dtype=np.float64)
+    out = np.full_like(p, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(p[1:], p[:-1], out=out[1:])
+    out[1:] -= 1.0
+    return out
+
+def cumulative_returns(returns: np.ndarray) -> np.ndarray:
+    """Growth of 1 per column; missing returns carry the previous level and stay NaN in the output."""
+    r = np.asarray(returns, dtype=np.float64)
+    valid = ~np.isnan(r)
+    out = np.cumprod(np.where(valid, 1.0 + r, 1.0), axis=0)
+    out[~valid] = np.nan
+    return out
+
+def _centred(x: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # (validity as 0/1 floats, column-centred values with NaN -> 0, column
+    # means); centring first keeps the products below well-conditioned
+    valid = ~np.isnan(x)
+    count = valid.sum(axis=0)
+    ref = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(count, 1)
+    return valid.astype(np.float64), np.where(valid, x - ref, 0.0), ref
+
+def cross_sums(x: np.ndarray, y: np.ndarray) -> dict[str, np.ndarray]:
+    """
+    Sums over the rows where both column i of `x` and column j of `y` are
+    valid, as (x columns, y columns) matrices from six matrix products:
+    "n" (count), "sx", "sy", "sxx", "syy" and "sxy". Sums are of values
+    centred on their column means, returned as the vectors "x_ref" and
+    "y_ref"; centring leaves covariances and slopes unchanged.
+    """
+    mx, x0, x_ref = _centred(np.asarray(x, dtype=np.float64))
+    my, y0, y_ref = _centred(np.asarray(y, dtype=np.float64))
+    return {
+        "x_ref": x_ref,
+        "y_ref": y_ref,
+        "n": mx.T @ my,
+        "sx": x0.T @ my,
+        "sy": mx.T @ y0,
+        "sxx": (x0 * x0).T @ my,
+        "syy": mx.T @ (y0 * y0),
+        "sxy": x0.T @ y0,
+    }
+
+def _pairwise_sums(x: np.ndarray):
+    # cross_sums of x with itself: n, sum x_i, sum x_i^2, sum x_i x_j over pair rows
+    m, x0, _ = _centred(x)
+    return m.T @ m, x0.T @ m, (x0 * x0).T @ m, x0.T @ x0
+
+def pairwise_cov(x: np.ndarray, ddof: int = 1, min_periods: int = 2) -> np.ndarray:
+    """
+    Covariance matrix of the columns of `x` using pairwise-complete rows,
+    like `DataFrame.cov()`, as four matrix products instead of a loop over pairs.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n, s, _, p = _pairwise_sums(x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (p - s * s.T / n) / (n - ddof)
+    cov[n < max(min_periods, ddof + 1)] = np.nan
+    return cov
+
+def pairwise_corr(x: np.ndarray, min_periods: int = 2) -> np.ndarray:
+    """Pearson correlation matrix with pairwise-complete rows, like `DataFrame.corr()`."""
+    x = np.asarray(x, dtype=np.float64)
+    n, s, q, p = _pairwise_sums(x)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cxy = p - s * s.T / n
+        vx = q - s * s / n        # var of column i over the pair's rows (times n)
+        corr = cxy / np.sqrt(vx * vx.T)
+    corr = np.clip(corr, -1.0, 1.0)
+    corr[n < max(min_periods, 2)] = np.nan
+    return corr
+
+@dataclass
+class Comparison:
+    panel: Panel
+    price_field: str
+    returns: np.ndarray
+    cumulative: np.ndarray
+    cov: np.ndarray
+    corr: np.ndarray
+
+    def cov_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.cov, index=self.panel.tickers, columns=self.panel.tickers)
+
+    def corr_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.corr, index=self.panel.tickers, columns=self.panel.tickers)
+
+def compare(panel: Panel, price_field: str = "Close") -> Comparison:
+    """Returns, cumulative returns and the return covariance/correlation matrices for every ticker at once."""
+    r = simple_returns(panel.data[price_field])
+    return Comparison(panel, price_field, r, cumulative_returns(r), pairwise_cov(r), pairwise_corr(r))
+
+def plot_comparison(panel: Panel, tickers: Sequence[str] | None = None, price_field: str = "Close",
+                    volume_field: str | None = "Volume", title: str | None = None):
+    """
+    2x2 figure for any subset of the panel: prices, volume (millions), daily
+    returns (%) and cumulative returns. Returns the pyplot Figure.
+    """
+    import matplotlib.pyplot as plt
+
+    if tickers is not None:
+        panel = panel.subset(tickers)
+    res = compare(panel, price_field)
+    fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+    fig.suptitle(title or f"{' vs '.join(panel.tickers)} Stock Performance Comparison", fontsize=16, fontweight="bold")
+    ax1, ax2, ax3, ax4 = axes.flat
+    dates = panel.dates
+    has_volume = volume_field is not None and volume_field in panel.data
+    for j, t in enumerate(panel.tickers):
+        color = TICKER_COLORS.get(t)
+        ok = ~np.isnan(panel.data[price_field][:, j])
+        ax1.plot(dates[ok], panel.data[price_field][ok, j], label=t, linewidth=2, color=color)
+        if has_volume:
+            vol = panel.data[volume_field][:, j]
+            vok = ~np.isnan(vol)
+            ax2.bar(dates[vok], vol[vok] / 1e6, alpha=0.7, label=t, color=color)
+        rok = ~np.isnan(res.returns[:, j])
+        ax3.plot(dates[rok], res.returns[rok, j] * 100, label=t, alpha=0.8, color=color)
+        ax4.plot(dates[rok], res.cumulative[rok, j], label=t, linewidth=2, color=color)
+
+    for ax, name, ylabel in (
+        (ax1, "Close Price Comparison", "Price ($)"),
+        (ax2, "Trading Volume Comparison", "Volume (Millions)"),
+        (ax3, "Daily Returns Comparison", "Daily Return (%)"),
+        (ax4, "Cumulative Returns Comparison", "Cumulative Return (1 = 100%)"),
+    ):
+        ax.set_title(name, fontweight="bold")
+        ax.set_ylabel(ylabel)
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(axis="x", rotation=45)
+        if ax is not ax2 or has_volume:
+            ax.legend()
+    fig.tight_layout()
+    return fig
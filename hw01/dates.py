@@ -0,0 +1,163 @@
+from __future__ import annotations
+import os
+import re
+import numpy as np
+import pandas as pd
+
+# Tried in order; month-first, since that's what our station exports use.
+DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%y", "%m/%d/%Y", "%Y/%m/%d")
+SAMPLE_SIZE = 1000
+# Same two-digit-year pivot as datetime.strptime: 69-99 -> 19xx, 00-68 -> 20xx.
+_YY_PIVOT = 69
+
+# (abspath, mtime_ns, size) -> detected format, for this process
+_FORMAT_CACHE: dict[tuple[str, int, int], str | None] = {}
+
+_NUMERIC_FORMAT = re.compile(r"^%([mdyY])([/-])%([mdyY])\2%([mdyY])$")
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+def detect_date_format(values, sample_size: int = SAMPLE_SIZE) -> str | None:
+    """
+    First format in DATE_FORMATS that parses every value in a sample of the
+    non-null entries, or None if none does.
+    """
+    s = pd.Series(values).dropna()
+    if s.empty:
+        return None
+    # head and tail, in case the file isn't sorted or formats drift
+    sample = pd.concat([s.iloc[:sample_size // 2], s.iloc[-(sample_size // 2):]]).astype(str)
+    for fmt in DATE_FORMATS:
+        try:
+            pd.to_datetime(sample, format=fmt)
+        except (ValueError, TypeError):
+            continue
+        return fmt
+    return None
+
+def format_for_file(path: str, values) -> str | None:
+    """`detect_date_format`, cached per file (path + mtime + size) for the process lifetime."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    if key not in _FORMAT_CACHE:
+        _FORMAT_CACHE[key] = detect_date_format(values)
+    return _FORMAT_CACHE[key]
+
+def _days_from_civil(y: np.ndarray, m: np.ndarray, d: np.ndarray) -> np.ndarray:
+    # days since 1970-01-01 for the proleptic Gregorian calendar (H. Hinnant)
+    y = y - (m <= 2)
+    era = np.floor_divide(y, 400)
+    yoe = y - era * 400
+    doy = (153 * np.where(m > 2, m - 3, m + 9) + 2) // 5 + d - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def _parse_numeric(values: np.ndarray, fmt: str) -> np.ndarray | None:
+    """
+    Integer-arithmetic parser for all-numeric formats like "%m/%d/%y".
+
+    Strings become a (rows x chars) byte matrix; each field's digits are folded
+    into an integer column-by-column, so the work is a handful of whole-array ops
+    per character position. Returns datetime64[us] values (NaT for nulls), or None
+    if anything doesn't fit the format, so the caller can fall back to pandas.
+    """
+    m = _NUMERIC_FORMAT.match(fmt)
+    if m is None:
+        return None
+    f1, sep, f2, f3 = m.groups()
+    fields = (f1, f2, f3)
+    if sorted(f.lower() for f in fields) != ["d", "m", "y"]:
+        return None
+
+    null = pd.isna(values)
+    filled = np.where(null, pd.Timestamp("1970-01-01").strftime(fmt), values) if null.any() else values
+    try:
+        raw = np.asarray(filled, dtype="S")
+    except (UnicodeEncodeError, ValueError, TypeError):
+        return None
+    width = raw.dtype.itemsize
+    if width == 0:
+        return None
+    # column-major so each character position is a contiguous row
+    chars = np.asfortranarray(raw.view(np.uint8).reshape(len(raw), width))
+    is_sep = chars == ord(sep)
+    digit = chars.astype(np.int32) - ord("0")
+    is_digit = (digit >= 0) & (digit <= 9)
+    if not np.all(is_sep | is_digit | (chars == 0)):
+        return None
+    field = np.cumsum(is_sep, axis=1, dtype=np.int8)
+    if not np.all(field[:, -1] == 2):
+        return None
+
+    vals = np.zeros((3, len(raw)), dtype=np.int32)
+    ndig = np.zeros((3, len(raw)), dtype=np.int8)
+    for j in range(width):
+        for k in range(3):
+            hit = is_digit[:, j] & (field[:, j] == k)
+            vals[k] = np.where(hit, vals[k] * 10 + digit[:, j], vals[k])
+            ndig[k] += hit
+
+    parts = dict(zip(fields, vals))
+    lens = dict(zip(fields, ndig))
+    if "y" in parts:
+        year = parts["y"] + np.where(parts["y"] < _YY_PIVOT, 2000, 1900)
+        ok = lens["y"] == 2
+    else:
+        year = parts["Y"]
+        ok = lens["Y"] == 4
+    month, day = parts["m"], parts["d"]
+    ok &= (lens["m"] >= 1) & (lens["m"] <= 2) & (lens["d"] >= 1) & (lens["d"] <= 2)
+    ok &= (month >= 1) & (month <= 12)
+    leap = ((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)
+    dim = _DAYS_IN_MONTH[np.clip(month, 0, 12)] + (leap & (month == 2))
+    ok &= (day >= 1) & (day <= dim)
+    if not ok.all():
+        return None
+
+    days = _days_from_civil(year.astype(np.int64), month.astype(np.int64), day.astype(np.int64))
+    out = days.astype("datetime64[D]").astype("datetime64[us]")
+    out[np.asarray(null)] = np.datetime64("NaT")
+    return out
+
+def parse_dates(values, fmt: str | None = None) -> pd.DatetimeIndex:
+    """
+    Parse a column of date strings with one known format.
+
+    - `fmt=None` detects it from a sample first (see `detect_date_format`).
+    - Numeric M/D/Y-style formats use the integer fast path; other formats, or
+      values the fast path rejects, go through `pd.to_datetime(format=fmt)`.
+    - If no known format fits, falls back to pandas' per-element inference.
+    """
+    arr = np.asarray(values, dtype=object)
+    if fmt is None:
+        fmt = detect_date_format(arr)
+    if fmt is None:
+        return pd.DatetimeIndex(pd.to_datetime(arr, format="mixed"))
+    fast = _parse_numeric(arr, fmt)
+    if fast is not None:
+        return pd.DatetimeIndex(fast)
+    return pd.DatetimeIndex(pd.to_datetime(arr, format=fmt))
+
+def _bound(value, side: str) -> pd.Timestamp:
+    if isinstance(value, str):
+        try:
+            period = pd.Period(value)
+        except (ValueError, TypeError):
+            return pd.Timestamp(value)
+        return period.start_time if side == "start" else period.end_time
+    return pd.Timestamp(value)
+
+def slice_bounds(start, end) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Inclusive (start, end) timestamps with the partial-string semantics of
+    `.loc[start:end]` on a DatetimeIndex: a date string covers its whole
+    period, so end="2022-01" runs through 2022-01-31 and start="2022" begins
+    on 2022-01-01. Timestamps and datetimes pass through unchanged.
+    """
+    return _bound(start, "start"), _bound(end, "end")
+
+def bounds_ns(values, side: str) -> np.ndarray:
+    """`slice_bounds` for an array of starts (side="start") or ends, as int64 ns."""
+    arr = np.atleast_1d(np.asarray(values))
+    if arr.dtype.kind in "OUS":  # strings (or mixed objects): per element
+        return np.array([_bound(v, side).as_unit("ns").value for v in arr], dtype=np.int64)
+    return np.asarray(pd.DatetimeIndex(arr).as_unit("ns").asi8)
@@ -0,0 +1,36 @@
+from __future__ import annotations
+import numpy as np
+
+def minmax_indices(y, max_points: int) -> np.ndarray:
+    """
+    Row indices that keep the visual envelope of `y` in about `max_points` points.
+
+    Rows are split into max_points // 2 equal buckets; each bucket keeps the
+    positions of its minimum and maximum, plus the first and last row overall,
+    returned sorted and unique. Spikes survive (unlike every-k-th decimation),
+    which is what a line plot at a few thousand pixels wide can show anyway.
+    NaNs are ignored; an all-NaN bucket keeps its first row, so gaps stay visible.
+    Series already within `max_points` come back as arange(n).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if max_points < 4:
+        raise ValueError(f"max_points must be >= 4, got {max_points}")
+    if n <= max_points:
+        return np.arange(n)
+    n_buckets = max_points // 2
+    size = -(-n // n_buckets)  # ceil
+    n_buckets = -(-n // size)
+    # pad the tail bucket; pads can never be picked over a real value
+    nan = np.isnan(y)
+    lo = np.full(n_buckets * size, np.inf)
+    hi = np.full(n_buckets * size, -np.inf)
+    lo[:n] = np.where(nan, np.inf, y)
+    hi[:n] = np.where(nan, -np.inf, y)
+    base = np.arange(n_buckets) * size
+    idx = np.concatenate([
+        [0, n - 1],
+        base + lo.reshape(n_buckets, size).argmin(axis=1),
+        base + hi.reshape(n_buckets, size).argmax(axis=1),
+    ])
+    return np.unique(np.minimum(idx, n - 1))
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, asdict
 import json
-import pandas as pd
+import sys
 from typing import Any, Mapping
 
 DEC_PLACES_DEFAULT = 4
@@ -32,6 +32,11 @@ def print_kv(name: str, value: float, places: int = DEC_PLACES_DEFAULT) -> None:
     print(f"{name}: {sval}")
 
 
+def _loaded_pandas():
+    # pandas is only in sys.modules if something already imported it; if not,
+    # no argument can be a pandas object, so skip the checks (and the import)
+    return sys.modules.get("pandas")
+
 def _is_nested_mapping(obj: Mapping[str, Any]) -> bool:
     """True if every value in `obj` is itself a Mapping (dict-of-dicts)."""
     return bool(obj) and all(isinstance(v, Mapping) for v in obj.values())
@@ -80,6 +85,7 @@ def print_series(
         return
 
     # ----- 2. Everything else: fall back to old logic -----
+    import pandas as pd
     if isinstance(s, Mapping):
         s = pd.Series(s)
     elif not isinstance(s, pd.Series):
@@ -92,39 +98,139 @@ def print_series(
     if head is not None:
         s = s.head(head)
 
-    fmt_num = f"{{:.{places}f}}".format
-    df = s.reset_index()
-
-    if df.shape[1] == 2:
-        idx_name, val_name = df.columns[0], df.columns[1]
-        print(f"{idx_name:<12} {val_name}")
-        for _, row in df.iterrows():
-            idx = str(row[idx_name])
-            val = row[val_name]
-            try:
-                sval = fmt_num(float(val))
-            except Exception:
-                sval = str(val)
-            print(f"{idx:<12} {sval}")
-    else:
+    idx_name = s.index.name if s.index.name is not None else "index"
+    val_name = s.name if s.name is not None else 0
+    if s.index.nlevels > 1:
         print(s.to_string())
+        return
+    # whole-column formatting, one write: index labels in bulk, values
+    # through a single C-level str.format map
+    sys.stdout.write(f"{idx_name:<12} {val_name}\n" + "".join(_format_rows(s, places)))
 
 
-def to_json_payload(payload: Mapping[str, Any]) -> str:
-    def _sanitize(obj):
+def _format_rows(s, places: int) -> list[str]:
+    import numpy as np
+    index = s.index
+    if index.dtype.kind == "M" and getattr(index, "tz", None) is None:
+        # same text as str(Timestamp) for whole-second stamps; NaT stays "NaT"
+        keys = np.char.replace(np.datetime_as_string(index.values, unit="s"), "T", " ").tolist()
+    else:
+        keys = [str(k) for k in index.tolist()]
+    values = s.to_numpy()
+    if values.dtype.kind in "iufb":
+        row = f"{{:<12}} {{:.{places}f}}\n".format
+        return list(map(row, keys, values.astype(np.float64).tolist()))
+    fmt_num = f"{{:.{places}f}}".format
+    out = []
+    for k, v in zip(keys, values.tolist()):
+        try:
+            sval = fmt_num(float(v))
+        except Exception:
+            sval = str(v)
+        out.append(f"{k:<12} {sval}\n")
+    return out
+
+
+def _datetimes_to_iso(values) -> list:
+    # datetime64 array -> ISO strings ("2023-01-03T00:00:00"), None for NaT
+    import numpy as np
+    values = np.asarray(values).astype("datetime64[s]")
+    out = np.datetime_as_string(values).astype(object)
+    out[np.isnat(values)] = None
+    return out.tolist()
+
+def _array_to_list(arr, nan_as_null: bool) -> list:
+    # whole-array conversion; only object arrays are walked element by element
+    import numpy as np
+    arr = np.asarray(arr)
+    kind = arr.dtype.kind
+    if kind == "M":
+        return _datetimes_to_iso(arr.ravel()) if arr.ndim == 1 else [_array_to_list(a, nan_as_null) for a in arr]
+    if kind == "f" and nan_as_null:
+        nan = np.isnan(arr)
+        if nan.any():
+            arr = arr.astype(object)
+            arr[nan] = None
+    if kind == "O":
+        return [to_jsonable(v, nan_as_null) for v in arr.tolist()]
+    return arr.tolist()
+
+def _json_key(key):
+    if isinstance(key, (str, int, float, bool)) or key is None:
+        return key
+    if hasattr(key, "isoformat"):
+        return key.isoformat()
+    if hasattr(key, "item"):
+        return key.item()
+    return str(key)
+
+def to_jsonable(obj: Any, nan_as_null: bool = False) -> Any:
+    """
+    Recursively turn `obj` into plain JSON types.
+
+    - Mappings, lists and tuples are walked; keys that are Timestamps/dates
+      become ISO strings.
+    - NumPy arrays, Series (-> {index: value}) and DataFrames
+      (-> {column: [values]}) convert in bulk via `.tolist()`; datetime values
+      and DatetimeIndex keys become ISO strings, NaT becomes None.
+    - NumPy scalars become Python scalars; NaN stays NaN (`json` writes the
+      `NaN` token, as before) unless `nan_as_null`.
+    """
+    if isinstance(obj, (str, int, bool)) or obj is None:
+        return obj
+    if isinstance(obj, float):
+        return None if nan_as_null and obj != obj else obj
+    if isinstance(obj, Mapping):
+        return {_json_key(k): to_jsonable(v, nan_as_null) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_jsonable(v, nan_as_null) for v in obj]
+    pd = _loaded_pandas()
+    if pd is not None:
         if isinstance(obj, pd.Series):
-            return obj.to_dict()
+            index = obj.index
+            if index.dtype.kind == "M":
+                keys = _datetimes_to_iso(index.values)
+            elif index.dtype.kind in "iub" or pd.api.types.is_string_dtype(index):
+                keys = index.tolist()  # already valid JSON keys
+            else:
+                keys = [_json_key(k) for k in index.tolist()]
+            return dict(zip(keys, _array_to_list(obj.to_numpy(), nan_as_null)))
         if isinstance(obj, pd.DataFrame):
-            return obj.to_dict(orient="list")
-        if hasattr(obj, "item"):
-            try:
-                return obj.item()
-            except Exception:
-                pass
-        return obj
+            return {_json_key(c): _array_to_list(obj[c].to_numpy(), nan_as_null) for c in obj.columns}
+        if obj is pd.NaT:
+            return None
+    if hasattr(obj, "isoformat"):  # datetime, date, Timestamp
+        return obj.isoformat()
+    if hasattr(obj, "dtype") and hasattr(obj, "tolist"):
+        if getattr(obj, "ndim", 0) == 0:  # NumPy scalar
+            if obj.dtype.kind == "M":
+                return _datetimes_to_iso([obj])[0]
+            return to_jsonable(obj.item(), nan_as_null)
+        return _array_to_list(obj, nan_as_null)
+    if hasattr(obj, "item"):
+        try:
+            return to_jsonable(obj.item(), nan_as_null)
+        except Exception:
+            pass
+    return obj
+
+def to_json_payload(payload: Mapping[str, Any], nan_as_null: bool = False) -> str:
+    """One JSON document for `payload` (see `to_jsonable`), keys sorted for stable output."""
+    return json.dumps(to_jsonable(payload, nan_as_null), sort_keys=True, ensure_ascii=False)
 
-    clean = {k: _sanitize(v) for k, v in payload.items()}
-    return json.dumps(clean, sort_keys=True, ensure_ascii=False)
+def write_ndjson(payloads, stream=None, nan_as_null: bool = False, flush: bool = True) -> int:
+    """
+    Newline-delimited JSON: write each payload as one line as soon as the
+    iterable yields it (flushed per line by default). Returns lines written.
+    """
+    stream = sys.stdout if stream is None else stream
+    n = 0
+    for payload in payloads:
+        stream.write(to_json_payload(payload, nan_as_null) + "\n")
+        if flush:
+            stream.flush()
+        n += 1
+    return n
 
 
 @dataclass
@@ -0,0 +1,142 @@
+from __future__ import annotations
+import json
+import math
+import os
+from dataclasses import dataclass, field, asdict
+import numpy as np
+import pandas as pd
+
+try:
+    from . import metrics as M
+    from .formatter import StockMetrics
+    from .stocks import PRICE_COL
+except ImportError:
+    import metrics as M
+    from formatter import StockMetrics
+    from stocks import PRICE_COL
+
+STATE_VERSION = 1
+N_FIRST_RETURNS = 5
+
+def _nan_to_none(x: float):
+    return None if x is None or math.isnan(x) else float(x)
+
+def _none_to_nan(x) -> float:
+    return float("nan") if x is None else float(x)
+
+@dataclass
+class TickerState:
+    """
+    Running per-ticker state so a daily run costs O(new rows), not O(history).
+
+    Holds just enough to reproduce the full-history results of
+    `daily_simple_returns`, `average_daily_return`, `cumulative_return`,
+    `annualized_volatility`/`sharpe_ratio` and the last row of
+    `rolling_moving_averages`:
+    - the price on the last ingested row (for the next return),
+    - first/last valid prices (cumulative return),
+    - Welford count/mean/M2 of daily returns,
+    - the last `w` prices for each MA window.
+    Rows must arrive in date order; rows on or before `last_date` are skipped.
+    """
+    price_col: str = PRICE_COL
+    windows: list[int] = field(default_factory=lambda: [20, 50])
+    n_rows: int = 0
+    last_date: str | None = None
+    prev_price: float = float("nan")
+    first_valid: float = float("nan")
+    last_valid: float = float("nan")
+    ret_count: float = 0.0
+    ret_mean: float = 0.0
+    ret_m2: float = 0.0
+    first_returns: list[float] = field(default_factory=list)
+    ring: dict[str, list[float]] = field(default_factory=dict)
+
+    def update(self, new_rows: pd.DataFrame) -> int:
+        """Fold in rows of a Date-indexed frame dated after `last_date`. Returns rows applied."""
+        if self.last_date is not None:
+            new_rows = new_rows.iloc[new_rows.index.searchsorted(pd.Timestamp(self.last_date), side="right"):]
+        p = new_rows[self.price_col].to_numpy(dtype=np.float64)
+        if len(p) == 0:
+            return 0
+
+        prev = np.empty_like(p)
+        prev[0] = self.prev_price
+        prev[1:] = p[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = p / prev - 1.0
+
+        acc = M.RunningMoments(1)
+        acc.count[0], acc.mean[0], acc.m2[0] = self.ret_count, self.ret_mean, self.ret_m2
+        acc.update(r.reshape(-1, 1))
+        self.ret_count, self.ret_mean, self.ret_m2 = float(acc.count[0]), float(acc.mean[0]), float(acc.m2[0])
+
+        valid = p[~np.isnan(p)]
+        if len(valid):
+            if math.isnan(self.first_valid):
+                self.first_valid = float(valid[0])
+            self.last_valid = float(valid[-1])
+
+        if len(self.first_returns) < N_FIRST_RETURNS:
+            self.first_returns.extend(float(x) for x in r[:N_FIRST_RETURNS - len(self.first_returns)])
+        for w in self.windows:
+            buf = self.ring.get(str(w), []) + p[-w:].tolist()
+            self.ring[str(w)] = buf[-w:]
+
+        self.prev_price = float(p[-1])
+        self.n_rows += len(p)
+        self.last_date = new_rows.index[-1].strftime("%Y-%m-%d")
+        return len(p)
+
+    def _moments(self) -> M.RunningMoments:
+        acc = M.RunningMoments(1)
+        acc.count[0], acc.mean[0], acc.m2[0] = self.ret_count, self.ret_mean, self.ret_m2
+        return acc
+
+    def stock_metrics(self, risk_free_rate: float = 0.015, trading_days: int = M.TRADING_DAYS) -> StockMetrics:
+        acc = self._moments()
+        vol, sharpe = M.annualize(acc, risk_free_rate, trading_days)
+        return StockMetrics(
+            avg_daily_return=float(acc.mean_or_nan()[0]),
+            cumulative_return=self.last_valid / self.first_valid - 1.0,
+            annualized_volatility=float(vol[0]),
+            sharpe_ratio=float(sharpe[0]),
+        )
+
+    def moving_averages(self) -> dict[str, float]:
+        """Latest `ma_{w}` values; NaN until a full window of valid prices (min_periods=w)."""
+        out = {}
+        for w in self.windows:
+            buf = np.asarray(self.ring.get(str(w), []), dtype=np.float64)
+            out[f"ma_{w}"] = float(buf.mean()) if len(buf) == w and not np.isnan(buf).any() else float("nan")
+        return out
+
+    def to_dict(self) -> dict:
+        d = asdict(self)
+        for k in ("prev_price", "first_valid", "last_valid"):
+            d[k] = _nan_to_none(d[k])
+        d["first_returns"] = [_nan_to_none(x) for x in d["first_returns"]]
+        d["ring"] = {w: [_nan_to_none(x) for x in buf] for w, buf in d["ring"].items()}
+        return {"version": STATE_VERSION, **d}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TickerState":
+        if d.get("version") != STATE_VERSION:
+            raise ValueError(f"Unsupported state version {d.get('version')!r}")
+        d = {k: v for k, v in d.items() if k != "version"}
+        for k in ("prev_price", "first_valid", "last_valid"):
+            d[k] = _none_to_nan(d[k])
+        d["first_returns"] = [_none_to_nan(x) for x in d["first_returns"]]
+        d["ring"] = {w: [_none_to_nan(x) for x in buf] for w, buf in d["ring"].items()}
+        return cls(**d)
+
+    def save(self, path: str) -> None:
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_dict(), fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "TickerState":
+        with open(path, "r", encoding="utf-8") as fh:
+            return cls.from_dict(json.load(fh))
@@ -0,0 +1,141 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import numpy as np
+
+try:
+    from .formatter import StockMetrics
+except ImportError:
+    from formatter import StockMetrics
+
+TRADING_DAYS = 252
+BLOCK_ROWS = 65536
+
+def daily_risk_free(risk_free_rate: float, trading_days: int = TRADING_DAYS) -> float:
+    """Convert an annual risk-free rate to its daily equivalent: (1+rf)^(1/252) - 1."""
+    return (1.0 + risk_free_rate) ** (1.0 / trading_days) - 1.0
+
+class RunningMoments:
+    """
+    Count / mean / sum of squared deviations per column, NaNs skipped.
+
+    Blocks of rows are folded in with the pairwise (Chan et al.) form of Welford's
+    update, so a block is reduced with vectorized NumPy and the merge stays
+    numerically stable across blocks. Works on 1-D (one series) or 2-D
+    (rows x tickers) input.
+    """
+
+    def __init__(self, k: int):
+        self.count = np.zeros(k, dtype=np.float64)
+        self.mean = np.zeros(k, dtype=np.float64)
+        self.m2 = np.zeros(k, dtype=np.float64)
+
+    @classmethod
+    def of(cls, values, block_rows: int = BLOCK_ROWS) -> "RunningMoments":
+        x = np.asarray(values, dtype=np.float64)
+        x = x.reshape(len(x), -1)
+        acc = cls(x.shape[1])
+        for start in range(0, x.shape[0], block_rows):
+            acc.update(x[start:start + block_rows])
+        return acc
+
+    def update(self, block: np.ndarray) -> None:
+        valid = ~np.isnan(block)
+        n_b = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = np.where(valid, block, 0.0).sum(axis=0) / n_b
+            dev = np.where(valid, block - mean_b, 0.0)
+            m2_b = np.einsum("ij,ij->j", dev, dev)
+            total = self.count + n_b
+            delta = mean_b - self.mean
+            has = n_b > 0
+            self.mean = np.where(has, self.mean + delta * n_b / total, self.mean)
+            self.m2 = np.where(has, self.m2 + m2_b + delta * delta * self.count * n_b / total, self.m2)
+        self.count = total
+
+    def mean_or_nan(self) -> np.ndarray:
+        return np.where(self.count > 0, self.mean, np.nan)
+
+    def std(self, ddof: int = 1) -> np.ndarray:
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > ddof, np.sqrt(self.m2 / (self.count - ddof)), np.nan)
+
+@dataclass
+class MetricsResult:
+    """Per-ticker arrays of shape (k,); `log_returns` is (n, k) when requested."""
+    count: np.ndarray
+    avg_daily_return: np.ndarray
+    std_daily_return: np.ndarray
+    annualized_volatility: np.ndarray
+    sharpe_ratio: np.ndarray
+    cumulative_return: np.ndarray
+    log_returns: np.ndarray | None = None
+
+    def stock_metrics(self, i: int = 0) -> StockMetrics:
+        return StockMetrics(
+            avg_daily_return=float(self.avg_daily_return[i]),
+            cumulative_return=float(self.cumulative_return[i]),
+            annualized_volatility=float(self.annualized_volatility[i]),
+            sharpe_ratio=float(self.sharpe_ratio[i]),
+        )
+
+def annualize(moments: RunningMoments, risk_free_rate: float, trading_days: int = TRADING_DAYS) -> tuple[np.ndarray, np.ndarray]:
+    """(annualized volatility, annualized Sharpe) from daily-return moments; NaN if std is 0 or n < 2."""
+    std = moments.std(ddof=1)
+    scale = np.sqrt(trading_days)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, (moments.mean - daily_risk_free(risk_free_rate, trading_days)) / std * scale, np.nan)
+    return std * scale, sharpe
+
+def compute_metrics(
+    prices,
+    risk_free_rate: float = 0.015,
+    trading_days: int = TRADING_DAYS,
+    with_log_returns: bool = False,
+    block_rows: int = BLOCK_ROWS,
+) -> MetricsResult:
+    """
+    One pass over a price array (n,) or (n, k) — rows are dates, columns tickers.
+
+    Per block of rows: simple returns (same formula as `daily_simple_returns`),
+    optional log returns, moment updates, and first/last valid price tracking.
+    Mean/std/Sharpe skip NaN returns like `dropna()`; Sharpe uses excess returns
+    over the daily risk-free rate (std of excess == std of returns).
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    p = p.reshape(len(p), -1)
+    n, k = p.shape
+    cols = np.arange(k)
+
+    moments = RunningMoments(k)
+    first = np.full(k, np.nan)
+    last = np.full(k, np.nan)
+    logr = np.empty((n, k), dtype=np.float64) if with_log_returns else None
+
+    for start in range(0, n, block_rows):
+        blk = p[start:start + block_rows]
+        prev = np.empty_like(blk)
+        prev[0] = p[start - 1] if start else np.nan
+        prev[1:] = blk[:-1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            gross = blk / prev
+            if logr is not None:
+                np.log(gross, out=logr[start:start + len(blk)])
+        moments.update(gross - 1.0)
+
+        seen = ~np.isnan(blk)
+        has = seen.any(axis=0)
+        fi = np.argmax(seen, axis=0)
+        li = len(blk) - 1 - np.argmax(seen[::-1], axis=0)
+        first = np.where(np.isnan(first) & has, blk[fi, cols], first)
+        last = np.where(has, blk[li, cols], last)
+
+    vol, sharpe = annualize(moments, risk_free_rate, trading_days)
+    return MetricsResult(
+        count=moments.count,
+        avg_daily_return=moments.mean_or_nan(),
+        std_daily_return=moments.std(ddof=1),
+        annualized_volatility=vol,
+        sharpe_ratio=sharpe,
+        cumulative_return=last / first - 1.0,
+        log_returns=logr,
+    )
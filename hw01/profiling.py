@@ -0,0 +1,212 @@
+from __future__ import annotations
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+# Pipeline code marks its stages with `with profiling.stage("name"):`. Until
+# `enable()` is called that is a shared nullcontext, so the cost with
+# profiling off is one function call per stage, not per row.
+
+_NULL = nullcontext()
+
+def _read_status_kib(key: str) -> int | None:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(key):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or None where /proc is unavailable."""
+    kib = _read_status_kib("VmRSS:")
+    return None if kib is None else kib * 1024
+
+def peak_rss_bytes() -> int | None:
+    """High-water RSS since the last `_reset_peak()` (Linux) or since start (elsewhere)."""
+    kib = _read_status_kib("VmHWM:")
+    if kib is not None:
+        return kib * 1024
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+def _reset_peak() -> bool:
+    # Linux: writing 5 to clear_refs resets VmHWM to the current RSS
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+@dataclass
+class Stage:
+    name: str
+    depth: int
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_delta_bytes: int | None = None
+    peak_rss_bytes: int | None = None
+    _t0: float = field(default=0.0, repr=False)
+    _c0: float = field(default=0.0, repr=False)
+    _rss0: int | None = field(default=None, repr=False)
+
+class _StageContext:
+    __slots__ = ("timer", "name")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer, self.name = timer, name
+
+    def __enter__(self):
+        self.timer._enter(self.name)
+
+    def __exit__(self, *exc):
+        self.timer._exit()
+
+class StageTimer:
+    """
+    Wall time, CPU time and memory per named stage, in the order stages ran.
+
+    Stages may nest (a child's time is included in its parent). Memory is the
+    RSS change over the stage and the stage's peak RSS; on Linux the kernel's
+    high-water mark is reset as each stage starts, so peaks are per stage
+    rather than per process.
+    """
+
+    def __init__(self):
+        self.stages: list[Stage] = []
+        self._open: list[Stage] = []
+        self._per_stage_peak = _reset_peak()
+        self._start = time.perf_counter()
+
+    def stage(self, name: str) -> _StageContext:
+        return _StageContext(self, name)
+
+    def _enter(self, name: str) -> None:
+        # fold the peak so far into the enclosing stages before resetting it
+        self._note_peak()
+        if self._per_stage_peak:
+            _reset_peak()
+        st = Stage(name, depth=len(self._open))
+        st._rss0 = rss_bytes()
+        self.stages.append(st)
+        self._open.append(st)
+        st._c0 = time.process_time()
+        st._t0 = time.perf_counter()
+
+    def _exit(self) -> None:
+        t1, c1 = time.perf_counter(), time.process_time()
+        self._note_peak()
+        st = self._open.pop()
+        st.seconds = t1 - st._t0
+        st.cpu_seconds = c1 - st._c0
+        rss1 = rss_bytes()
+        if rss1 is not None and st._rss0 is not None:
+            st.rss_delta_bytes = rss1 - st._rss0
+        if self._open and st.peak_rss_bytes is not None:
+            parent = self._open[-1]
+            parent.peak_rss_bytes = max(parent.peak_rss_bytes or 0, st.peak_rss_bytes)
+
+    def add_stages(self, stages: list[dict], suffix: str = " (sum)") -> None:
+        """
+        Fold stage records timed elsewhere (`as_dict()["stages"]` from pool
+        workers, one list per task) in below the currently open stage. Records
+        with the same name and depth are merged: wall and CPU time summed, the
+        peak maxed. The name gets `suffix`, since summed worker time can
+        exceed the enclosing stage's wall time.
+        """
+        base = len(self._open)
+        merged: dict[tuple[str, int], Stage] = {}
+        for rec in stages:
+            key = (rec["name"], rec["depth"])
+            st = merged.get(key)
+            if st is None:
+                st = merged[key] = Stage(rec["name"] + suffix, depth=base + rec["depth"])
+                self.stages.append(st)
+            st.seconds += rec["seconds"]
+            st.cpu_seconds += rec["cpu_seconds"]
+            if rec.get("peak_rss_bytes") is not None:
+                st.peak_rss_bytes = max(st.peak_rss_bytes or 0, rec["peak_rss_bytes"])
+
+    def _note_peak(self) -> None:
+        peak = peak_rss_bytes()
+        if peak is not None:
+            for st in self._open:
+                st.peak_rss_bytes = max(st.peak_rss_bytes or 0, peak)
+
+    def as_dict(self) -> dict:
+        stages = [{k: v for k, v in asdict(st).items() if not k.startswith("_")} for st in self.stages]
+        return {"total_seconds": time.perf_counter() - self._start, "stages": stages}
+
+    def format(self) -> str:
+        """Human-readable table, children indented under their stage."""
+        d = self.as_dict()
+        total = d["total_seconds"] or 1.0
+        mib = lambda b: "-" if b is None else f"{b / 2**20:.1f}"
+        rows = [f"{'stage':<28} {'wall ms':>10} {'cpu ms':>10} {'%':>6} {'rss +MiB':>9} {'peak MiB':>9}"]
+        for st in d["stages"]:
+            rows.append(
+                f"{'  ' * st['depth'] + st['name']:<28} {st['seconds'] * 1e3:>10.1f} {st['cpu_seconds'] * 1e3:>10.1f} "
+                f"{100 * st['seconds'] / total:>6.1f} {mib(st['rss_delta_bytes']):>9} {mib(st['peak_rss_bytes']):>9}"
+            )
+        rows.append(f"{'total':<28} {total * 1e3:>10.1f}")
+        return "\n".join(rows)
+
+class _NullTimer:
+    def stage(self, name: str):
+        return _NULL
+
+PROFILER: StageTimer | _NullTimer = _NullTimer()
+
+def stage(name: str):
+    """Context manager timing `name` on the active profiler; a no-op when profiling is off."""
+    return PROFILER.stage(name)
+
+def enabled() -> bool:
+    return isinstance(PROFILER, StageTimer)
+
+def enable() -> StageTimer:
+    """Start a fresh StageTimer as the active profiler and return it."""
+    global PROFILER
+    PROFILER = StageTimer()
+    return PROFILER
+
+def disable() -> None:
+    global PROFILER
+    PROFILER = _NullTimer()
+
+@contextmanager
+def collect():
+    """
+    Time the enclosed block on a fresh StageTimer (yielded), then restore the
+    previous profiler. For work that may run in a pool worker, whose stages
+    the parent's timer never sees: return `timer.as_dict()["stages"]` and
+    pass them to the parent's `add_stages`.
+    """
+    global PROFILER
+    prev = PROFILER
+    if isinstance(prev, StageTimer):
+        prev._note_peak()  # the new timer resets the high-water mark
+    PROFILER = StageTimer()
+    try:
+        yield PROFILER
+    finally:
+        PROFILER = prev
+
+def report(timer: StageTimer, as_json: bool = False, stream=None) -> None:
+    """Write the breakdown to `stream` (stderr by default) as a table or one JSON line."""
+    stream = sys.stderr if stream is None else stream
+    if as_json:
+        stream.write(json.dumps({"profile": timer.as_dict()}) + "\n")
+    else:
+        stream.write(f"[profile] pid {os.getpid()}\n{timer.format()}\n")
+    stream.flush()
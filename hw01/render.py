@@ -0,0 +1,154 @@
+from __future__ import annotations
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+# No matplotlib (or pandas) import at module level: the queue lives in the
+# parent process, which should stay free of plotting imports; only the
+# workers that actually render load matplotlib.
+
+DPI = 120
+PLOT_KINDS = ("price_ma", "returns_hist", "weather")
+
+# ---- drawing on a given (fig, ax); shared with plotting.py ----
+
+def draw_stock_price_ma(fig, ax, dates, price, mas, windows, price_col: str) -> None:
+    ax.plot(dates, price, label="price")
+    for j, w in enumerate(windows):
+        ax.plot(dates, mas[:, j], label=f"MA{w}")
+    ax.set_title("Stock Price with Moving Averages")
+    ax.set_xlabel("Date")
+    ax.set_ylabel(price_col)
+    ax.legend()
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+def draw_returns_hist(fig, ax, values, bins: int) -> None:
+    ax.hist(values, bins=bins)
+    ax.set_title("Daily Returns Histogram")
+    ax.set_xlabel("Return")
+    ax.set_ylabel("Frequency")
+    fig.tight_layout()
+
+def draw_weather_tmax_and_celsius(fig, ax, dates, tmax, tmax_c) -> None:
+    ax.plot(dates, tmax, label="tmax (F)")
+    ax.plot(dates, tmax_c, label="tmax (C)")
+    ax.set_title("Max Temperature (F & C)")
+    ax.set_xlabel("Date")
+    ax.set_ylabel("Temperature")
+    ax.legend()
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+_DRAW = {
+    "price_ma": draw_stock_price_ma,
+    "returns_hist": draw_returns_hist,
+    "weather": draw_weather_tmax_and_celsius,
+}
+
+# ---- plain-array inputs for each kind (cheap to pickle into workers) ----
+
+def _downsample(y, max_points: int | None):
+    # row selector for plotting: every row, or the min/max envelope of `y`
+    if max_points is None:
+        return slice(None)
+    try:
+        from .downsample import minmax_indices
+    except ImportError:
+        from downsample import minmax_indices
+    return minmax_indices(y, max_points)
+
+def stock_price_ma_data(df, windows=(20, 50), price_col: str = "Adj Close", max_points: int | None = None) -> dict:
+    """Arrays for `draw_stock_price_ma`; MAs use every row, then rows are thinned to `max_points`."""
+    try:
+        from .rolling import rolling_block
+    except ImportError:
+        from rolling import rolling_block
+    price = df[price_col].to_numpy(dtype=float)
+    mas, _ = rolling_block(price, windows, min_periods=1)
+    keep = _downsample(price, max_points)
+    return {"dates": df.index.to_numpy()[keep], "price": price[keep], "mas": mas[keep], "windows": tuple(windows), "price_col": price_col}
+
+def returns_hist_data(returns, bins: int = 30) -> dict:
+    return {"values": returns.dropna().to_numpy(), "bins": bins}
+
+def weather_tmax_and_celsius_data(df, max_points: int | None = None) -> dict:
+    tmax = df["temperaturemax"].to_numpy(dtype=float)
+    if "temperaturemax_celsius" in df.columns:
+        tmax_c = df["temperaturemax_celsius"].to_numpy(dtype=float)
+    else:
+        tmax_c = (tmax - 32.0) * 5.0 / 9.0
+    # C is a linear map of F, so one set of rows serves both lines
+    keep = _downsample(tmax, max_points)
+    return {"dates": df.index.to_numpy()[keep], "tmax": tmax[keep], "tmax_c": tmax_c[keep]}
+
+# ---- worker side ----
+
+# kind -> (fig, ax), reused for every chart of that kind in this process
+_FIGURES: dict[str, Any] = {}
+
+def _figure(kind: str):
+    if kind not in _FIGURES:
+        # OO API with an Agg canvas: no pyplot state, nothing to close
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        _FIGURES[kind] = (fig, fig.add_subplot())
+    fig, ax = _FIGURES[kind]
+    ax.clear()
+    return fig, ax
+
+def render_chart(kind: str, outfile: str, data: dict, dpi: int = DPI) -> str:
+    """Draw one chart of `kind` from `data` into `outfile`, reusing this process's figure for that kind."""
+    if kind not in _DRAW:
+        raise ValueError(f"Unknown plot kind {kind!r}; choose from {PLOT_KINDS}")
+    fig, ax = _figure(kind)
+    _DRAW[kind](fig, ax, **data)
+    fig.savefig(outfile, dpi=dpi)
+    return outfile
+
+class RenderQueue:
+    """
+    Renders charts off the analytics path and hands back futures of output paths.
+
+    - `workers <= 1` renders on one background thread in this process;
+      otherwise a ProcessPoolExecutor (matplotlib loads only in the workers).
+    - Each worker keeps one figure per chart kind and clears it between charts.
+    - `submit` takes the plain-array dicts built by the `*_data` helpers, so
+      callers can print results first and `wait()` for the files afterwards.
+    """
+
+    def __init__(self, workers: int | None = 1, dpi: int = DPI):
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        self.dpi = dpi
+        self.workers = max(1, workers)
+        if self.workers == 1:
+            self._pool = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.futures: list[Future] = []
+
+    def submit(self, kind: str, outfile: str, data: dict) -> Future:
+        fut = self._pool.submit(render_chart, kind, outfile, data, self.dpi)
+        fut.outfile = outfile
+        self.futures.append(fut)
+        return fut
+
+    def wait(self) -> list[tuple[str, BaseException | None]]:
+        """Block until everything submitted so far is written; (outfile, error) per chart."""
+        done = []
+        for fut in self.futures:
+            err = fut.exception()
+            done.append((fut.outfile, err))
+        self.futures = []
+        return done
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
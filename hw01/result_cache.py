@@ -0,0 +1,161 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, asdict
+
+# Stdlib only: a hit must answer without importing pandas or numpy.
+
+# Bump when the entry layout changes; older entries are then treated as misses.
+RESULT_CACHE_VERSION = 2
+DEFAULT_MAX_BYTES = 64 * 2**20
+
+# CLI options that do not change the printed payload (or are stamped separately)
+IGNORED_OPTIONS = frozenset({
+    "func", "cmd", "input", "cache_dir", "no_cache", "cache_stats", "no_result_cache", "result_cache_mb",
+    "profile", "profile_json", "profile_out", "workers",
+})
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    errors: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+# Process-wide counters for the result cache.
+STATS = ResultCacheStats()
+
+def default_cache_dir() -> str:
+    """Same location as `cache.default_cache_dir()`, without importing the frame cache."""
+    return os.environ.get("HW01_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "hw01")
+
+def _stamp(path: str) -> dict:
+    st = os.stat(path)
+    return {"path": os.path.abspath(path), "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+_CODE_STAMP: str | None = None
+
+def code_stamp() -> str:
+    """Digest of the hw01 sources' names, mtimes and sizes, so edited code never serves old results."""
+    global _CODE_STAMP
+    if _CODE_STAMP is None:
+        here = os.path.dirname(os.path.abspath(__file__))
+        parts = sorted(
+            (e.name, e.stat().st_mtime_ns, e.stat().st_size)
+            for e in os.scandir(here) if e.name.endswith(".py")
+        )
+        _CODE_STAMP = hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+    return _CODE_STAMP
+
+def make_key(cmd: str, options: dict, inputs: list[str]) -> dict:
+    """
+    Everything a payload depends on: subcommand, every option that can change
+    it, each input's absolute path / mtime / size, and the code version.
+    Raises OSError if an input is missing (the caller then runs uncached).
+    """
+    return {
+        "version": RESULT_CACHE_VERSION,
+        "cmd": cmd,
+        "options": {k: v for k, v in sorted(options.items()) if k not in IGNORED_OPTIONS},
+        "inputs": [_stamp(p) for p in inputs],
+        "code": code_stamp(),
+    }
+
+def digest(key: dict) -> str:
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+class ResultCache:
+    """
+    Stored stdout/stderr of earlier runs, one JSON file per key digest in `root`.
+
+    - `get` returns (stdout, stderr) for a key (and marks the entry recently used) or None.
+    - `put` writes atomically, then evicts least-recently-used entries until
+      the directory is within `max_bytes`. Recency is the entry's mtime.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key: dict) -> str:
+        return os.path.join(self.root, f"{digest(key)}.json")
+
+    def get(self, key: dict) -> tuple[str, str] | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("key") != json.loads(json.dumps(key, default=str)):
+                STATS.misses += 1
+                return None
+            os.utime(path)  # LRU bump
+        except FileNotFoundError:
+            STATS.misses += 1
+            return None
+        except (OSError, ValueError):
+            STATS.errors += 1
+            STATS.misses += 1
+            return None
+        STATS.hits += 1
+        return entry["stdout"], entry["stderr"]
+
+    def put(self, key: dict, stdout: str, stderr: str = "") -> bool:
+        data = json.dumps({"key": key, "stdout": stdout, "stderr": stderr}, default=str)
+        if len(data) > self.max_bytes:
+            return False
+        path = self._path(key)
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            # write to a temp file and rename so readers never see a partial entry
+            fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    fh.write(data)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except OSError:
+            STATS.errors += 1
+            return False
+        STATS.writes += 1
+        self.evict()
+        return True
+
+    def entries(self) -> list[tuple[float, int, str]]:
+        """(mtime, size, path) per entry, oldest first."""
+        out = []
+        try:
+            for e in os.scandir(self.root):
+                if e.name.endswith(".json"):
+                    st = e.stat()
+                    out.append((st.st_mtime, st.st_size, e.path))
+        except FileNotFoundError:
+            pass
+        return sorted(out)
+
+    def evict(self) -> int:
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        STATS.evictions += removed
+        return removed
+
+    def usage(self) -> dict[str, int]:
+        entries = self.entries()
+        return {"entries": len(entries), "bytes": sum(size for _, size, _ in entries), "max_bytes": self.max_bytes}
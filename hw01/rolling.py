@@ -0,0 +1,125 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+ROLLING_STATS = ("sma", "ema", "std", "min", "max")
+
+def _window_sums(cs: np.ndarray, w: int, out: np.ndarray) -> np.ndarray:
+    # sum over the trailing window ending at each row, from prefix sums `cs`
+    # (cs[0] == 0); slices only, no index arrays
+    n = len(cs) - 1
+    k = min(w, n)
+    out[:k] = cs[1:k + 1]
+    if w < n:  # a window longer than the series leaves only the prefix
+        np.subtract(cs[w + 1:], cs[1:n - w + 1], out=out[k:])
+    return out
+
+def _sliding_extremes(x: np.ndarray, targets, fill: float, op) -> None:
+    """
+    Trailing-window max (op=np.maximum) or min (op=np.minimum) for several windows.
+
+    `targets` is a list of (w, out) pairs. Builds m_k[j] = op(x[j:j+k]) for
+    k = 1, 2, 4, ... by doubling; a window w with k <= w < 2k is then the op of
+    two overlapping length-k runs. Each level is one contiguous vectorized op and
+    the levels are shared by all windows, so the cost is O(log max(w)) per row
+    instead of a per-element monotonic-deque loop in Python.
+    """
+    n = len(x)
+    wmax = max(w for w, _ in targets)
+    # pad the front so every row has a full window; pad values never win
+    m = np.empty(n + wmax - 1)
+    m[:wmax - 1] = fill
+    m[wmax - 1:] = x
+    pending = sorted(targets, key=lambda t: t[0])
+    k = 1
+    while pending:
+        while pending and pending[0][0] < 2 * k:
+            w, out = pending.pop(0)
+            op(m[wmax - w:wmax - w + n], m[wmax - k:wmax - k + n], out=out)
+        if pending:
+            m = op(m[:-k], m[k:])
+            k *= 2
+
+def rolling_block(values, windows=(20, 50), stats=("sma",), min_periods: int | None = None) -> tuple[np.ndarray, list[str]]:
+    """
+    Compute several trailing-window statistics for several windows at once.
+
+    Returns `(block, labels)`: a preallocated float64 array of shape
+    (n, len(stats) * len(windows)) and column labels like "sma_20".
+    Stats: "sma" and "std" (ddof=1) come from one set of prefix sums, so each
+    costs O(1) per row regardless of window length; "min"/"max" share one
+    doubling table across all windows (O(log w) vectorized passes);
+    "ema" (span=w, adjust=False) is delegated to pandas' ewm.
+    NaNs are skipped; a row is NaN until the window holds `min_periods` valid
+    values (default: the full window, like `rolling(window=w, min_periods=w)`;
+    capped at w).
+    """
+    unknown = [s for s in stats if s not in ROLLING_STATS]
+    if unknown:
+        raise ValueError(f"Unknown rolling stats {unknown}; choose from {ROLLING_STATS}")
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    valid = ~np.isnan(x)
+    labels = [f"{s}_{w}" for s in stats for w in windows]
+    # column-major so each output column is contiguous
+    block = np.empty((n, len(labels)), dtype=np.float64, order="F")
+    if n == 0:
+        return block, labels
+
+    # centre before the prefix sums to keep the differences well-conditioned
+    all_valid = bool(valid.all())
+    ref = x.mean() if all_valid else (x[valid].mean() if valid.any() else 0.0)
+    xc = x - ref if all_valid else np.where(valid, x - ref, 0.0)
+    cs = np.concatenate([[0.0], np.cumsum(xc)])
+    cnt = None if all_valid else np.concatenate([[0.0], np.cumsum(valid, dtype=np.float64)])
+    cs2 = np.concatenate([[0.0], np.cumsum(xc * xc)]) if "std" in stats else None
+    extremes = {"max": [], "min": []}
+    total = np.empty(n)
+    count = np.empty(n)
+    total2 = np.empty(n) if cs2 is not None else None
+
+    col = 0
+    for s in stats:
+        for w in windows:
+            if w < 1:
+                raise ValueError(f"Window must be >= 1, got {w}")
+            mp = w if min_periods is None else min(min_periods, w)
+            out = block[:, col]
+            col += 1
+            if s == "ema":
+                out[:] = pd.Series(x).ewm(span=w, adjust=False, min_periods=mp, ignore_na=True).mean().to_numpy()
+                continue
+            if all_valid:
+                k = min(w, n)
+                count[:k] = np.arange(1, k + 1)
+                count[k:] = w
+            else:
+                _window_sums(cnt, w, count)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                if s == "sma":
+                    np.divide(_window_sums(cs, w, total), count, out=out)
+                    out += ref
+                elif s == "std":
+                    _window_sums(cs, w, total)
+                    _window_sums(cs2, w, total2)
+                    # (sum x^2 - (sum x)^2 / n) / (n - 1)
+                    np.multiply(total, total, out=out)
+                    out /= count
+                    np.subtract(total2, out, out=out)
+                    out /= count - 1
+                    np.maximum(out, 0.0, out=out)
+                    np.sqrt(out, out=out)
+                    out[count < 2] = np.nan
+                else:
+                    # filled in below, once for all windows
+                    extremes[s].append((w, out, count < max(mp, 1)))
+                    continue
+            out[count < max(mp, 1)] = np.nan
+
+    for s, fill, op in (("max", -np.inf, np.maximum), ("min", np.inf, np.minimum)):
+        if extremes[s]:
+            xs = x if all_valid else np.where(valid, x, fill)
+            _sliding_extremes(xs, [(w, out) for w, out, _ in extremes[s]], fill, op)
+            for _, out, short in extremes[s]:
+                out[short] = np.nan
+    return block, labels
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import importlib.util
+import os
+from typing import Iterable
+import pandas as pd
+
+# Declared column types per dataset, so the CSV parser skips type inference.
+# Columns that can have gaps are float64 (NaN-safe); Volume is left to
+# inference (int64 when complete, float64 with gaps), and weather dates stay
+# strings for dates.parse_dates. Columns not listed are inferred as before.
+STOCK_DATE_COL = "Date"
+STOCK_DTYPES = {
+    "Open": "float64",
+    "High": "float64",
+    "Low": "float64",
+    "Close": "float64",
+    "Adj Close": "float64",
+}
+WEATHER_DATE_COL = "date"
+WEATHER_DTYPES = {
+    "date": "str",
+    "temperaturemin": "float64",
+    "temperaturemax": "float64",
+    "precipitation": "float64",
+    "snow": "float64",
+    "snwd": "float64",
+    "awnd": "float64",
+}
+_DTYPES = {"stocks": STOCK_DTYPES, "weather": WEATHER_DTYPES}
+
+# $HW01_CSV_ENGINE=c|python|pyarrow overrides the choice below
+ENGINE_ENV = "HW01_CSV_ENGINE"
+# The engines' float parsers round differently in the last bit, so the same
+# file can load to values a few ulps apart and `--json` floats (repr) can
+# differ in their last digits between machines with and without pyarrow.
+# Values agree within this relative tolerance; set HW01_CSV_ENGINE=c where
+# output must match byte for byte. (float_precision="round_trip" would make
+# the C engine correctly rounded too, but costs 50-150% more parse time.)
+ENGINE_RTOL = 1e-14
+
+def csv_engine() -> str:
+    """'pyarrow' when pyarrow is installed (multi-threaded parser), otherwise pandas' C parser; see ENGINE_RTOL."""
+    forced = os.environ.get(ENGINE_ENV)
+    if forced:
+        return forced
+    return "pyarrow" if importlib.util.find_spec("pyarrow") is not None else "c"
+
+def header(path: str) -> list[str]:
+    """Column names from the first line of a CSV (no data rows parsed)."""
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def read_csv(path: str, dataset: str, usecols: Iterable[str] | None = None, parse_dates=None,
+             engine: str | None = None, chunksize: int | None = None):
+    """
+    `pd.read_csv` with the dataset's declared dtypes and parser engine.
+
+    `usecols` restricts the columns parsed; names missing from the file are
+    dropped here rather than raising, so callers keep their own error for a
+    missing column. Declared dtypes apply only to columns actually read.
+    With `chunksize` this returns pandas' chunk iterator (C engine; pyarrow
+    cannot chunk).
+    """
+    dtypes = _DTYPES[dataset]
+    cols = None
+    if usecols is not None:
+        present = set(header(path))
+        cols = list(dict.fromkeys(c for c in usecols if c in present))
+    wanted = dtypes if cols is None else {c: t for c, t in dtypes.items() if c in cols}
+    dates = set(parse_dates or ())
+    dtype = {c: t for c, t in wanted.items() if c not in dates}
+    engine = engine or csv_engine()
+    if chunksize is not None and engine == "pyarrow":
+        engine = "c"
+    return pd.read_csv(path, usecols=cols, dtype=dtype or None, parse_dates=parse_dates, engine=engine, chunksize=chunksize)
+
+def stock_columns(price_col: str = "Adj Close") -> list[str]:
+    """Price columns a `stocks` run needs: metrics, MAs and both plot kinds use only the price."""
+    return [price_col]
+
+def weather_columns(slice_cols: Iterable[str] = ("temperaturemax", "precipitation")) -> list[str]:
+    """
+    Value columns a `weather` run needs: the min/max and seasonal summaries use
+    temperaturemin/max (as do the Celsius column and the plot), plus the
+    sliced-mean columns.
+    """
+    return list(dict.fromkeys(["temperaturemin", "temperaturemax", *slice_cols]))
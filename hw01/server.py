@@ -0,0 +1,231 @@
+from __future__ import annotations
+import contextlib, hmac, io, ipaddress, json, os, sys, threading, traceback
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# shared secret for `serve --token` / `client --token` when not given on the command line
+TOKEN_ENV = "HW01_SERVER_TOKEN"
+
+# Trust model: a request runs the CLI with the server's user, working
+# directory of the client's choosing and file permissions, so it can read
+# any CSV and write wherever --plot-out / --incremental-state point. Anyone
+# who can reach the port has that power. The server therefore binds to
+# loopback only unless a token is set, and with a token every request must
+# carry it (`Authorization: Bearer <token>`). On a shared machine, set a
+# token even on loopback: other local users can reach 127.0.0.1 too.
+
+@dataclass
+class FrameCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+class FrameCache:
+    """
+    In-memory LRU of parsed frames for the long-running server, capped by bytes.
+
+    Entries are keyed on (kind, abspath, mtime_ns, size), so an edited file is
+    re-read instead of served stale. Cached frames are shared between requests
+    and must be treated as read-only by callers.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.stats = FrameCacheStats()
+        self._entries: OrderedDict[tuple, tuple[object, int]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, kind, path: str, loader):
+        """Frame for `path` from the cache, or `loader()` (then cached)."""
+        st = os.stat(path)
+        key = (kind, os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return self._entries[key][0]
+        self.stats.misses += 1
+        df = loader()
+        size = int(df.memory_usage(deep=True).sum())
+        if size <= self.max_bytes:
+            self._entries[key] = (df, size)
+            self.nbytes += size
+            self._evict()
+        return df
+
+    def _evict(self) -> None:
+        while self.nbytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+            self.stats.evictions += 1
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def run_cli(argv: list[str], cwd: str | None = None) -> dict:
+    """
+    Run one CLI invocation in this process and capture it:
+    {"exit_code", "stdout", "stderr"}. Relative paths resolve against `cwd`.
+    Not re-entrant (it swaps the working directory and sys.stdout); the server
+    serializes calls.
+    """
+    try:
+        from . import cli
+    except ImportError:
+        import cli
+    out, err = io.StringIO(), io.StringIO()
+    prev = os.getcwd()
+    code = 0
+    try:
+        if cwd:
+            os.chdir(cwd)
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                parser = cli.build_parser()
+                args = parser.parse_args(argv)
+                if args.cmd in ("serve", "client"):
+                    print(f"[error] '{args.cmd}' cannot be forwarded to the server", file=sys.stderr)
+                    code = 2
+                else:
+                    # same path as `python -m hw01.cli`: --profile*, result cache, argument checks
+                    code = int(cli.dispatch(parser, args) or 0)
+            except SystemExit as e:  # argparse errors, --help
+                code = e.code if isinstance(e.code, int) else 2
+            except Exception:
+                traceback.print_exc()
+                code = 1
+    finally:
+        os.chdir(prev)
+    return {"exit_code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "QueryServer"
+
+    def _send(self, status: int, body: dict) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if token is None:
+            return True
+        sent = self.headers.get("Authorization", "")
+        if hmac.compare_digest(sent.encode("utf-8"), f"Bearer {token}".encode("utf-8")):
+            return True
+        self._send(401, {"error": "missing or wrong token"})
+        return False
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"ok": True})
+        elif not self._authorized():
+            return
+        elif self.path == "/stats":
+            cache = self.server.frames
+            self._send(200, {
+                "frames": {**cache.stats.as_dict(), "entries": len(cache), "bytes": cache.nbytes, "max_bytes": cache.max_bytes},
+                "requests": self.server.n_requests,
+            })
+        else:
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        if self.path != "/run":
+            self._send(404, {"error": f"unknown path {self.path}"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            argv = [str(a) for a in body["argv"]]
+        except (ValueError, KeyError, TypeError) as e:
+            self._send(400, {"error": f"bad request: {e}"})
+            return
+        cwd = body.get("cwd")
+        if cwd is not None and not (isinstance(cwd, str) and os.path.isabs(cwd) and os.path.isdir(cwd)):
+            self._send(400, {"error": "bad request: cwd must be an existing absolute directory"})
+            return
+        with self.server.lock:
+            self.server.n_requests += 1
+            result = run_cli(argv, cwd=cwd)
+        self._send(200, result)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class QueryServer(HTTPServer):
+    """
+    Localhost HTTP server answering CLI invocations from one warm process.
+
+    POST /run {"argv": [...], "cwd": "..."} -> {"exit_code", "stdout", "stderr"};
+    stdout is exactly what `python -m hw01.cli <argv>` would print, so `--json`
+    requests get the usual `to_json_payload` output. GET /stats reports the
+    frame cache; GET /health is a liveness check. `cwd` must be an existing
+    absolute directory.
+
+    With `token`, /run and /stats require `Authorization: Bearer <token>`.
+    Binding a non-loopback address without a token raises ValueError (see the
+    trust model at the top of this module).
+    """
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, max_bytes: int = DEFAULT_MAX_BYTES, verbose: bool = False,
+                 token: str | None = None):
+        super().__init__((host, port), _Handler)
+        if not token and not _is_loopback(self.server_address[0]):
+            self.server_close()
+            raise ValueError(f"refusing to serve on non-loopback address {host!r} without a token")
+        self.token = token or None
+        self.frames = FrameCache(max_bytes)
+        self.lock = threading.Lock()
+        self.n_requests = 0
+        self.verbose = verbose
+
+    def __enter__(self):
+        try:
+            from . import cli
+        except ImportError:
+            import cli
+        cli.FRAMES = self.frames
+        return self
+
+    def __exit__(self, *exc):
+        try:
+            from . import cli
+        except ImportError:
+            import cli
+        if cli.FRAMES is self.frames:
+            cli.FRAMES = None
+        self.server_close()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+def request(url: str, argv: list[str], cwd: str | None = None, timeout: float | None = None, token: str | None = None) -> dict:
+    """POST one CLI invocation to a running server and return its result dict."""
+    import urllib.request
+    data = json.dumps({"argv": list(argv), "cwd": os.path.abspath(cwd or os.getcwd())}).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    req = urllib.request.Request(url.rstrip("/") + "/run", data=data, headers=headers)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return json.loads(resp.read())
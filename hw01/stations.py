@@ -0,0 +1,75 @@
+from __future__ import annotations
+import os
+import numpy as np
+import pandas as pd
+
+try:
+    from . import dates as D, weather as W
+    from .batch import resolve_inputs
+except ImportError:
+    import dates as D, weather as W
+    from batch import resolve_inputs
+
+STATION_COL = "station"
+
+def read_station_csvs(inputs, station_col: str = STATION_COL) -> pd.DataFrame:
+    """
+    Load many weather CSVs into one frame indexed by sorted (station, date).
+
+    - `inputs` is a list of paths, or a directory / glob pattern.
+    - A file's rows take their station from its `station_col` column if present,
+      otherwise from the file name without extension.
+    - The station level is categorical (one small integer code per row).
+    """
+    paths = resolve_inputs(inputs) if isinstance(inputs, str) else list(inputs)
+    frames, names = [], []
+    for path in paths:
+        df = W.read_weather_csv(path)
+        if station_col in df.columns:
+            names.append(df.pop(station_col).astype(str).to_numpy())
+        else:
+            names.append(np.full(len(df), os.path.splitext(os.path.basename(path))[0], dtype=object))
+        frames.append(df)
+    combined = pd.concat(frames)
+    station = pd.Categorical(np.concatenate(names))
+    combined.index = pd.MultiIndex.from_arrays(
+        [pd.CategoricalIndex(station, name=station_col), combined.index.rename("date")])
+    return combined.sort_index()
+
+def _stations(df: pd.DataFrame) -> pd.CategoricalIndex:
+    return df.index.get_level_values(STATION_COL)
+
+def min_max_summary_by_station(df: pd.DataFrame) -> dict:
+    """`min_max_summary` for every station from one grouped reduction: {station: summary}."""
+    g = df[["temperaturemin", "temperaturemax"]].groupby(level=STATION_COL, observed=True)
+    means, medians = g.mean(), g.median()
+    return {
+        str(st): {
+            "mean_temperaturemin": round(float(means.at[st, "temperaturemin"]), 4),
+            "median_temperaturemin": float(medians.at[st, "temperaturemin"]),
+            "mean_temperaturemax": round(float(means.at[st, "temperaturemax"]), 4),
+            "median_temperaturemax": float(medians.at[st, "temperaturemax"]),
+        }
+        for st in means.index
+    }
+
+def slice_and_means_by_station(df: pd.DataFrame, start: str, end: str, cols=("temperaturemax", "precipitation")) -> pd.DataFrame:
+    """
+    `slice_and_means` for every station: one row per station, one column per
+    entry of `cols`; NaN where a station has no rows in [start, end].
+    """
+    dates = df.index.get_level_values("date")
+    lo, hi = D.slice_bounds(start, end)
+    in_range = (dates >= lo) & (dates <= hi)
+    means = df.loc[in_range, list(cols)].groupby(level=STATION_COL, observed=False).mean()
+    means.index = means.index.astype(str)
+    return means
+
+def seasonal_summaries_by_station(df: pd.DataFrame) -> dict:
+    """`seasonal_summaries` for every station from a single (station, season) groupby: {station: nested dict}."""
+    stations = _stations(df)
+    stats = W._seasonal_stats(df, df.index.get_level_values("date"), by=stations.codes)
+    out = {}
+    for code, part in stats.groupby(level=0, sort=True):
+        out[str(stations.categories[code])] = W._seasonal_nested(part.droplevel(0))
+    return out
@@ -0,0 +1,219 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Sequence
+import numpy as np
+import pandas as pd
+
+try:
+    from . import compare as CMP, stations as ST
+except ImportError:
+    import compare as CMP, stations as ST
+
+DEFAULT_FEATURES = ("temperaturemax", "precipitation")
+# a Monday return can still use Friday's weather
+DEFAULT_TOLERANCE_DAYS = 3
+
+def weather_panel(df: pd.DataFrame, features: Sequence[str] = DEFAULT_FEATURES) -> CMP.Panel:
+    """
+    Weather features as a `compare.Panel` with one column per station.
+
+    Accepts `read_station_csvs` output ((station, date) MultiIndex) or a single
+    `read_weather_csv` frame (one column named "station").
+    """
+    features = list(features)
+    if isinstance(df.index, pd.MultiIndex):
+        wide = df[features].unstack(level=ST.STATION_COL)
+        stations = [str(s) for s in wide[features[0]].columns]
+        data = {f: wide[f].to_numpy(dtype=np.float64) for f in features}
+        dates = pd.DatetimeIndex(wide.index, name="date")
+    else:
+        stations = ["station"]
+        data = {f: df[f].to_numpy(dtype=np.float64)[:, None] for f in features}
+        dates = pd.DatetimeIndex(df.index, name="date")
+    return CMP.Panel(stations, dates, data)
+
+def asof_align(panel: CMP.Panel, dates: pd.DatetimeIndex, tolerance_days: int | None = DEFAULT_TOLERANCE_DAYS) -> CMP.Panel:
+    """
+    Backward as-of join of `panel` (calendar days) onto `dates` (trading days).
+
+    For every target date, station and feature, takes the latest non-missing
+    observation dated on or before it, and no more than `tolerance_days` older;
+    otherwise NaN. Same rows as `pd.merge_asof(direction="backward",
+    tolerance=...)` per station after dropping missing values, but done for all
+    stations at once with one `searchsorted` and a running max of row positions.
+    """
+    src = panel.dates.values.astype("datetime64[ns]")
+    tgt = pd.DatetimeIndex(dates).values.astype("datetime64[ns]")
+    pos = np.searchsorted(src, tgt, side="right") - 1
+    cols = np.arange(len(panel.tickers))
+    rows_idx = np.arange(len(src))[:, None]
+    out = {}
+    for f, v in panel.data.items():
+        # last valid row at or before each row, per station
+        last = np.maximum.accumulate(np.where(np.isnan(v), -1, rows_idx), axis=0)
+        rows = np.where(pos[:, None] >= 0, last[np.maximum(pos, 0)], -1)
+        ok = rows >= 0
+        if tolerance_days is not None:
+            ok &= src[np.maximum(rows, 0)] >= (tgt - np.timedelta64(tolerance_days, "D"))[:, None]
+        out[f] = np.where(ok, v[np.maximum(rows, 0), cols], np.nan)
+    return CMP.Panel(list(panel.tickers), pd.DatetimeIndex(dates), out)
+
+def _lag(x: np.ndarray, lag: int) -> np.ndarray:
+    # x[t - lag] at row t (feature observed `lag` trading days before the return)
+    if lag == 0:
+        return x
+    out = np.full_like(x, np.nan)
+    out[lag:] = x[:-lag]
+    return out
+
+def lagged_regression(returns: np.ndarray, features: np.ndarray, lags: Sequence[int] = (0, 1, 2)) -> dict[str, np.ndarray]:
+    """
+    OLS of every return column on every feature column, for each lag:
+    r_t = alpha + beta * x_{t-lag}, pairwise-complete rows.
+
+    Returns arrays of shape (len(lags), tickers, stations): "beta", "alpha",
+    "corr", "r2" and "n", each lag costing six matrix products (`compare.cross_sums`).
+    """
+    out = {k: [] for k in ("beta", "alpha", "corr", "r2", "n")}
+    for lag in lags:
+        s = CMP.cross_sums(returns, _lag(features, lag))
+        n = s["n"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            cov = s["sxy"] - s["sx"] * s["sy"] / n
+            var_r = s["sxx"] - s["sx"] ** 2 / n
+            var_x = s["syy"] - s["sy"] ** 2 / n
+            beta = cov / var_x
+            mean_r = s["x_ref"][:, None] + s["sx"] / n
+            mean_x = s["y_ref"][None, :] + s["sy"] / n
+            corr = np.clip(cov / np.sqrt(var_r * var_x), -1.0, 1.0)
+        short = n < 3
+        for k, v in (("beta", beta), ("alpha", mean_r - beta * mean_x), ("corr", corr), ("r2", corr ** 2)):
+            v = np.where(short, np.nan, v)
+            out[k].append(v)
+        out["n"].append(n.astype(np.int64))
+    return {k: np.stack(v) for k, v in out.items()}
+
+def _trailing(cs: np.ndarray, w: int) -> np.ndarray:
+    # trailing-window sums along axis 0 from prefix sums with a leading zero row
+    out = cs[1:].copy()
+    out[w:] -= cs[1:len(cs) - w]
+    return out
+
+# (rows x tickers x stations) cells per block of rolling_correlation's
+# temporaries: about 8 MiB per float64 array, a dozen such arrays alive at once
+ROLLING_BLOCK_CELLS = 1 << 20
+
+def _rolling_block(mr, r0, mx, x0, window: int, mp: int) -> np.ndarray:
+    # rolling correlation for one (ticker block, station block) from shared prefix sums
+    m = mr[:, :, None] * mx[:, None, :]
+    a = r0[:, :, None] * m
+    b = x0[:, None, :] * m
+    sums = {}
+    for k, v in (("n", m), ("a", a), ("b", b), ("aa", a * a), ("bb", b * b), ("ab", a * b)):
+        cs = np.zeros((len(v) + 1,) + v.shape[1:])
+        np.cumsum(v, axis=0, out=cs[1:])
+        sums[k] = _trailing(cs, window)
+    n = np.rint(sums["n"])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = sums["ab"] - sums["a"] * sums["b"] / n
+        var_a = sums["aa"] - sums["a"] ** 2 / n
+        var_b = sums["bb"] - sums["b"] ** 2 / n
+        corr = np.clip(cov / np.sqrt(var_a * var_b), -1.0, 1.0)
+    corr[n < mp] = np.nan
+    return corr
+
+def rolling_correlation(returns: np.ndarray, features: np.ndarray, window: int, min_periods: int | None = None,
+                        block_cells: int = ROLLING_BLOCK_CELLS) -> np.ndarray:
+    """
+    Trailing-window Pearson correlation of every (return column, feature column)
+    pair: shape (rows, tickers, stations). Uses rows where both are present, like
+    `Series.rolling(window).corr(other)`; NaN until `min_periods` (default: window)
+    such rows are in the window.
+
+    Pairs are processed in (ticker, station) blocks of about `block_cells`
+    cells, each block sharing one set of prefix sums, so beyond the result only
+    one block's temporaries are alive at a time.
+    """
+    if window < 2:
+        raise ValueError(f"window must be >= 2, got {window}")
+    mp = window if min_periods is None else max(2, min(min_periods, window))
+    mr, r0, _ = CMP._centred(np.asarray(returns, dtype=np.float64))
+    mx, x0, _ = CMP._centred(np.asarray(features, dtype=np.float64))
+    rows, n_t, n_s = len(r0), r0.shape[1], x0.shape[1]
+    out = np.empty((rows, n_t, n_s))
+    pairs = max(1, block_cells // max(rows, 1))
+    tb = min(n_t, pairs) or 1
+    sb = max(1, min(n_s, pairs // tb))
+    for i in range(0, n_t, tb):
+        for j in range(0, n_s, sb):
+            out[:, i:i + tb, j:j + sb] = _rolling_block(mr[:, i:i + tb], r0[:, i:i + tb], mx[:, j:j + sb], x0[:, j:j + sb], window, mp)
+    return out
+
+@dataclass
+class StockWeatherResult:
+    tickers: list[str]
+    stations: list[str]
+    features: list[str]
+    dates: pd.DatetimeIndex
+    window: int
+    lags: list[int]
+    corr: dict[str, np.ndarray]          # feature -> (tickers, stations), lag 0, full sample
+    regression: dict[str, dict]          # feature -> lagged_regression output
+    rolling: dict[str, np.ndarray]       # feature -> (dates, tickers, stations)
+
+    def summary(self) -> dict:
+        """Nested {feature: {ticker: {station: {...}}}} of plain floats for JSON."""
+        out: dict = {}
+        for f in self.features:
+            reg, roll = self.regression[f], self.rolling[f]
+            last_valid = np.where(np.isnan(roll), -1, np.arange(len(roll))[:, None, None]).max(axis=0)
+            by_ticker = out.setdefault(f, {})
+            for i, t in enumerate(self.tickers):
+                for j, s in enumerate(self.stations):
+                    col = roll[:, i, j]
+                    ok = ~np.isnan(col)
+                    by_ticker.setdefault(t, {})[s] = {
+                        "corr": float(self.corr[f][i, j]),
+                        "lags": [
+                            {"lag": int(lag), "beta": float(reg["beta"][k, i, j]), "alpha": float(reg["alpha"][k, i, j]),
+                             "r2": float(reg["r2"][k, i, j]), "n": int(reg["n"][k, i, j])}
+                            for k, lag in enumerate(self.lags)
+                        ],
+                        "rolling_corr": {
+                            "window": self.window,
+                            "last": float(col[last_valid[i, j]]) if last_valid[i, j] >= 0 else float("nan"),
+                            "mean": float(col[ok].mean()) if ok.any() else float("nan"),
+                            "min": float(col[ok].min()) if ok.any() else float("nan"),
+                            "max": float(col[ok].max()) if ok.any() else float("nan"),
+                        },
+                    }
+        return out
+
+def stock_weather(stock_panel: CMP.Panel, weather: CMP.Panel, price_col: str = "Adj Close",
+                  features: Sequence[str] = DEFAULT_FEATURES, window: int = 60, lags: Sequence[int] = (0, 1, 2),
+                  min_periods: int | None = None, tolerance_days: int | None = DEFAULT_TOLERANCE_DAYS) -> StockWeatherResult:
+    """
+    Daily returns of every ticker against every station's weather features on
+    trading days: full-sample correlations, lagged regressions and rolling
+    correlations, each batched over all (ticker, station) pairs.
+    """
+    features, lags = list(features), list(lags)
+    if 0 not in lags:
+        lags = [0, *lags]  # lag 0 is the headline correlation
+    returns = CMP.simple_returns(stock_panel.data[price_col])
+    aligned = asof_align(weather, stock_panel.dates, tolerance_days)
+    corr, regression, rolling = {}, {}, {}
+    for f in features:
+        x = aligned.data[f]
+        regression[f] = lagged_regression(returns, x, lags)
+        corr[f] = regression[f]["corr"][lags.index(0)]
+        rolling[f] = rolling_correlation(returns, x, window, min_periods)
+    return StockWeatherResult(list(stock_panel.tickers), list(weather.tickers), features, stock_panel.dates,
+                              window, lags, corr, regression, rolling)
+
+def load_and_compare(stock_paths: Sequence[str], weather_paths: Sequence[str], price_col: str = "Adj Close",
+                     features: Sequence[str] = DEFAULT_FEATURES, cache_dir: str | None = None, **kwargs) -> StockWeatherResult:
+    """`stock_weather` from files: stock CSVs (ticker = file stem) and weather CSVs (see `read_station_csvs`)."""
+    stocks = CMP.load_panel(stock_paths, fields=[price_col], cache_dir=cache_dir)
+    weather = weather_panel(ST.read_station_csvs(list(weather_paths)), features)
+    return stock_weather(stocks, weather, price_col=price_col, features=features, **kwargs)
@@ -2,9 +2,26 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 
+try:
+    from . import cache as C, compact as CP, metrics as M, profiling as PR, schema as SC
+    from .rolling import rolling_block
+    from .store import PriceStore
+except ImportError:
+    import cache as C, compact as CP, metrics as M, profiling as PR, schema as SC
+    from rolling import rolling_block
+    from store import PriceStore
+
 PRICE_COL = "Adj Close"
+# whole-number columns stored as nullable ints by `compact=True`
+COUNT_COLS = ("Volume",)
+
+def _maybe_compact(df: pd.DataFrame, compact: bool) -> pd.DataFrame:
+    if not compact:
+        return df
+    with PR.stage("compact"):
+        return CP.compact_frame(df, counts=COUNT_COLS)
 
-def read_stock_csv(path: str) -> pd.DataFrame:
+def read_stock_csv(path: str, cache_dir: str | None = None, columns=None, compact: bool = False) -> pd.DataFrame:
     """
     Reads a stock CSV file and returns a DataFrame indexed by date.
     HINTS:
@@ -13,14 +30,44 @@ def read_stock_csv(path: str) -> pd.DataFrame:
     - Expect a price column named `Adj Close` (see `PRICE_COL`). You may keep extra columns.
     - If duplicate dates exist, choose a policy (e.g., keep last). For HW tests, assume no duplicates.
     - Do not forward-fill missing prices here. Leave NaNs as-is.
+
+    If `cache_dir` is given, the parsed frame is stored there as a binary sidecar
+    (see `cache.py`) and reused while the CSV's mtime and size are unchanged.
+    `path` may also be a `PriceStore` directory (see `store.py`), which is opened
+    memory-mapped instead of parsed.
+    `columns` restricts the price columns returned (e.g. `[PRICE_COL]`); only those
+    are read from a store or cache entry.
+    `compact=True` returns smaller dtypes (float32 prices, nullable-int Volume;
+    see `compact.compact_frame`), with the bytes saved in `df.attrs["compact"]`.
     """
-    # Read CSV with Date column parsed as datetime
-    df = pd.read_csv(path, parse_dates=['Date'])
+    if PriceStore.is_store(path):
+        return _maybe_compact(PriceStore(path).to_frame(columns), compact)
+
+    if cache_dir is not None:
+        with PR.stage("cache_load"):
+            cached = C.load_frame(path, cache_dir, kind="stocks", columns=columns)
+        if cached is not None:
+            return _maybe_compact(cached, compact)
+
+    # With a cache the whole file is parsed so the stored entry is complete.
+    usecols = None if columns is None or cache_dir is not None else ['Date', *columns]
+
+    # Read CSV with Date column parsed as datetime (declared dtypes, fastest
+    # available engine; see schema.py)
+    with PR.stage("csv_parse"):
+        df = SC.read_csv(path, "stocks", usecols=usecols, parse_dates=['Date'])
     
     # Sort ascending by Date and set as index
-    df = df.sort_values('Date').set_index('Date')
+    with PR.stage("sort_index"):
+        df = df.sort_values('Date').set_index('Date')
+
+    if cache_dir is not None:
+        with PR.stage("cache_store"):
+            C.store_frame(path, df, cache_dir, kind="stocks")
+        if columns is not None:
+            df = df[list(columns)]
     
-    return df
+    return _maybe_compact(df, compact)
 
 def daily_simple_returns_pct(df: pd.DataFrame, price_col: str = PRICE_COL) -> pd.Series:
     """
@@ -56,22 +103,60 @@ def daily_simple_returns_formula(df: pd.DataFrame, price_col: str = PRICE_COL) -
     return returns
 
 
-def daily_simple_returns(df: pd.DataFrame, price_col: str = PRICE_COL) -> pd.Series:
+VALIDATE_MODES = ("off", "sample", "full")
+_VALIDATE_SAMPLE = 1024
+
+def _simple_returns_kernel(prices: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Single-pass r_t = P_t / P_{t-1} - 1 written into a float64 buffer.
+    `out` (length n) is allocated if not given; out[0] is NaN.
+    """
+    p = np.asarray(prices, dtype=np.float64)
+    if out is None:
+        out = np.empty(p.shape[0], dtype=np.float64)
+    if p.shape[0]:
+        out[0] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.divide(p[1:], p[:-1], out=out[1:])
+        np.subtract(out[1:], 1.0, out=out[1:])
+    return out
+
+def _check_returns(df: pd.DataFrame, price_col: str, returns: np.ndarray, validate: str) -> None:
+    # Cross-check the kernel against pct_change(), on everything or on a spread of positions.
+    n = len(returns)
+    if validate == "full":
+        ref = daily_simple_returns_pct(df, price_col).to_numpy(dtype=np.float64)
+        got = returns
+    else:
+        pos = np.unique(np.linspace(1, n - 1, num=min(n - 1, _VALIDATE_SAMPLE)).astype(np.int64)) if n > 1 else np.empty(0, np.int64)
+        # (P_{i-1}, P_i) pairs back to back, so every second pct_change() value is r_i
+        pairs = np.column_stack([pos - 1, pos]).ravel()
+        ref = df[price_col].iloc[pairs].pct_change().to_numpy(dtype=np.float64)[1::2]
+        got = returns[pos]
+    if not np.allclose(got, ref, rtol=1e-10, equal_nan=True):
+        raise RuntimeError(f"daily_simple_returns: kernel disagrees with pct_change() ({validate} check)")
+
+def daily_simple_returns(df: pd.DataFrame, price_col: str = PRICE_COL, validate: str = "off") -> pd.Series:
     """
     Computes daily simple returns from the price column.
     HINTS:
     - Delegate to one of the two functions above.
     - Verify equivalence between the two implementations with a tolerance (e.g., `np.allclose`).
     - Return the chosen Series unchanged (do not round).
-    """
 
-    returns_percent = daily_simple_returns_pct(df, price_col)
-    returns_formula = daily_simple_returns_formula(df, price_col)
+    Uses a single-pass NumPy kernel equivalent to `daily_simple_returns_formula`.
+    `validate` controls the cross-check against `pct_change()`:
+    "off" (default) skips it, "sample" checks ~1k spread-out positions,
+    "full" checks every row. A mismatch raises RuntimeError.
+    """
+    if validate not in VALIDATE_MODES:
+        raise ValueError(f"validate must be one of {VALIDATE_MODES}, got {validate!r}")
 
-    # Verify equivalence between the two implementations with tolerance
-    res = np.allclose(returns_percent, returns_formula, rtol=1e-10)
+    values = _simple_returns_kernel(df[price_col].to_numpy(dtype=np.float64))
+    if validate != "off":
+        _check_returns(df, price_col, values, validate)
 
-    return returns_formula
+    return pd.Series(values, index=df.index, name=price_col)
 
     
 def log_returns(df: pd.DataFrame, price_col: str = PRICE_COL) -> pd.Series:
@@ -83,9 +168,8 @@ def log_returns(df: pd.DataFrame, price_col: str = PRICE_COL) -> pd.Series:
     - Relationship: sum of log returns over a range equals log of cumulative gross return.
     - First row will be NaN.
     """
-    
-    print("Not implemented")
-    return pd.Series(dtype=float)
+    res = M.compute_metrics(df[price_col].to_numpy(dtype=np.float64), with_log_returns=True)
+    return pd.Series(res.log_returns[:, 0], index=df.index, name=price_col)
 
 def average_daily_return(returns: pd.Series) -> float:
     """
@@ -116,8 +200,9 @@ def cumulative_return(df: pd.DataFrame, price_col: str = PRICE_COL) -> float:
     if len(price_series) < 1:
         return float('nan')
     
-    P_first = price_series.iloc[0]
-    P_last = price_series.iloc[-1]
+    # as Python floats, so float32 (compact) prices divide in double precision
+    P_first = float(price_series.iloc[0])
+    P_last = float(price_series.iloc[-1])
     
     # Formula: (P_last / P_first) - 1
     return (P_last / P_first) - 1
@@ -131,8 +216,9 @@ def annualized_volatility(returns: pd.Series, trading_days: int = 252) -> float:
     - Scale by `sqrt(trading_days)` (use 252 by default).
     - If there are fewer than 2 non-NaN returns, return NaN.
     """
-    print("Not implemented")
-    return float('nan')
+    moments = M.RunningMoments.of(returns.to_numpy(dtype=np.float64))
+    vol, _ = M.annualize(moments, 0.0, trading_days)
+    return float(vol[0])
 
 def sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.015, trading_days: int = 252) -> float:
     """
@@ -145,9 +231,9 @@ def sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.015, trading_days
     - Annualize by multiplying by `sqrt(252)`.
     - If std is 0 or insufficient data, return NaN.
     """
-
-    print("Not implemented")
-    return float('nan')
+    moments = M.RunningMoments.of(returns.to_numpy(dtype=np.float64))
+    _, sharpe = M.annualize(moments, risk_free_rate, trading_days)
+    return float(sharpe[0])
 
 def rolling_moving_averages(df: pd.DataFrame, windows=(20, 50), price_col: str = PRICE_COL) -> pd.DataFrame:
     """
@@ -164,7 +250,9 @@ def rolling_moving_averages(df: pd.DataFrame, windows=(20, 50), price_col: str =
     
     result_df['price'] = df[price_col]
 
-    for w in windows:
-        result_df[f'ma_{w}'] = df[price_col].rolling(window=w, min_periods=w).mean()
+    # all windows from one prefix-sum pass (see rolling.py)
+    block, _ = rolling_block(df[price_col].to_numpy(dtype=np.float64), windows)
+    for j, w in enumerate(windows):
+        result_df[f'ma_{w}'] = block[:, j]
     
     return result_df
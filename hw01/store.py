@@ -0,0 +1,127 @@
+from __future__ import annotations
+import json
+import os
+import numpy as np
+import pandas as pd
+
+META_FILE = "meta.json"
+DATES_FILE = "Date.i64"
+
+class PriceStore:
+    """
+    Append-only, memory-mapped columnar price store.
+
+    Layout of the store directory:
+    - `meta.json`  – column names and committed row count.
+    - `Date.i64`   – int64 days since 1970-01-01, strictly increasing.
+    - `<i>.f64`    – one raw float64 file per column, in `meta["columns"]` order.
+
+    Reads return read-only `np.memmap` views, so only the columns actually touched
+    are paged in. Appends write the column files first and `meta.json` last; bytes
+    past the committed row count (e.g. from an interrupted append) are ignored and
+    overwritten by the next append.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, META_FILE), "r", encoding="utf-8") as fh:
+            self._meta = json.load(fh)
+
+    @staticmethod
+    def is_store(path: str) -> bool:
+        return os.path.isdir(path) and os.path.isfile(os.path.join(path, META_FILE))
+
+    @classmethod
+    def create(cls, root: str, columns) -> "PriceStore":
+        columns = [str(c) for c in columns]
+        if len(set(columns)) != len(columns):
+            raise ValueError("Duplicate column names.")
+        os.makedirs(root, exist_ok=True)
+        if cls.is_store(root):
+            raise ValueError(f"{root!r} already contains a price store.")
+        for name in [DATES_FILE] + [f"{i}.f64" for i in range(len(columns))]:
+            open(os.path.join(root, name), "wb").close()
+        meta = {"columns": columns, "n_rows": 0}
+        with open(os.path.join(root, META_FILE), "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        return cls(root)
+
+    @classmethod
+    def from_frame(cls, root: str, df: pd.DataFrame) -> "PriceStore":
+        """Create a store holding every column of a Date-indexed frame (e.g. `read_stock_csv` output)."""
+        store = cls.create(root, df.columns)
+        store.append(df)
+        return store
+
+    def __len__(self) -> int:
+        return int(self._meta["n_rows"])
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self._meta["columns"])
+
+    def _map(self, fname: str, dtype) -> np.ndarray:
+        n = len(self)
+        if n == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(os.path.join(self.root, fname), dtype=dtype, mode="r", shape=(n,))
+
+    def dates(self) -> np.ndarray:
+        """int64 epoch-day view of the date column."""
+        return self._map(DATES_FILE, np.int64)
+
+    def column(self, name: str) -> np.ndarray:
+        """float64 view of one price column; no data is copied."""
+        try:
+            i = self._meta["columns"].index(name)
+        except ValueError:
+            raise KeyError(f"Column {name!r} not in store; have {self.columns}.") from None
+        return self._map(f"{i}.f64", np.float64)
+
+    def to_frame(self, columns=None) -> pd.DataFrame:
+        """
+        Date-indexed DataFrame over the requested columns (all by default).
+        Column data stays backed by the memory map.
+        """
+        names = self.columns if columns is None else list(columns)
+        data = {c: self.column(c) for c in names}
+        index = pd.DatetimeIndex(self.dates().view("datetime64[D]"), name="Date")
+        return pd.DataFrame(data, index=index, columns=names, copy=False)
+
+    def append(self, df: pd.DataFrame) -> int:
+        """
+        Append rows of a Date-indexed frame with the store's columns.
+        Dates must be strictly increasing and later than the last stored date.
+        Returns the new row count.
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("Expected a DatetimeIndex.")
+        missing = [c for c in self.columns if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        days = df.index.values.astype("datetime64[D]").view(np.int64)
+        if len(days) == 0:
+            return len(self)
+        if np.any(np.diff(days) <= 0):
+            raise ValueError("Dates must be strictly increasing (one row per day).")
+        n = len(self)
+        if n and days[0] <= self.dates()[-1]:
+            raise ValueError("Appended dates must be after the last stored date.")
+
+        self._write(DATES_FILE, n, days.astype(np.int64))
+        for i, c in enumerate(self.columns):
+            self._write(f"{i}.f64", n, df[c].to_numpy(dtype=np.float64))
+
+        meta = dict(self._meta, n_rows=n + len(days))
+        tmp = os.path.join(self.root, META_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(meta, fh)
+        os.replace(tmp, os.path.join(self.root, META_FILE))
+        self._meta = meta
+        return len(self)
+
+    def _write(self, fname: str, n_rows: int, values: np.ndarray) -> None:
+        with open(os.path.join(self.root, fname), "r+b") as fh:
+            fh.truncate(n_rows * values.itemsize)
+            fh.seek(0, os.SEEK_END)
+            fh.write(np.ascontiguousarray(values).tobytes())
@@ -1,12 +1,48 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
 
-def read_weather_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
+try:
+    from . import compact as CP, dates as D, profiling as PR, schema as SC
+except ImportError:
+    import compact as CP, dates as D, profiling as PR, schema as SC
+
+SEASONS = ("Winter", "Spring", "Summer", "Fall")
+# month (1-12) -> index into SEASONS; slot 0 unused
+_MONTH_TO_SEASON = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+
+def season_codes(index: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (season_year, season index into SEASONS) for every date, as int arrays.
+    Spring = 3-5, Summer = 6-8, Fall = 9-11, Winter = 12, 1, 2; December counts
+    toward the following year's Winter (Winter is labeled by its January year).
+    """
+    months = np.asarray(index.month)
+    season_year = np.asarray(index.year, dtype=np.int64) + (months == 12)
+    return season_year, _MONTH_TO_SEASON[months]
+
+def season_labels(index: pd.DatetimeIndex) -> tuple[np.ndarray, np.ndarray]:
+    """(season_year, season name) for every date; see `season_codes`."""
+    season_year, code = season_codes(index)
+    return season_year, np.asarray(SEASONS, dtype=object)[code]
+
+def read_weather_csv(path: str, compact: bool = False, columns=None) -> pd.DataFrame:
+    # columns: value columns to parse (default all; see schema.weather_columns);
+    # compact=True: smaller dtypes via compact.compact_frame (bytes saved in df.attrs["compact"])
+    usecols = None if columns is None else [SC.WEATHER_DATE_COL, *columns]
+    with PR.stage("csv_parse"):
+        df = SC.read_csv(path, "weather", usecols=usecols)
     if "date" not in df.columns:
         raise ValueError("Expected a 'date' column in weather CSV.")
-    df["date"] = pd.to_datetime(df["date"])
-    return df.sort_values("date").set_index("date")
+    # detect the date format once per file, then parse the column in one pass
+    with PR.stage("parse_dates"):
+        df["date"] = D.parse_dates(df["date"], fmt=D.format_for_file(path, df["date"]))
+    with PR.stage("sort_index"):
+        df = df.sort_values("date").set_index("date")
+    if compact:
+        with PR.stage("compact"):
+            df = CP.compact_frame(df)
+    return df
 
 def min_max_summary(df: pd.DataFrame) -> dict:
     """
@@ -19,8 +55,10 @@ def min_max_summary(df: pd.DataFrame) -> dict:
     """
     fn = "[min_max_summary]"
 
-    tempmin = df['temperaturemin'].dropna()
-    tempmax = df['temperaturemax'].dropna()
+    # float64 even on a --compact (float32) frame: np.float32 results print as N/A
+    # in formatter.print_kv and carry float32 noise into the JSON
+    tempmin = pd.Series(CP.as_float64(df['temperaturemin'])).dropna()
+    tempmax = pd.Series(CP.as_float64(df['temperaturemax'])).dropna()
 
     #["mean_temperaturemin", "median_temperaturemin", "mean_temperaturemax", "median_temperaturemax"]
 
@@ -63,12 +101,70 @@ def slice_and_means(df: pd.DataFrame, start: str, end: str, cols=("temperaturema
     fn = "[slice_and_means]"
 
 
-    df_range = df.loc[start: end , ['temperaturemax', 'precipitation']]
+    # float64 even on a --compact (float32) frame, like min_max_summary
+    df_range = df.loc[start: end , list(cols)]
+    df_range = pd.DataFrame({c: CP.as_float64(df_range[c]) for c in df_range.columns}, index=df_range.index)
 
     range_means = df_range.mean()
 
     return range_means
 
+def _to_ns(values) -> np.ndarray:
+    return np.asarray(pd.DatetimeIndex(np.atleast_1d(values)).as_unit("ns").asi8)
+
+class RangeMeans:
+    """
+    Answers "mean of these columns between start and end" repeatedly, in O(log n) each.
+
+    Built once from a date-indexed frame (e.g. `read_weather_csv` output): keeps the
+    sorted dates as int64 plus per-column prefix sums and prefix counts of non-NaN
+    values, so a query is two `searchsorted` calls and a subtraction.
+    Bounds are inclusive, like `.loc[start:end]`; NaNs are skipped like `.mean()`.
+    """
+
+    def __init__(self, df: pd.DataFrame, cols=None):
+        if cols is None:
+            cols = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c])]
+        self.cols = list(cols)
+        dates = _to_ns(df.index)
+        vals = df[self.cols].to_numpy(dtype=np.float64, na_value=np.nan)
+        if not np.all(dates[1:] >= dates[:-1]):
+            order = np.argsort(dates, kind="stable")
+            dates, vals = dates[order], vals[order]
+        self._dates = dates
+        valid = ~np.isnan(vals)
+        # centre each column so long prefix sums don't swamp short ranges
+        with np.errstate(invalid="ignore"):
+            self._ref = np.where(valid.any(axis=0), np.nanmean(np.where(valid, vals, np.nan), axis=0), 0.0)
+        centred = np.where(valid, vals - self._ref, 0.0)
+        k = len(self.cols)
+        self._sums = np.vstack([np.zeros((1, k)), np.cumsum(centred, axis=0)])
+        self._counts = np.vstack([np.zeros((1, k), dtype=np.int64), np.cumsum(valid, axis=0)])
+
+    def _col_idx(self, cols) -> list[int]:
+        if cols is None:
+            return list(range(len(self.cols)))
+        missing = [c for c in cols if c not in self.cols]
+        if missing:
+            raise KeyError(f"Columns not indexed: {missing}")
+        return [self.cols.index(c) for c in cols]
+
+    def mean_batch(self, starts, ends, cols=None) -> pd.DataFrame:
+        """One row per (start, end) pair, one column per entry of `cols` (default: all indexed)."""
+        idx = self._col_idx(cols)
+        lo = np.searchsorted(self._dates, D.bounds_ns(starts, "start"), side="left")
+        hi = np.searchsorted(self._dates, D.bounds_ns(ends, "end"), side="right")
+        hi = np.maximum(hi, lo)
+        total = self._sums[hi][:, idx] - self._sums[lo][:, idx]
+        count = self._counts[hi][:, idx] - self._counts[lo][:, idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(count > 0, total / count + self._ref[idx], np.nan)
+        return pd.DataFrame(means, columns=[self.cols[i] for i in idx])
+
+    def mean(self, start, end, cols=None) -> pd.Series:
+        """Same result as `slice_and_means(df, start, end, cols)`."""
+        return self.mean_batch([start], [end], cols).iloc[0].rename(None)
+
 def seasonal_summaries(df: pd.DataFrame) -> dict:
     """
     NOTE: Homework-only. For the lab, leave a placeholder.
@@ -118,62 +214,52 @@ def seasonal_summaries(df: pd.DataFrame) -> dict:
     }
     """
     fn = "[seasonal_summaries]"
-    
-    # Get the year from the data (assuming single year)
-    year = df.index.year[0]
-    
-    # Initialize output dictionary for this year
-    out = {int(year): {}}
-    
-    # season date ranges for the year
-    seasons = {
-        'Winter': (f'{year}-12-01', f'{year+1}-02-28'),
-        'Spring': (f'{year}-03-01', f'{year}-05-31'),
-        'Summer': (f'{year}-06-01', f'{year}-08-31'),
-        'Fall': (f'{year}-09-01', f'{year}-11-30')
-    }
-    
-    # Process each season
-    for season_name, (start_date, end_date) in seasons.items():
-        
-        if season_name == 'Winter':
-            winter_data = df[
-                ((df.index.year == year) & (df.index.month == 12)) |
-                ((df.index.year == year + 1) & (df.index.month.isin([1, 2])))
-            ]
-            sub = winter_data
-        else:
-            # Other seasons are within the same year
-            sub = df.loc[start_date:end_date]
-        
-        # Skip if no data for this season
-        if len(sub) == 0:
-            continue
-            
-        tmin = sub['temperaturemin'].dropna()
-        tmax = sub['temperaturemax'].dropna()
-        
-        mean_tmin = float(tmin.mean())
-        median_tmin = float(tmin.median())
-     
-            
-        mean_tmax = float(tmax.mean())
-        median_tmax = float(tmax.median())
-  
-        
-        date_min = sub.index.min().strftime('%Y-%m-%d')
-        date_max = sub.index.max().strftime('%Y-%m-%d')
-        
-        payload = {
-            'date_min': date_min,
-            'date_max': date_max,
-            'mean_temperaturemin': mean_tmin,
-            'median_temperaturemin': median_tmin,
-            'mean_temperaturemax': mean_tmax,
-            'median_temperaturemax': median_tmax
+
+    if df.empty:
+        return {}
+
+    # one integer key per (season_year, season) and a single sorted groupby
+    return _seasonal_nested(_seasonal_stats(df, df.index))
+
+_SEASON_VALUE_COLS = ("mean_temperaturemin", "median_temperaturemin", "mean_temperaturemax", "median_temperaturemax")
+
+def _seasonal_stats(df: pd.DataFrame, dates: pd.DatetimeIndex, by=None) -> pd.DataFrame:
+    """
+    Per-(season_year, season) stats from one sorted groupby. The group key is
+    season_year * 4 + season index; `by` (e.g. station codes) adds an outer key.
+    """
+    season_year, code = season_codes(dates)
+    key = season_year * len(SEASONS) + code
+    # aggregate in float64 even on a --compact (float32) frame
+    frame = pd.DataFrame({
+        "tmin": CP.as_float64(df["temperaturemin"]),
+        "tmax": CP.as_float64(df["temperaturemax"]),
+        "date": dates,
+    })
+    keys = key if by is None else [np.asarray(by), key]
+    return frame.groupby(keys, sort=True).agg(
+        mean_temperaturemin=("tmin", "mean"),
+        median_temperaturemin=("tmin", "median"),
+        mean_temperaturemax=("tmax", "mean"),
+        median_temperaturemax=("tmax", "median"),
+        date_min=("date", "min"),
+        date_max=("date", "max"),
+    )
+
+def _seasonal_nested(stats: pd.DataFrame) -> dict:
+    # {season_year: {season: {...}}} from a `_seasonal_stats` table keyed by the season key only
+    keys = np.asarray(stats.index)
+    years = (keys // len(SEASONS)).tolist()
+    names = [SEASONS[c] for c in (keys % len(SEASONS)).tolist()]
+    date_min = stats["date_min"].dt.strftime("%Y-%m-%d").tolist()
+    date_max = stats["date_max"].dt.strftime("%Y-%m-%d").tolist()
+    numeric = {c: stats[c].to_numpy(dtype=float).tolist() for c in _SEASON_VALUE_COLS}
+
+    out: dict = {}
+    for i, (yr, sn) in enumerate(zip(years, names)):
+        out.setdefault(int(yr), {})[sn] = {
+            'date_min': date_min[i],
+            'date_max': date_max[i],
+            **{c: vals[i] for c, vals in numeric.items()},
         }
-        
-        # Add to output dictionary
-        out[int(year)][season_name] = payload
-    
     return out
@@ -0,0 +1,153 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+try:
+    from . import weather as W, dates as D, schema as SC
+except ImportError:
+    import weather as W, dates as D, schema as SC
+
+DEFAULT_CHUNKSIZE = 100_000
+
+class ValueCounts:
+    """
+    Exact online mean/median: a value -> count table plus a running sum.
+
+    Memory grows with the number of *distinct* values, not rows, which for
+    station readings (whole degrees, hundredths of an inch) stays small even
+    over decades of history.
+    """
+
+    def __init__(self):
+        self.counts: dict[float, int] = {}
+        self.n = 0
+        self.total = 0.0
+
+    def update(self, values) -> None:
+        v = np.asarray(values, dtype=np.float64)
+        v = v[~np.isnan(v)]
+        if not len(v):
+            return
+        self.n += len(v)
+        self.total += float(v.sum())
+        uniq, cnt = np.unique(v, return_counts=True)
+        for x, c in zip(uniq.tolist(), cnt.tolist()):
+            self.counts[x] = self.counts.get(x, 0) + c
+
+    def mean(self) -> float:
+        return self.total / self.n if self.n else float("nan")
+
+    def median(self) -> float:
+        if not self.n:
+            return float("nan")
+        keys = np.array(sorted(self.counts))
+        cum = np.cumsum([self.counts[k] for k in keys])
+        lo = keys[np.searchsorted(cum, (self.n - 1) // 2, side="right")]
+        hi = keys[np.searchsorted(cum, self.n // 2, side="right")]
+        return float((lo + hi) / 2.0)
+
+class _SeasonSlice:
+    def __init__(self):
+        self.tmin = ValueCounts()
+        self.tmax = ValueCounts()
+        self.date_min = None
+        self.date_max = None
+
+def _peak_rss_bytes() -> int | None:
+    try:
+        import resource, sys
+    except ImportError:  # not available on Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+def stream_weather(
+    path: str,
+    start: str,
+    end: str,
+    cols=("temperaturemax", "precipitation"),
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> dict:
+    """
+    One pass over a weather CSV in `chunksize`-row chunks, without loading it whole.
+
+    Produces the same results as `min_max_summary`, `slice_and_means` and
+    `seasonal_summaries` on `read_weather_csv(path)` (those stay the reference
+    implementations). Rows may be in any date order. Returns a dict with
+    "n_rows", "summary", "sliced_means" (pd.Series), "seasonal_summaries"
+    and "memory" (chunk size, chunk count, largest chunk in bytes, process peak RSS).
+    """
+    cols = list(cols)
+    start_ts, end_ts = D.slice_bounds(start, end)  # "2022-01" covers the month, as with .loc
+    tmin, tmax = ValueCounts(), ValueCounts()
+    slice_sum = np.zeros(len(cols))
+    slice_cnt = np.zeros(len(cols))
+    seasons: dict[tuple[int, str], _SeasonSlice] = {}
+    n_rows = n_chunks = peak_chunk = 0
+    fmt = None
+
+    usecols = [SC.WEATHER_DATE_COL, *SC.weather_columns(cols)]
+    for chunk in SC.read_csv(path, "weather", usecols=usecols, chunksize=chunksize):
+        if "date" not in chunk.columns:
+            raise ValueError("Expected a 'date' column in weather CSV.")
+        if fmt is None:
+            fmt = D.format_for_file(path, chunk["date"])
+        dates = D.parse_dates(chunk["date"], fmt=fmt)
+        n_rows += len(chunk)
+        n_chunks += 1
+        peak_chunk = max(peak_chunk, int(chunk.memory_usage(deep=True).sum()))
+
+        tmin.update(chunk["temperaturemin"])
+        tmax.update(chunk["temperaturemax"])
+
+        in_range = np.asarray((dates >= start_ts) & (dates <= end_ts))
+        for i, c in enumerate(cols):
+            v = chunk[c].to_numpy(dtype=np.float64)[in_range]
+            ok = ~np.isnan(v)
+            slice_sum[i] += v[ok].sum()
+            slice_cnt[i] += ok.sum()
+
+        season_year, season = W.season_labels(dates)
+        keys = pd.DataFrame({"y": season_year, "s": season, "d": dates})
+        for (yr, sn), idx in keys.groupby(["y", "s"], sort=False).indices.items():
+            acc = seasons.setdefault((int(yr), sn), _SeasonSlice())
+            acc.tmin.update(chunk["temperaturemin"].to_numpy()[idx])
+            acc.tmax.update(chunk["temperaturemax"].to_numpy()[idx])
+            d = dates[idx]
+            acc.date_min = d.min() if acc.date_min is None else min(acc.date_min, d.min())
+            acc.date_max = d.max() if acc.date_max is None else max(acc.date_max, d.max())
+
+    summary = {
+        "mean_temperaturemin": round(tmin.mean(), 4),
+        "median_temperaturemin": tmin.median(),
+        "mean_temperaturemax": round(tmax.mean(), 4),
+        "median_temperaturemax": tmax.median(),
+    }
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sliced = pd.Series(slice_sum / slice_cnt, index=cols, dtype=float)
+
+    out: dict = {}
+    order = {name: i for i, name in enumerate(W.SEASONS)}
+    for (yr, sn) in sorted(seasons, key=lambda k: (k[0], order[k[1]])):
+        acc = seasons[(yr, sn)]
+        out.setdefault(yr, {})[sn] = {
+            "date_min": acc.date_min.strftime("%Y-%m-%d"),
+            "date_max": acc.date_max.strftime("%Y-%m-%d"),
+            "mean_temperaturemin": acc.tmin.mean(),
+            "median_temperaturemin": acc.tmin.median(),
+            "mean_temperaturemax": acc.tmax.mean(),
+            "median_temperaturemax": acc.tmax.median(),
+        }
+
+    return {
+        "n_rows": n_rows,
+        "summary": summary,
+        "sliced_means": sliced,
+        "seasonal_summaries": out,
+        "memory": {
+            "chunksize": chunksize,
+            "n_chunks": n_chunks,
+            "peak_chunk_bytes": peak_chunk,
+            "peak_rss_bytes": _peak_rss_bytes(),
+        },
+    }
@@ -0,0 +1,8 @@
+import pytest
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Point the frame and result caches (and CLI subprocesses) at a per-test dir, not ~/.cache/hw01."""
+    cache_dir = tmp_path / "hw01-cache"
+    monkeypatch.setenv("HW01_CACHE_DIR", str(cache_dir))
+    return cache_dir
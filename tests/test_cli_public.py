@@ -1,7 +1,8 @@
 import json, subprocess, sys, os, pathlib
 
 def run_cmd(args):
-    result = subprocess.run([sys.executable, "-m", "hw01.cli"] + args, capture_output=True, text=True, cwd=os.getcwd())
+    # os.environ carries HW01_CACHE_DIR from the conftest fixture
+    result = subprocess.run([sys.executable, "-m", "hw01.cli"] + args, capture_output=True, text=True, cwd=os.getcwd(), env=dict(os.environ))
     assert result.returncode == 0, result.stderr
     return result.stdout.strip()
 
@@ -26,3 +27,276 @@ def test_cli_weather_plot_file(tmp_path):
     png = tmp_path / "weather.png"
     run_cmd(["weather", "--input", "data/weather_small.csv", "--plot-out", str(png)])
     assert png.exists() and png.stat().st_size > 0
+
+def test_cli_stocks_batch_jsonl(tmp_path):
+    import shutil
+    shutil.copy("data/nvda_2023_sample.csv", tmp_path / "NVDA.csv")
+    shutil.copy("data/AMD_2023_sample.csv", tmp_path / "AMD.csv")
+    (tmp_path / "BAD.csv").write_text("not,a,stock\n1,2,3\n")
+    result = subprocess.run(
+        [sys.executable, "-m", "hw01.cli", "stocks", "--inputs", str(tmp_path), "--workers", "2"],
+        capture_output=True, text=True, cwd=os.getcwd(),
+    )
+    lines = [json.loads(l) for l in result.stdout.strip().splitlines()]
+    by_ticker = {p["ticker"]: p for p in lines}
+    assert set(by_ticker) == {"AMD", "BAD", "NVDA"}
+    assert "error" in by_ticker["BAD"]
+    assert by_ticker["NVDA"]["n_rows"] == 250 and "avg_daily_return" in by_ticker["NVDA"]["metrics"]
+    assert result.returncode == 1
+
+def test_server_matches_cli_and_caches_frames():
+    import threading
+    from hw01 import server as SV
+    argv = ["stocks", "--input", "data/nvda_2023_sample.csv", "--ticker", "NVDA", "--json", "--no-cache"]
+    with SV.QueryServer(port=0) as srv:
+        t = threading.Thread(target=srv.serve_forever, daemon=True)
+        t.start()
+        try:
+            first = SV.request(srv.url, argv)
+            second = SV.request(srv.url, argv)
+            bad = SV.request(srv.url, ["weather", "--input", "data/weather_small.csv", "--bogus"])
+        finally:
+            srv.shutdown()
+    assert first["exit_code"] == 0 and first["stdout"] == second["stdout"]
+    assert first["stdout"].strip() == run_cmd(argv)
+    assert srv.frames.stats.misses == 1 and srv.frames.stats.hits == 1
+    assert bad["exit_code"] == 2 and "unrecognized arguments" in bad["stderr"]
+
+def _import_profile(args):
+    # {module: cumulative import seconds} from `python -X importtime`, plus the top-level total
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "hw01.cli"] + args, capture_output=True, text=True, cwd=os.getcwd(), env=dict(os.environ))
+    mods, total = {}, 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        mods[name.strip()] = int(cum) / 1e6
+        if not name.startswith("  "):
+            total += int(cum) / 1e6
+    return result, mods, total
+
+# generous: pandas + numpy alone are ~0.3-0.5 s on a laptop; matplotlib would add about as much again
+STARTUP_BUDGET_S = 2.0
+
+def test_cli_json_startup_skips_plotting_imports():
+    for args in (["stocks", "--input", "data/nvda_2023_sample.csv", "--json", "--no-cache"],
+                 ["weather", "--input", "data/weather_small.csv", "--json"]):
+        result, mods, total = _import_profile(args)
+        assert result.returncode == 0, result.stderr
+        assert not any(m.startswith("matplotlib") for m in mods), args
+        assert "hw01.plotting" not in mods and "hw01.batch" not in mods
+        assert total < STARTUP_BUDGET_S, (args, total)
+    result, mods, _ = _import_profile(["client", "--url", "http://127.0.0.1:9", "--", "stocks", "--input", "x.csv"])
+    assert result.returncode == 2 and "pandas" not in mods and "numpy" not in mods
+
+def test_cli_stocks_batch_plot_dir(tmp_path):
+    import shutil
+    src = tmp_path / "in"
+    src.mkdir()
+    shutil.copy("data/nvda_2023_sample.csv", src / "NVDA.csv")
+    shutil.copy("data/AMD_2023_sample.csv", src / "AMD.csv")
+    out = run_cmd(["stocks", "--inputs", str(src), "--workers", "1", "--plot-dir", str(tmp_path / "png"), "--plot-kind", "returns_hist"])
+    lines = [json.loads(l) for l in out.splitlines()]
+    for p in lines:
+        png = pathlib.Path(p["plot"])
+        assert png.name == f"{p['ticker']}_returns_hist.png"
+        assert png.exists() and png.stat().st_size > 0
+
+def test_render_reused_figure_matches_fresh(tmp_path):
+    from hw01 import render as R, stocks as S
+    nvda = S.read_stock_csv("data/nvda_2023_sample.csv", columns=["Adj Close"])
+    amd = S.read_stock_csv("data/AMD_2023_sample.csv", columns=["Adj Close"])
+    R.render_chart("price_ma", str(tmp_path / "nvda.png"), R.stock_price_ma_data(nvda))
+    R.render_chart("price_ma", str(tmp_path / "reused.png"), R.stock_price_ma_data(amd))
+    R._FIGURES.clear()
+    R.render_chart("price_ma", str(tmp_path / "fresh.png"), R.stock_price_ma_data(amd))
+    assert (tmp_path / "reused.png").read_bytes() == (tmp_path / "fresh.png").read_bytes()
+
+def test_to_json_payload_nested_bulk_types():
+    import io
+    import numpy as np
+    import pandas as pd
+    from hw01.formatter import to_json_payload, write_ndjson
+    idx = pd.date_range("2023-01-02", periods=3, freq="D")
+    payload = {
+        "rets": pd.Series([np.nan, 0.5, -0.25], index=idx),
+        "nested": {"arr": np.arange(3, dtype=np.int64), "x": np.float32(1.5), pd.Timestamp("2023-01-02"): [np.int64(7), pd.NaT]},
+        "frame": pd.DataFrame({"a": [1.0, np.nan]}),
+        "when": np.datetime64("2023-01-05"),
+    }
+    out = json.loads(to_json_payload(payload, nan_as_null=True))
+    assert out["rets"] == {"2023-01-02T00:00:00": None, "2023-01-03T00:00:00": 0.5, "2023-01-04T00:00:00": -0.25}
+    assert out["nested"] == {"arr": [0, 1, 2], "x": 1.5, "2023-01-02T00:00:00": [7, None]}
+    assert out["frame"] == {"a": [1.0, None]} and out["when"] == "2023-01-05T00:00:00"
+    assert "NaN" in to_json_payload({"r": pd.Series([np.nan])})  # default keeps the NaN token
+
+    buf = io.StringIO()
+    assert write_ndjson(({"i": i} for i in range(3)), stream=buf) == 3
+    assert [json.loads(l) for l in buf.getvalue().splitlines()] == [{"i": 0}, {"i": 1}, {"i": 2}]
+
+def test_print_series_bulk_layout(capsys):
+    import numpy as np
+    import pandas as pd
+    from hw01.formatter import print_series
+    s = pd.Series([np.nan, 0.0303178, -1.0], index=pd.DatetimeIndex(["2023-01-03", "2023-01-04", "2023-01-05"], name="Date"), name="Adj Close")
+    print_series("rets", s)
+    print_series("mixed", pd.Series([1.5, "a"], index=[3, 4]))
+    assert capsys.readouterr().out.splitlines() == [
+        "[rets]",
+        "Date         Adj Close",
+        "2023-01-03 00:00:00 nan",
+        "2023-01-04 00:00:00 0.0303",
+        "2023-01-05 00:00:00 -1.0000",
+        "[mixed]",
+        "index        0",
+        "3            1.5000",
+        "4            a",
+    ]
+
+def test_bench_datagen_and_regression_check(tmp_path):
+    import pandas as pd
+    from benchmarks import datagen, run as BR
+    from hw01 import stocks as S, weather as W
+    sp, wp = datagen.ensure("stocks", 2000, str(tmp_path)), datagen.ensure("weather", 2000, str(tmp_path))
+    assert datagen.ensure("stocks", 2000, str(tmp_path)) == sp and datagen.parse_size("10m") == 10_000_000
+    raw = pd.read_csv(sp)
+    assert not raw["Date"].is_monotonic_increasing and raw["Close"].isna().any()
+    assert len(S.read_stock_csv(sp)) == 2000 and W.read_weather_csv(wp)["temperaturemax"].isna().any()
+
+    base = {"results": {"a@10k": {"seconds": 0.1, "peak_bytes": 100}, "b@10k": {"seconds": 0.001, "peak_bytes": 100}}}
+    cur = {"results": {"a@10k": {"seconds": 0.2, "peak_bytes": 110}, "b@10k": {"seconds": 0.003, "peak_bytes": 300}}}
+    flagged = {(r["case"], r["metric"]) for r in BR.compare_results(cur, base)}
+    assert flagged == {("a@10k", "seconds"), ("b@10k", "peak_bytes")}
+
+def test_cli_profile_stages_on_stderr(tmp_path):
+    import pstats
+    args = ["weather", "--input", "data/weather_small.csv", "--json"]
+    dump = tmp_path / "weather.pstats"
+    result = subprocess.run([sys.executable, "-m", "hw01.cli", *args, "--profile-json", "--profile-out", str(dump)],
+                            capture_output=True, text=True, cwd=os.getcwd())
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == run_cmd(args)  # payload untouched
+    prof = json.loads(result.stderr.strip().splitlines()[-1])["profile"]
+    names = [s["name"] for s in prof["stages"]]
+    assert names[:5] == ["import", "read", "csv_parse", "parse_dates", "sort_index"]
+    assert {"seasonal", "json_encode", "write"} <= set(names)
+    assert all(s["seconds"] >= 0 and s["depth"] in (0, 1) for s in prof["stages"])
+    assert pstats.Stats(str(dump)).total_calls > 0
+
+def test_cli_batch_profile_sums_worker_stages(tmp_path):
+    import shutil
+    for name in ("nvda_2023_sample.csv", "AMD_2023_sample.csv"):
+        shutil.copy(os.path.join("data", name), tmp_path / name)
+    for workers in ("1", "2"):
+        result = subprocess.run([sys.executable, "-m", "hw01.cli", "stocks", "--inputs", str(tmp_path), "--workers", workers,
+                                 "--profile-json", "--no-cache"], capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        stages = {(s["name"], s["depth"]): s for s in json.loads(result.stderr.strip().splitlines()[-1])["profile"]["stages"]}
+        assert {("process", 0), ("read (sum)", 1), ("csv_parse (sum)", 2), ("metrics (sum)", 1)} <= set(stages), workers
+        assert stages[("read (sum)", 1)]["seconds"] > 0
+
+def test_cli_result_cache_hit_skips_pandas(tmp_path):
+    import shutil
+    from hw01 import result_cache as RC
+    src = tmp_path / "nvda.csv"
+    shutil.copy("data/nvda_2023_sample.csv", src)
+    args = ["stocks", "--input", str(src), "--ticker", "NVDA", "--json", "--cache-dir", str(tmp_path / "cache")]
+    fresh = run_cmd(["stocks", "--input", str(src), "--ticker", "NVDA", "--json", "--no-cache"])
+    assert run_cmd(args) == fresh
+    result, mods, _ = _import_profile(args + ["--cache-stats"])
+    assert result.returncode == 0 and result.stdout.strip() == fresh
+    assert "hits=1" in result.stderr and "pandas" not in mods and "numpy" not in mods
+    # a touched input or a changed option is a miss
+    os.utime(src, ns=(0, 0))
+    assert run_cmd(args + ["--ticker", "X"]) != fresh
+    result = subprocess.run([sys.executable, "-m", "hw01.cli", *args, "--cache-stats"], capture_output=True, text=True)
+    assert result.stdout.strip() == fresh and "[cache] results: hits=0 misses=1 writes=1" in result.stderr
+    # LRU eviction keeps the directory under its cap
+    cache = RC.ResultCache(str(tmp_path / "lru"))
+    keys = [RC.make_key("stocks", {"ticker": t}, [str(src)]) for t in "abc"]
+    for k in keys[:2]:
+        cache.put(k, "x" * 200)
+    cache.max_bytes = cache.usage()["bytes"] * 5 // 4  # room for two entries, not three
+    os.utime(cache._path(keys[0]), (0, 0))
+    assert cache.get(keys[1]) is not None
+    cache.put(keys[2], "x" * 200)
+    assert cache.get(keys[0]) is None and cache.get(keys[2]) is not None
+    assert cache.usage()["entries"] == 2 and cache.usage()["bytes"] <= cache.max_bytes
+
+def test_cli_compare_json():
+    out = run_cmd(["compare", "--stocks", "data/nvda_2023_sample.csv", "--weather", "data/weather_small.csv",
+                   "--window", "5", "--lags", "0", "--json", "--no-cache"])
+    assert json.loads(out)
+
+def test_cli_result_cache_replays_stderr(tmp_path):
+    args = [sys.executable, "-m", "hw01.cli", "weather", "--input", "data/weather_small.csv", "--json", "--compact",
+            "--cache-dir", str(tmp_path), "--cache-stats"]
+    miss, hit = (subprocess.run(args, capture_output=True, text=True) for _ in range(2))
+    assert hit.stdout == miss.stdout
+    miss_err, hit_err = miss.stderr.splitlines(), hit.stderr.splitlines()
+    assert miss_err[0].startswith("[compact]") and hit_err[:-1] == miss_err[:-1]
+    assert "hits=1" in hit_err[-1] and "misses=1" in miss_err[-1]
+
+def test_cli_weather_compact_text_matches_full():
+    args = ["weather", "--input", "data/weather_small.csv", "--no-cache"]
+    full, compact = run_cmd(args), run_cmd(args + ["--compact"])
+    head = lambda out: out.splitlines()[1:5]  # the min/max summary lines
+    assert head(compact) == head(full) and not any("N/A" in line for line in head(compact))
+    # compact changes memory use only: the JSON (sliced/seasonal means included) is identical
+    args = ["weather", "--input", "data/rdu-weather-history.csv", "--start", "2018-01", "--end", "2018-03", "--json", "--no-cache"]
+    assert run_cmd(args + ["--compact"]) == run_cmd(args)
+
+def test_server_token_loopback_and_cwd_checks():
+    import threading, urllib.error
+    import pytest
+    from hw01 import server as SV
+    with pytest.raises(ValueError, match="non-loopback"):
+        SV.QueryServer(host="0.0.0.0", port=0)
+    argv = ["weather", "--input", "data/weather_small.csv", "--json", "--no-cache"]
+    with SV.QueryServer(port=0, token="s3cret") as srv:
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        try:
+            with pytest.raises(urllib.error.HTTPError, match="401"):
+                SV.request(srv.url, argv)
+            with pytest.raises(urllib.error.HTTPError, match="401"):
+                SV.request(srv.url, argv, token="wrong")
+            with pytest.raises(urllib.error.HTTPError, match="400"):
+                SV.request(srv.url, argv, cwd=os.path.join(os.getcwd(), "no-such-dir"), token="s3cret")
+            ok = SV.request(srv.url, argv, token="s3cret")
+        finally:
+            srv.shutdown()
+    assert ok["exit_code"] == 0 and ok["stdout"].strip() == run_cmd(argv)
+
+def test_cli_rejects_small_max_points():
+    for cmd in (["stocks", "--input", "data/nvda_2023_sample.csv"], ["weather", "--input", "data/weather_small.csv"]):
+        for bad in ("3", "0", "-5"):
+            result = subprocess.run([sys.executable, "-m", "hw01.cli", *cmd, "--max-points", bad], capture_output=True, text=True)
+            assert result.returncode == 2 and "--max-points: must be at least 4" in result.stderr
+            assert "Traceback" not in result.stderr
+
+def test_cli_batch_rejects_single_input_options(tmp_path):
+    for extra in (["--compact"], ["--incremental-state", str(tmp_path / "state.json")]):
+        result = subprocess.run([sys.executable, "-m", "hw01.cli", "stocks", "--inputs", "data", *extra],
+                                capture_output=True, text=True)
+        assert result.returncode == 2 and f"{extra[0]} cannot be used with --inputs" in result.stderr
+        assert result.stdout == "" and not (tmp_path / "state.json").exists()
+
+def test_server_honours_profile_and_result_cache(tmp_path):
+    import threading
+    from hw01 import server as SV
+    argv = ["weather", "--input", "data/weather_small.csv", "--json", "--cache-dir", str(tmp_path), "--cache-stats"]
+    with SV.QueryServer(port=0) as srv:
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        try:
+            prof = SV.request(srv.url, ["weather", "--input", "data/weather_small.csv", "--json", "--profile-json"])
+            miss, hit = SV.request(srv.url, argv), SV.request(srv.url, argv)
+            bad = SV.request(srv.url, ["stocks", "--inputs", "data", "--compact"])
+        finally:
+            srv.shutdown()
+    assert prof["exit_code"] == 0 and '"profile"' in prof["stderr"].splitlines()[-1]
+    assert miss["stdout"] == hit["stdout"] == prof["stdout"]
+    # profile run: frame miss; result-cache miss: frame hit; result-cache hit: no frame lookup at all
+    counters = lambda res: dict(kv.split("=") for kv in res["stderr"].splitlines()[-1].split()[2:])
+    assert int(counters(hit)["hits"]) == int(counters(miss)["hits"]) + 1  # counters are process-wide
+    assert (srv.frames.stats.misses, srv.frames.stats.hits) == (1, 1)
+    assert bad["exit_code"] == 2 and "cannot be used with --inputs" in bad["stderr"]
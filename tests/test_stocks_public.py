@@ -11,3 +11,225 @@ def test_mas_columns():
     df = S.read_stock_csv("data/nvda_2023_sample.csv")
     mas = S.rolling_moving_averages(df, windows=(3,5))
     assert all(col in mas.columns for col in ["price", "ma_3", "ma_5"])
+
+def test_read_stock_csv_cache_roundtrip(tmp_path):
+    import os, shutil
+    from hw01 import cache as C
+    src = tmp_path / "NVDA.csv"
+    shutil.copy("data/nvda_2023_sample.csv", src)
+    before = C.STATS.as_dict()
+    first = S.read_stock_csv(str(src), cache_dir=str(tmp_path / "cache"))
+    second = S.read_stock_csv(str(src), cache_dir=str(tmp_path / "cache"))
+    pd.testing.assert_frame_equal(first, second)
+    assert C.STATS.diff(before)["misses"] == 1 and C.STATS.diff(before)["hits"] == 1
+    # touching the source invalidates the entry
+    st = os.stat(src)
+    os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    S.read_stock_csv(str(src), cache_dir=str(tmp_path / "cache"))
+    assert C.STATS.diff(before)["misses"] == 2
+
+def test_price_store_projection_is_memory_mapped(tmp_path):
+    import numpy as np
+    from hw01.store import PriceStore
+    full = S.read_stock_csv("data/nvda_2023_sample.csv")
+    store = PriceStore.from_frame(str(tmp_path / "nvda"), full.iloc[:100])
+    store.append(full.iloc[100:])
+    df = S.read_stock_csv(str(tmp_path / "nvda"), columns=[S.PRICE_COL])
+    assert list(df.columns) == [S.PRICE_COL]
+    base = df[S.PRICE_COL].to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert base is not None  # still backed by the memory map, not a copy
+    pd.testing.assert_series_equal(df[S.PRICE_COL], full[S.PRICE_COL], check_index_type=False, check_freq=False)
+    assert S.cumulative_return(df) == S.cumulative_return(full)
+    try:
+        store.append(full.iloc[-1:])
+        assert False, "expected ValueError for a non-increasing append"
+    except ValueError:
+        pass
+
+def test_daily_simple_returns_validate_modes():
+    df = S.read_stock_csv("data/nvda_2023_sample.csv")
+    expected = S.daily_simple_returns_pct(df)
+    for mode in ("off", "sample", "full"):
+        r = S.daily_simple_returns(df, validate=mode)
+        pd.testing.assert_series_equal(r, expected, check_names=False, rtol=1e-10)
+    try:
+        S.daily_simple_returns(df, validate="always")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+def test_metrics_engine_matches_pandas_for_many_tickers():
+    import numpy as np
+    from hw01 import metrics as M
+    nvda = S.read_stock_csv("data/NVDA.csv")[S.PRICE_COL]
+    amd = S.read_stock_csv("data/AMD.csv")[S.PRICE_COL]
+    prices = np.column_stack([nvda.to_numpy(), amd.to_numpy()])
+    prices[10:15, 1] = np.nan
+    res = M.compute_metrics(prices, risk_free_rate=0.02, with_log_returns=True, block_rows=97)
+    for j in range(prices.shape[1]):
+        df = pd.DataFrame({S.PRICE_COL: prices[:, j]})
+        r = S.daily_simple_returns(df)
+        assert np.isclose(res.avg_daily_return[j], r.mean())
+        assert np.isclose(res.annualized_volatility[j], r.std(ddof=1) * np.sqrt(252))
+        assert np.isclose(res.sharpe_ratio[j], S.sharpe_ratio(r, risk_free_rate=0.02))
+        assert np.isclose(res.cumulative_return[j], S.cumulative_return(df))
+        np.testing.assert_allclose(res.log_returns[:, j], np.log(df[S.PRICE_COL]).diff(), atol=1e-12)
+
+def test_incremental_state_matches_full_recompute(tmp_path):
+    import numpy as np
+    from hw01 import metrics as M
+    from hw01.incremental import TickerState
+    df = S.read_stock_csv("data/NVDA.csv")
+    state = TickerState(windows=[3, 20])
+    path = str(tmp_path / "nvda_state.json")
+    for lo, hi in [(0, 1), (1, 300), (250, 900), (900, len(df))]:  # overlapping rows are skipped
+        if hi > 1:
+            state = TickerState.load(path)
+        state.update(df.iloc[lo:hi])
+        state.save(path)
+    assert state.update(df) == 0
+    full = M.compute_metrics(df[S.PRICE_COL].to_numpy()).stock_metrics()
+    got = state.stock_metrics()
+    for k, v in full.as_dict().items():
+        assert np.isclose(getattr(got, k), v, rtol=1e-12, atol=0), k
+    mas = S.rolling_moving_averages(df, windows=(3, 20)).iloc[-1]
+    assert np.isclose(state.moving_averages()["ma_3"], mas["ma_3"], rtol=1e-12)
+    assert np.isclose(state.moving_averages()["ma_20"], mas["ma_20"], rtol=1e-12)
+    np.testing.assert_array_equal(state.first_returns, S.daily_simple_returns(df).head(5).to_numpy())
+    assert state.n_rows == len(df)
+
+def test_rolling_block_matches_pandas():
+    import numpy as np
+    from hw01.rolling import rolling_block
+    s = S.read_stock_csv("data/nvda_2023_sample.csv")[S.PRICE_COL].copy()
+    s.iloc[[7, 30, 31]] = np.nan
+    block, labels = rolling_block(s.to_numpy(), windows=(1, 5, 20), stats=("sma", "std", "min", "max"))
+    assert labels[:3] == ["sma_1", "sma_5", "sma_20"] and block.shape == (len(s), 12)
+    for j, label in enumerate(labels):
+        stat, w = label.split("_")
+        r = s.rolling(window=int(w), min_periods=int(w))
+        ref = {"sma": r.mean, "std": r.std, "min": r.min, "max": r.max}[stat]()
+        np.testing.assert_allclose(block[:, j], ref.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=label)
+
+def test_rolling_window_longer_than_series(tmp_path):
+    import numpy as np
+    from hw01.rolling import rolling_block
+    s = S.read_stock_csv("data/nvda_2023_sample.csv")[S.PRICE_COL].iloc[:30]
+    for w in (30, 31, 32, 50, 60, 61):  # n + 2 <= w <= 2n used to mis-slice
+        block, labels = rolling_block(s.to_numpy(), windows=(w,), stats=("sma", "std", "min", "max"), min_periods=5)
+        for j, label in enumerate(labels):
+            r = s.rolling(window=w, min_periods=5)
+            ref = {"sma": r.mean, "std": r.std, "min": r.min, "max": r.max}[label.split("_")[0]]()
+            np.testing.assert_allclose(block[:, j], ref.to_numpy(), rtol=1e-9, atol=1e-9, err_msg=label)
+    short = tmp_path / "short30.csv"
+    S.read_stock_csv("data/nvda_2023_sample.csv").iloc[:30].to_csv(short)
+    mas = S.rolling_moving_averages(S.read_stock_csv(str(short)))
+    ref = s.rolling(window=50).mean()
+    np.testing.assert_array_equal(mas.iloc[:, -1].to_numpy(), ref.to_numpy())
+
+def test_minmax_downsample_keeps_envelope():
+    import numpy as np
+    from hw01.downsample import minmax_indices
+    rng = np.random.default_rng(1)
+    y = np.cumsum(rng.normal(size=100_003))
+    y[500:900] = np.nan
+    idx = minmax_indices(y, 1000)
+    assert len(idx) <= 1002 and idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert np.nanargmax(y) in idx and np.nanargmin(y) in idx
+    np.testing.assert_array_equal(minmax_indices(y[:50], 1000), np.arange(50))
+
+def test_compare_panel_matches_pandas():
+    import numpy as np
+    import pandas as pd
+    from hw01 import compare as CMP, stocks as S
+    nvda = S.read_stock_csv("data/nvda_2023_sample.csv")
+    amd = S.read_stock_csv("data/AMD_2023_sample.csv").iloc[10:-20]
+    amd = amd.drop(amd.index[50:60])
+    rng = np.random.default_rng(0)
+    noise = nvda.assign(Close=nvda["Close"] * (1 + rng.normal(0, 0.01, len(nvda))))
+    panel = CMP.align({"NVDA": nvda, "AMD": amd, "NOISE": noise})
+    assert list(panel.dates) == list(nvda.index) and panel.data["Close"].shape == (250, 3)
+    assert panel.mask("Close")[:, 1].sum() == len(amd)
+
+    res = CMP.compare(panel)
+    rets = panel.frame("Close").pct_change(fill_method=None)
+    np.testing.assert_allclose(res.returns[1:], rets.to_numpy()[1:], rtol=1e-12, equal_nan=True)
+    pd.testing.assert_frame_equal(res.cov_frame(), rets.cov(), rtol=1e-9)
+    pd.testing.assert_frame_equal(res.corr_frame(), rets.corr(), rtol=1e-9)
+    np.testing.assert_allclose(res.cumulative[-1, 0], nvda["Close"].iloc[-1] / nvda["Close"].iloc[0], rtol=1e-12)
+
+    sub = panel.subset(["AMD"])
+    assert sub.tickers == ["AMD"] and len(sub.dates) == len(amd)
+
+def test_stock_weather_matches_pandas():
+    import numpy as np
+    import pandas as pd
+    from hw01 import compare as CMP, stock_weather as SW, weather as W
+    stocks = CMP.load_panel(["data/NVDA.csv", "data/AMD.csv"], fields=["Adj Close"])
+    wx = W.read_weather_csv("data/rdu-weather-history.csv")
+    wx = wx.drop(wx.index[100:140])  # a gap longer than the tolerance
+    res = SW.stock_weather(stocks, SW.weather_panel(wx), features=["temperaturemax"], window=20, lags=[1])
+    assert res.lags == [0, 1] and res.stations == ["station"]
+
+    left = pd.DataFrame({"date": stocks.dates.astype("datetime64[ns]")})
+    right = wx["temperaturemax"].dropna().rename_axis("date").reset_index().astype({"date": "datetime64[ns]"})
+    ref = pd.merge_asof(left, right, on="date", direction="backward", tolerance=pd.Timedelta(days=3))["temperaturemax"]
+    x = SW.asof_align(SW.weather_panel(wx, ["temperaturemax"]), stocks.dates).data["temperaturemax"][:, 0]
+    np.testing.assert_array_equal(x, ref.to_numpy())
+
+    r = stocks.frame("Adj Close")["NVDA"].pct_change(fill_method=None)
+    xs = pd.Series(x, index=stocks.dates)
+    np.testing.assert_allclose(res.rolling["temperaturemax"][:, 0, 0], r.rolling(20).corr(xs).to_numpy(), atol=1e-9, equal_nan=True)
+    assert np.isclose(res.corr["temperaturemax"][0, 0], r.corr(xs))
+    ok = r.notna() & xs.shift(1).notna()
+    beta, alpha = np.polyfit(xs.shift(1)[ok], r[ok], 1)
+    assert np.isclose(res.regression["temperaturemax"]["beta"][1, 0, 0], beta)
+    assert np.isclose(res.regression["temperaturemax"]["alpha"][1, 0, 0], alpha)
+
+def test_compact_frames_within_tolerance():
+    import numpy as np
+    from hw01 import compact as CP, weather as W
+    full, small = S.read_stock_csv("data/NVDA.csv"), S.read_stock_csv("data/NVDA.csv", compact=True)
+    assert small["Adj Close"].dtype == np.float32 and str(small["Volume"].dtype) == "UInt32"
+    assert small.attrs["compact"]["bytes_saved"] > 0
+    ra, rb = S.daily_simple_returns(full), S.daily_simple_returns(small)
+    np.testing.assert_allclose(rb, ra, rtol=CP.RESULT_RTOL)
+    for fn in (S.average_daily_return, S.annualized_volatility, S.sharpe_ratio):
+        assert np.isclose(fn(rb), fn(ra), rtol=CP.RESULT_RTOL)
+    assert np.isclose(S.cumulative_return(small), S.cumulative_return(full), rtol=CP.RESULT_RTOL)
+    np.testing.assert_allclose(S.rolling_moving_averages(small)["ma_20"], S.rolling_moving_averages(full)["ma_20"], rtol=CP.RESULT_RTOL)
+
+    wf = W.read_weather_csv("data/rdu-weather-history.csv")
+    ws = W.read_weather_csv("data/rdu-weather-history.csv", compact=True)
+    assert ws["temperaturemax"].dtype == np.float32 and ws["precipitation"].dtype == np.float32
+    for k, v in W.min_max_summary(wf).items():
+        assert np.isclose(W.min_max_summary(ws)[k], v, rtol=CP.RESULT_RTOL)
+    np.testing.assert_allclose(W.slice_and_means(ws, "2017-01-01", "2017-06-30"), W.slice_and_means(wf, "2017-01-01", "2017-06-30"), rtol=CP.RESULT_RTOL)
+    np.testing.assert_allclose(W.add_celsius_column(ws)["temperaturemax_celsius"], W.add_celsius_column(wf)["temperaturemax_celsius"], rtol=CP.RESULT_RTOL)
+    sf, ss = W.seasonal_summaries(wf), W.seasonal_summaries(ws)
+    assert sf[2017]["Summer"]["date_min"] == ss[2017]["Summer"]["date_min"]
+    assert np.isclose(ss[2017]["Summer"]["mean_temperaturemax"], sf[2017]["Summer"]["mean_temperaturemax"], rtol=CP.RESULT_RTOL)
+
+    # counts with gaps become nullable ints; values outside float32's range stay float64
+    df = pd.DataFrame({"Volume": [1.0, np.nan, 3e9], "x": [1.0, 1e39, 2.0], "y": [1.0, 1 + 1e-9, 2.0]})
+    out = CP.compact_frame(df, counts=("Volume",))
+    assert str(out["Volume"].dtype) == "UInt32" and out["Volume"].isna().sum() == 1
+    assert out["x"].dtype == np.float64 and out["y"].dtype == np.float32
+    assert CP.compact_frame(df, rtol=1e-12)["y"].dtype == np.float64
+    x = np.array([0.14, 52.3, -7.25, 1234.567, 0.0, np.nan, 3e7])
+    np.testing.assert_array_equal(CP.as_float64(x.astype(np.float32)), x)
+    np.testing.assert_array_equal(CP.as_float64(pd.Series(x)), x)  # float64 passes through
+
+def test_rolling_correlation_blocks_match_single_pass():
+    import numpy as np
+    from hw01 import stock_weather as SW
+    rng = np.random.default_rng(0)
+    r, x = rng.normal(size=(300, 5)), rng.normal(size=(300, 3))
+    r[rng.random(r.shape) < 0.1] = np.nan
+    x[rng.random(x.shape) < 0.1] = np.nan
+    whole = SW.rolling_correlation(r, x, window=20, block_cells=10**9)
+    for cells in (300, 300 * 2, 300 * 4):  # 1 pair, 2 stations, 1 ticker x 3 stations per block
+        np.testing.assert_array_equal(SW.rolling_correlation(r, x, window=20, block_cells=cells), whole)
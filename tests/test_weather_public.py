@@ -10,3 +10,129 @@ def test_slice_means_has_cols():
     df = W.read_weather_csv("data/weather_small.csv")
     s = W.slice_and_means(df, start="2022-01-10", end="2022-01-20")
     assert "temperaturemax" in s.index and "precipitation" in s.index
+
+def test_stream_matches_in_memory():
+    import numpy as np
+    from hw01.weather_stream import stream_weather
+    path = "data/rdu-weather-history.csv"
+    df = W.read_weather_csv(path)
+    res = stream_weather(path, start="2018-01-01", end="2018-03-01", cols=("temperaturemax", "awnd"), chunksize=250)
+    assert res["n_rows"] == len(df) and res["memory"]["n_chunks"] == -(-len(df) // 250)
+    assert res["summary"] == W.min_max_summary(df)
+    ref = df.loc["2018-01-01":"2018-03-01", ["temperaturemax", "awnd"]].mean()
+    assert np.allclose(res["sliced_means"].to_numpy(), ref.to_numpy())
+
+def test_parse_dates_detects_mdyy_and_matches_pandas():
+    import numpy as np
+    import pandas as pd
+    from hw01 import dates as D
+    raw = pd.read_csv("data/rdu-weather-history.csv")["date"]
+    assert D.detect_date_format(raw) == "%m/%d/%y"
+    got = D.parse_dates(raw)
+    expected = pd.DatetimeIndex(pd.to_datetime(raw, format="%m/%d/%y"))
+    assert (got == expected).all()
+    # invalid day falls back to pandas, which raises
+    try:
+        D.parse_dates(np.array(["2/30/17"], dtype=object), fmt="%m/%d/%y")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    df = W.read_weather_csv("data/rdu-weather-history.csv")
+    assert df.index.is_monotonic_increasing and df.index[0] == pd.Timestamp("2017-01-01")
+
+def test_seasonal_summaries_multi_year_matches_stream():
+    import math
+    from hw01.weather_stream import stream_weather
+    path = "data/rdu-weather-history.csv"
+    seasons = W.seasonal_summaries(W.read_weather_csv(path))
+    assert sorted(seasons) == [2017, 2018, 2019, 2020, 2021, 2022]
+    # Winter is labeled by its January year: Dec 2017 belongs to Winter 2018
+    assert seasons[2018]["Winter"]["date_min"] == "2017-12-01"
+    streamed = stream_weather(path, "2018-01-01", "2018-01-31", chunksize=300)["seasonal_summaries"]
+    assert streamed.keys() == seasons.keys()
+    for yr in seasons:
+        assert streamed[yr].keys() == seasons[yr].keys()
+        for sn, leaf in seasons[yr].items():
+            for k, v in leaf.items():
+                other = streamed[yr][sn][k]
+                assert other == v if isinstance(v, str) else math.isclose(other, v, rel_tol=1e-12), (yr, sn, k)
+
+def test_station_frame_batched_summaries_match_single_file(tmp_path):
+    import shutil
+    import numpy as np
+    from hw01 import stations as ST
+    shutil.copy("data/rdu-weather-history.csv", tmp_path / "RDU.csv")
+    shutil.copy("data/weather_small.csv", tmp_path / "SMALL.csv")
+    df = ST.read_station_csvs(str(tmp_path))
+    assert list(df.index.names) == ["station", "date"] and df.index.is_monotonic_increasing
+    assert df.index.get_level_values("station").dtype == "category"
+    summaries = ST.min_max_summary_by_station(df)
+    means = ST.slice_and_means_by_station(df, "2022-01-10", "2022-01-20")
+    seasons = ST.seasonal_summaries_by_station(df)
+    for station, path in (("RDU", "data/rdu-weather-history.csv"), ("SMALL", "data/weather_small.csv")):
+        single = W.read_weather_csv(path)
+        assert summaries[station] == W.min_max_summary(single)
+        ref = W.slice_and_means(single, "2022-01-10", "2022-01-20")
+        assert np.allclose(means.loc[station, list(ref.index)].to_numpy(dtype=float), ref.to_numpy(), equal_nan=True)
+        assert seasons[station] == W.seasonal_summaries(single)
+
+def test_range_means_matches_slice_and_means():
+    import numpy as np
+    import pandas as pd
+    df = W.read_weather_csv("data/rdu-weather-history.csv")
+    q = W.RangeMeans(df)
+    cols = ["temperaturemin", "awnd", "snwd"]
+    starts = ["2017-01-01", "2018-02-10", "2021-06-30", "2030-01-01", "2019-05-01"]
+    ends = ["2017-01-31", "2018-12-01", "2021-06-30", "2030-12-31", "2019-04-01"]
+    batch = q.mean_batch(starts, ends, cols)
+    assert list(batch.columns) == cols and len(batch) == len(starts)
+    for i, (a, b) in enumerate(zip(starts, ends)):
+        ref = W.slice_and_means(df, a, b, cols=cols)
+        assert list(ref.index) == cols
+        np.testing.assert_allclose(batch.iloc[i].to_numpy(), ref.to_numpy(dtype=float), rtol=1e-10, atol=1e-9, equal_nan=True)
+    pd.testing.assert_series_equal(q.mean("2022-01-01", "2022-02-01", cols), W.slice_and_means(df, "2022-01-01", "2022-02-01", cols), rtol=1e-10, atol=1e-9, check_names=False)
+
+def test_partial_date_bounds_match_loc(tmp_path):
+    import shutil
+    import numpy as np
+    import pandas as pd
+    from hw01 import dates as D, stations as ST
+    from hw01.weather_stream import stream_weather
+    path = "data/rdu-weather-history.csv"
+    df = W.read_weather_csv(path)
+    shutil.copy(path, tmp_path / "RDU.csv")
+    by_station = ST.slice_and_means_by_station(ST.read_station_csvs(str(tmp_path)), "2017-12", "2018-01")
+    assert D.slice_bounds("2017-12", "2018") == (pd.Timestamp("2017-12-01"), pd.Timestamp("2018-12-31 23:59:59.999999"))
+    for start, end in (("2017-12", "2018-01"), ("2018", "2018"), ("2018-01-10", "2018-02")):
+        ref = W.slice_and_means(df, start, end)  # .loc partial-string semantics
+        streamed = stream_weather(path, start=start, end=end, chunksize=500)["sliced_means"]
+        pd.testing.assert_series_equal(streamed, ref, check_names=False, rtol=1e-12)
+        np.testing.assert_allclose(W.RangeMeans(df).mean(start, end, list(ref.index)).to_numpy(), ref.to_numpy(), rtol=1e-10)
+    ref = W.slice_and_means(df, "2017-12", "2018-01")
+    np.testing.assert_allclose(by_station.loc["RDU", list(ref.index)].to_numpy(dtype=float), ref.to_numpy(), rtol=1e-12)
+
+def test_schema_usecols_and_dtypes(tmp_path, monkeypatch):
+    import pandas as pd
+    import pytest
+    from hw01 import schema as SC, stocks as S
+    full = W.read_weather_csv("data/rdu-weather-history.csv")
+    some = W.read_weather_csv("data/rdu-weather-history.csv", columns=SC.weather_columns())
+    assert list(some.columns) == ["temperaturemin", "temperaturemax", "precipitation"]
+    assert (some.dtypes == "float64").all()
+    pd.testing.assert_frame_equal(some, full[list(some.columns)])
+    assert W.min_max_summary(some) == W.min_max_summary(full)
+
+    # unknown columns are skipped; a file without dates still gets the reader's error
+    df = SC.read_csv("data/nvda_2023_sample.csv", "stocks", usecols=["Date", "Adj Close", "NotAColumn"], parse_dates=["Date"])
+    assert list(df.columns) == ["Date", "Adj Close"] and df["Date"].dtype.kind == "M"
+    bad = tmp_path / "nodate.csv"
+    bad.write_text("day,temperaturemax\n1/1/20,50\n")
+    with pytest.raises(ValueError, match="date"):
+        W.read_weather_csv(str(bad), columns=["temperaturemax"])
+
+    # engines agree within ENGINE_RTOL, not bit for bit
+    monkeypatch.setenv(SC.ENGINE_ENV, "python")
+    assert SC.csv_engine() == "python"
+    pd.testing.assert_frame_equal(S.read_stock_csv("data/nvda_2023_sample.csv", columns=["Adj Close"]),
+                                  S.read_stock_csv("data/nvda_2023_sample.csv").loc[:, ["Adj Close"]],
+                                  check_exact=False, rtol=SC.ENGINE_RTOL)